@@ -0,0 +1,48 @@
+import re
+
+from fastapi import APIRouter, Query
+from fastapi.encoders import jsonable_encoder
+from starlette import status
+
+from core.logger_factory import LoggerFactory
+from services.cache import segment_cache, two_tier_cache
+from services.spider.response_cache import response_cache
+from utils.handler import handle_exception
+
+router = APIRouter(prefix="/cache", tags=["缓存接口"])
+logger = LoggerFactory.get_logger(__name__)
+
+# 允许删除 Redis 数据的缓存命名空间：直播播放地址、点播播放地址（站点可用 * 表示全部）、点播接口响应；
+# 前缀中不允许再出现通配符，避免误删节目单、目录索引等非缓存数据
+REDIS_INVALIDATE_PATTERNS = (
+    re.compile(r"^tv-live:[^*?\[\]]*$"),
+    re.compile(r"^tv-vod:(\*|[^:*?\[\]]+):(player|resp):[^*?\[\]]*$"),
+)
+
+
+@router.get("/stats", summary="获取二级缓存按前缀统计的命中率及Redis延迟")
+def get_cache_stats():
+    return jsonable_encoder(two_tier_cache.stats())
+
+
+@router.get("/segments", summary="获取视频分片缓存的命中率及节省的上游流量")
+def get_segment_cache_stats():
+    return jsonable_encoder(segment_cache.stats())
+
+
+@router.get("/responses", summary="获取爬虫接口响应缓存按接口统计的命中率及后台刷新次数")
+def get_response_cache_stats():
+    return jsonable_encoder(response_cache.stats())
+
+
+@router.post("/invalidate", summary="按前缀失效缓存")
+def invalidate_cache(
+        prefix: str = Query(..., min_length=1, description="缓存key前缀，例如：tv-live:"),
+        include_redis: bool = Query(False, description="是否同时删除Redis中的数据")
+):
+    if include_redis and not any(pattern.match(prefix) for pattern in REDIS_INVALIDATE_PATTERNS):
+        handle_exception(f"prefix {prefix} is not a cache namespace, only tv-live:, tv-vod:<sp>:player:, "
+                         f"tv-vod:<sp>:resp: can be removed from redis", status.HTTP_400_BAD_REQUEST)
+    count = two_tier_cache.invalidate_prefix(prefix, include_l2=include_redis)
+    logger.info(f"invalidate cache prefix {prefix}, local items: {count}, include redis: {include_redis}")
+    return {"prefix": prefix, "local": count, "include_redis": include_redis}
@@ -0,0 +1,55 @@
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Path, Query
+from fastapi.encoders import jsonable_encoder
+from starlette import status
+
+from core.logger_factory import LoggerFactory
+from services.epg import epg_manager
+from utils.handler import handle_exception
+
+router = APIRouter(prefix="/epg", tags=["节目单接口"])
+logger = LoggerFactory.get_logger(__name__)
+
+
+@router.get("/channels", summary="获取已索引节目单的频道列表")
+def get_epg_channels():
+    return jsonable_encoder(epg_manager.list_channels())
+
+
+@router.get("/now/{channel}", summary="获取频道当前及下一个节目")
+def get_now_next(
+        channel: str = Path(..., description="频道tvg-id或名称，例如：CCTV1"),
+        at: Optional[int] = Query(None, description="查询时间（秒级时间戳），默认当前时间")
+):
+    index = epg_manager.get_index(channel)
+    if index is None:
+        handle_exception(f"epg channel {channel} not found", status.HTTP_404_NOT_FOUND)
+
+    query_time = at if at is not None else int(time.time())
+    current, following = index.now_next(query_time)
+    return {"channel": channel, "at": query_time, "now": current, "next": following}
+
+
+@router.get("/programmes/{channel}", summary="获取频道时间窗口内的节目")
+def get_programmes(
+        channel: str = Path(..., description="频道tvg-id或名称，例如：CCTV1"),
+        start: Optional[int] = Query(None, description="开始时间（秒级时间戳），默认当前时间"),
+        end: Optional[int] = Query(None, description="结束时间（秒级时间戳），默认开始时间后6小时")
+):
+    index = epg_manager.get_index(channel)
+    if index is None:
+        handle_exception(f"epg channel {channel} not found", status.HTTP_404_NOT_FOUND)
+
+    window_start = start if start is not None else int(time.time())
+    window_end = end if end is not None else window_start + 6 * 3600
+    if window_end <= window_start:
+        handle_exception("end must be greater than start", status.HTTP_400_BAD_REQUEST)
+
+    return {
+        "channel": channel,
+        "start": window_start,
+        "end": window_end,
+        "list": index.window(window_start, window_end),
+    }
@@ -156,7 +156,10 @@ def update_m3u_sources(request: UpdateLiveRequest, background_tasks: BackgroundT
                     threads=task_threads,
                     task_status=task,
                     check_m3u8_invalid=request.check_m3u8,
-                    output_file=request.output)
+                    output_file=request.output,
+                    output_json=request.output_json,
+                    output_group=request.output_group,
+                    output_gzip=request.output_gzip)
                 task.update({"status": "completed", "result": {"success": success_count}})
             except Exception as re:
                 logger.error(f"update live sources task failed: {str(re)}", exc_info=True)
@@ -11,8 +11,9 @@ from models.api_request import UpdateLiveRequest
 from models.api_response import ApiResponse, TaskResponse
 from services.channel import channel_manager
 from services.checker import ChannelChecker
-from services.redis import redis_client
+from services.resolver import migu_resolver
 from services.task import task_manager
+from services.upstream import upstream_client
 from utils.handler import handle_exception
 from utils.parser import parser_manager
 
@@ -57,7 +58,11 @@ def update_migu_sources(request: UpdateLiveRequest, background_tasks: Background
 
                 [parser_manager.load_channel_m3u(url, request.group, use_ignore=True) for url in request.url if url]
 
-                parser_manager.load_remote_url_migu(task_id, request.epg.file, request.rate_type)
+                parser_manager.load_remote_url_migu(task_id, request.epg.file, request.rate_type,
+                                                    epg_past_days=request.epg.past_days,
+                                                    epg_future_days=request.epg.future_days,
+                                                    epg_gzip=request.epg.gzip,
+                                                    direct_url=request.direct_url)
                 total_count = channel_manager.total_count()
                 task_manager.update_task(task_id, total=total_count, processed=0)
 
@@ -69,6 +74,9 @@ def update_migu_sources(request: UpdateLiveRequest, background_tasks: Background
                     task_status=task,
                     check_m3u8_invalid=request.check_m3u8,
                     output_file=request.output,
+                    output_json=request.output_json,
+                    output_group=request.output_group,
+                    output_gzip=request.output_gzip,
                 )
                 task.update({"status": "completed", "result": {"success": success_count}})
             except Exception as re:
@@ -94,6 +102,11 @@ def get_id_list():
         handle_exception(f"获取频道列表失败: {str(e)}")
 
 
+@router.get("/upstream", summary="获取上游接口的请求统计及熔断状态")
+def get_upstream_stats():
+    return jsonable_encoder(upstream_client.stats())
+
+
 @router.get("/{id}", summary="获取单个频道播放地址")
 def parse_channel_url(
         id: str = Path(..., description="频道ID，例如：cctv1"),
@@ -109,13 +122,9 @@ def parse_channel_url(
 
     resp_message = "成功从缓存获取地址"
     try:
-        cache_key = f"tv-live:{channel_id}"
-        chanel_url = redis_client.get(cache_key)
-        if not chanel_url:
-            chanel_url = parser_manager.get_migu_video_url(resp_data.get("name"), channel_id, rate_type=3)
-            if chanel_url:
-                resp_message = "成功获取播放地址"
-                redis_client.set_ex(cache_key, chanel_url)
+        chanel_url, from_cache = migu_resolver.resolve(channel_id, resp_data.get("name"), rate_type=3)
+        if chanel_url and not from_cache:
+            resp_message = "成功获取播放地址"
 
         if chanel_url:
             match type:
@@ -1,23 +1,39 @@
-import re
-from typing import Optional
-from urllib.parse import unquote, quote
+from typing import Dict, Optional
+from urllib.parse import unquote
 
-import httpx
 from fastapi import APIRouter, Query, BackgroundTasks, Path
+from fastapi.encoders import jsonable_encoder
 from starlette import status
 from starlette.requests import Request
 from starlette.responses import RedirectResponse, StreamingResponse, Response
 
+from core.constants import Constants
 from core.logger_factory import LoggerFactory
+from core.lru import TtlLruCache
+from core.singleflight import AsyncSingleFlight
 from models.api_request import UpdateVodRequest
 from models.api_response import TaskResponse, ApiResponse
 from services import task_manager, config_manager
+from services.cache import segment_cache
 from services.spider.factory import SpiderFactory
+from services.spider.player import player_resolver
+from services.ytdlp import ytdlp_pool
 from utils.handler import handle_exception
+from utils.m3u8_util import PlaylistRewriter, playlist_ttl
 
 router = APIRouter(prefix="/site", tags=["点播接口"])
 logger = LoggerFactory.get_logger(__name__)
 
+# 视频流代理透传的请求头和响应头
+PROXY_REQUEST_HEADERS = ("range", "if-range")
+PROXY_RESPONSE_HEADERS = ("content-length", "content-range", "content-encoding", "cache-control",
+                          "etag", "last-modified")
+
+# 改写后的播放列表缓存：{sp:id: m3u8 内容}
+_playlists = TtlLruCache(Constants.M3U8_CACHE_MAX_ITEMS)
+_playlist_flight = AsyncSingleFlight()
+_rewriters: Dict[str, PlaylistRewriter] = {}
+
 
 @router.get("/vod", summary="查询点播数据")
 async def get_vod(
@@ -49,6 +65,11 @@ async def get_vod(
     return {"class": spider.config.site_class, "list": []}
 
 
+@router.get("/ytdlp", summary="获取 yt-dlp 解析进程池状态及延迟")
+def get_ytdlp_stats():
+    return jsonable_encoder(ytdlp_pool.stats())
+
+
 @router.post("/collect", summary="数据采集", response_model=TaskResponse)
 async def api_collect(request: UpdateVodRequest, background_tasks: BackgroundTasks) -> TaskResponse:
     try:
@@ -67,6 +88,9 @@ async def api_collect(request: UpdateVodRequest, background_tasks: BackgroundTas
         async def run_task():
             task_info = task_manager.get_task(task_id)
             result = await spider.collect(task_info, request.is_full)
+            if request.prefetch and spider.prefetch_player:
+                task_info.update({"status": "prefetching"})
+                result["prefetch"] = await player_resolver.prefetch_newest(spider, request.prefetch)
             task_info.update({"status": "completed", "result": result})
 
         background_tasks.add_task(run_task)
@@ -92,16 +116,9 @@ async def parse_channel_url(
         return ApiResponse(code=400, message=resp_message, data=resp_data)
 
     try:
-        redis_key = spider.make_redis_key("player", id)
-        real_player = spider.redis_get(redis_key)
-        if not real_player:
-            player_url = await spider.get_player(id)
-            if player_url:
-                real_player = {"url": player_url}
-                spider.redis_set(redis_key, real_player, ex=-1)
-
-        if real_player:
-            json_data = spider.get_player_json(1, id, real_player["url"])
+        real_url = await player_resolver.resolve(spider, id)
+        if real_url:
+            json_data = spider.get_player_json(1, id, real_url)
             player_url = json_data.pop("url")
             match tp:
                 case "json":
@@ -132,40 +149,42 @@ async def get_ts_url(
         return ApiResponse(code=400, message=resp_message, data=resp_data)
 
     try:
-        redis_key = spider.make_redis_key("player", id)
-        real_player = spider.redis_get(redis_key)
-        if not real_player:
-            player_url = await spider.get_player(id)
-            if player_url:
-                real_player = {"url": player_url}
-                spider.redis_set(redis_key, real_player, ex=-1)
-
-        if real_player:
-            player_url = real_player.pop("url")
-            json_data = spider.get_player_json(1, id, player_url)
-            async with (httpx.AsyncClient(timeout=20) as client):
-                resp = await client.get(player_url, headers=json_data["header"])
-                if not resp.is_success and not resp.is_redirect:
-                    resp.raise_for_status()
-                raw_m3u8 = resp.text
-
-                base_url = config_manager.service_params.url_parse.split('/m3u8')[0]
-
-                def replace_ts_url(match):
-                    original_url = match.group(0)
-                    proxy_url = f"{base_url}/proxy/{sp}?url={quote(original_url, safe='')}"
-                    return proxy_url
-
-                modified_m3u8 = re.sub(r'https?://[^\s#]+?/seg\.ts[^\s#]*', replace_ts_url, raw_m3u8)
-                return Response(
-                    content=modified_m3u8,
-                    media_type="application/vnd.apple.mpegurl"
-                )
+        # 多个客户端轮询同一直播时直接返回内存中改写好的列表，过期后只有一个请求回源
+        cache_key = f"{sp}:{id}"
+        playlist = _playlists.get(cache_key)
+        if playlist is None:
+            playlist = await _playlist_flight.do(cache_key, lambda: _load_playlist(spider, sp, id))
+        if playlist:
+            return Response(content=playlist, media_type="application/vnd.apple.mpegurl")
     except Exception as e:
-        logger.error(f"m3u8 {sp}.{id} video failed.", exc_info=False)
+        logger.error(f"m3u8 {sp}.{id} video failed: {str(e)}", exc_info=False)
     return ApiResponse(code=101, message=resp_message, data=resp_data)
 
 
+async def _load_playlist(spider, sp: str, id: str) -> str | None:
+    player_url = await player_resolver.resolve(spider, id)
+    if not player_url:
+        return None
+
+    json_data = spider.get_player_json(1, id, player_url)
+    resp = await spider.proxy_client.get(player_url, headers=json_data["header"])
+    resp.raise_for_status()
+
+    raw_m3u8 = resp.text
+    playlist = _get_rewriter(sp).rewrite(raw_m3u8)
+    ttl = playlist_ttl(raw_m3u8, Constants.M3U8_CACHE_DEFAULT_TTL, Constants.M3U8_CACHE_VOD_TTL)
+    _playlists.set(f"{sp}:{id}", playlist, ttl)
+    return playlist
+
+
+def _get_rewriter(sp: str) -> PlaylistRewriter:
+    rewriter = _rewriters.get(sp)
+    if rewriter is None:
+        base_url = config_manager.service_params.url_parse.split('/m3u8')[0]
+        rewriter = _rewriters[sp] = PlaylistRewriter(f"{base_url}/proxy/{sp}?url=")
+    return rewriter
+
+
 @router.get("/proxy/{sp}", summary="代理视频流播放")
 async def proxy_ts_url(
         request: Request,
@@ -182,33 +201,75 @@ async def proxy_ts_url(
         return ApiResponse(code=400, message=resp_message, data=resp_data)
 
     player_url = unquote(url)
-    headers = spider.get_player_json(1, -1, "").pop("header")
-    range_header = request.headers.get("range")
-    if range_header:
-        headers["Range"] = range_header
+    headers = dict(spider.get_player_json(1, -1, "").pop("header"))
+    for k in PROXY_REQUEST_HEADERS:
+        if k in request.headers:
+            headers[k.title()] = request.headers[k]
     logger.debug(f"proxy {sp} request header: {headers}")
-    try:
-        async with httpx.AsyncClient(timeout=20, follow_redirects=True, headers=headers) as client:
-            resp = await client.get(player_url)
-            resp.raise_for_status()
-            resp_headers = {
-                "Content-Type": "video/mp2t",
+
+    # 完整分片优先读共享缓存，未命中时边转发边写入缓存；Range 请求直接透传上游
+    writer = None
+    if "range" not in request.headers:
+        hit, writer = await segment_cache.open(player_url)
+        if hit:
+            return StreamingResponse(_iter_segment(hit), headers={
+                "Content-Type": hit.content_type,
+                "Content-Length": str(hit.size),
                 "Accept-Ranges": "bytes",
                 "Access-Control-Allow-Origin": "*",
-            }
-            for k in ["content-length", "content-range", "cache-control"]:
-                if k in resp.headers:
-                    resp_headers[k.capitalize()] = resp.headers[k]
-            logger.debug(f"proxy {sp} resp_header: {resp_headers}")
-            return StreamingResponse(
-                resp.aiter_bytes(),
-                status_code=resp.status_code,
-                headers=resp_headers
-            )
+            })
+
+    try:
+        client = spider.proxy_client
+        resp = await client.send(client.build_request("GET", player_url, headers=headers), stream=True)
+        if resp.status_code >= 400:
+            await resp.aclose()
+            resp.raise_for_status()
+
+        resp_headers = {
+            "Content-Type": "video/mp2t",
+            "Accept-Ranges": "bytes",
+            "Access-Control-Allow-Origin": "*",
+        }
+        for k in PROXY_RESPONSE_HEADERS:
+            if k in resp.headers:
+                resp_headers[k.title()] = resp.headers[k]
+        logger.debug(f"proxy {sp} resp_header: {resp_headers}")
+        if writer:
+            # 原始数据块带内容编码时缓存后无法还原响应头，不缓存
+            writer.begin(resp.headers.get("content-type", "video/mp2t"),
+                         cacheable=resp.status_code == 200 and "content-encoding" not in resp.headers)
+
+        async def stream_body():
+            # 原样转发上游数据块，客户端读取慢时 send 会等待，不在内存中堆积；客户端断开时释放上游连接
+            complete = False
+            try:
+                async for chunk in resp.aiter_raw():
+                    if writer:
+                        writer.write(chunk)
+                    yield chunk
+                complete = True
+            finally:
+                await resp.aclose()
+                if writer:
+                    await writer.close(complete)
+
+        return StreamingResponse(stream_body(), status_code=resp.status_code, headers=resp_headers)
     except Exception as e:
         logger.error(f"proxy {sp} video failed: {str(e)}", exc_info=False)
+        if writer:
+            await writer.close(False)
+
+    return StreamingResponse(_empty_body(), status_code=500, media_type="video/mp2t")
+
+
+async def _iter_segment(hit):
+    try:
+        for chunk in hit.chunks():
+            yield chunk
+    finally:
+        hit.close()
 
-    async def generate_empty_bytes():
-        yield b""
 
-    return StreamingResponse(generate_empty_bytes(), status_code=500, media_type="video/mp2t")
+async def _empty_body():
+    yield b""
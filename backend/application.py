@@ -1,9 +1,16 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
 
 from core.logger_factory import LoggerFactory
+from services.redis import async_redis_bytes_client, async_redis_client
+from services.spider.base import spider_clients
+from services.spider.factory import SpiderFactory
+from services.spider.player import player_resolver
+from services.ytdlp import ytdlp_pool
 from utils.scanner import RouteScanner
 
 logger = LoggerFactory.get_logger(__name__)
@@ -11,6 +18,22 @@ logger = LoggerFactory.get_logger(__name__)
 api_prefix = os.getenv("API_PREFIX", "")
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 启动：为已配置的站点创建连接池客户端，预启动 yt-dlp 解析进程
+    spiders = [SpiderFactory.get_spider(sp) for sp in SpiderFactory.list_all_spiders()]
+    spider_clients.start([spider for spider in spiders if spider and spider.config])
+    await asyncio.to_thread(ytdlp_pool.start)
+    yield
+    # 关闭：停止播放地址刷新任务，释放 HTTP 连接池、异步 Redis 连接池及 yt-dlp 解析进程
+    await player_resolver.close()
+    await spider_clients.close()
+    await async_redis_client.close()
+    await async_redis_bytes_client.close()
+    ytdlp_pool.shutdown()
+    logger.info("application resources released")
+
+
 class CreateApplication:
     def __init__(self):
         self._app = FastAPI(
@@ -18,7 +41,8 @@ class CreateApplication:
             description="自动生成的API文档",
             version="1.0.0",
             root_path=api_prefix,
-            debug=True)
+            debug=True,
+            lifespan=lifespan)
 
         # 初始化路由扫描器
         scanner = RouteScanner(self._app, os.path.dirname(os.path.abspath(__file__)))
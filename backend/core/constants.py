@@ -13,9 +13,127 @@ class Constants:
     # 网络请求相关常量，不要小于10秒
     REQUEST_TIMEOUT = 10
 
+    # 异步 Redis 客户端连接池大小，连接用完时最多等待的秒数
+    REDIS_MAX_CONNECTIONS = 64
+    REDIS_POOL_TIMEOUT = 5
+
+    # 二级缓存：进程内 LRU 容量、最长缓存秒数，以及空结果的缓存秒数
+    CACHE_L1_MAX_ITEMS = 2048
+    CACHE_L1_TTL = 60
+    CACHE_NEGATIVE_TTL = 10
+
     # 线程池相关常量
     IO_INTENSITY_FACTOR = 4  # 可在2-8之间调整
 
+    # Migu 数据采集的并发数，分类列表与节目单分开限流
+    MIGU_CATE_WORKERS = 8
+    MIGU_EPG_WORKERS = 8
+    MIGU_SPORT_WORKERS = 8
+
+    # 已结束比赛的详情和回放列表不会再变化，短时间缓存避免重复请求
+    MIGU_MATCH_CACHE_TTL = 6 * 3600
+
+    # Migu 播放地址解析：签名地址无法解析过期时间时的默认缓存秒数，
+    # 最近被访问过的热点频道在过期前主动刷新
+    MIGU_URL_CACHE_TTL = 30 * 60
+    MIGU_URL_REFRESH_AHEAD = 60
+    MIGU_URL_HOT_WINDOW = 10 * 60
+    MIGU_URL_REFRESH_INTERVAL = 15
+    MIGU_URL_REFRESH_WORKERS = 4
+    # 热点频道刷新失败后的退避时间：首次等待秒数，之后每次加倍，不超过上限
+    MIGU_URL_REFRESH_BACKOFF_BASE = 30
+    MIGU_URL_REFRESH_BACKOFF_MAX = 5 * 60
+
+    # 更新直播源时批量预解析播放地址的并发数和每秒请求数，
+    # 剩余有效期不少于 MIGU_URL_DIRECT_MIN_TTL 的地址才允许直接写入播放列表
+    MIGU_URL_PREFETCH_WORKERS = 8
+    MIGU_URL_PREFETCH_RATE = 10
+    MIGU_URL_DIRECT_MIN_TTL = 10 * 60
+
+    # 上游接口客户端：连接池大小、失败重试（指数退避+随机抖动）及按接口熔断
+    UPSTREAM_POOL_SIZE = 32
+    UPSTREAM_RETRIES = 2
+    UPSTREAM_BACKOFF_BASE = 0.2
+    UPSTREAM_BACKOFF_MAX = 2.0
+    UPSTREAM_BREAKER_THRESHOLD = 5
+    UPSTREAM_BREAKER_RESET = 30
+
+    # 对冲请求：超过观测到的 p90 延迟仍未返回时发起第二个请求，对冲次数不超过请求数的比例
+    HEDGE_BUDGET_RATIO = 0.1
+    HEDGE_DEFAULT_DELAY = 2.0
+    HEDGE_MIN_DELAY = 0.05
+    HEDGE_MIN_SAMPLES = 20
+    HEDGE_WORKERS = 32
+
+    # 爬虫接口请求：每个站点一个长连接池
+    SPIDER_MAX_CONNECTIONS = 32
+    SPIDER_MAX_KEEPALIVE = 16
+    SPIDER_KEEPALIVE_EXPIRY = 60
+
+    # 视频流代理：每个站点一个长连接池，分片请求复用连接；读超时按单个数据块计算
+    PROXY_MAX_CONNECTIONS = 64
+    PROXY_MAX_KEEPALIVE = 32
+    PROXY_KEEPALIVE_EXPIRY = 60
+    PROXY_CONNECT_TIMEOUT = 5
+    PROXY_READ_TIMEOUT = 20
+
+    # 实时请求上游的爬虫接口响应缓存：按接口区分新鲜时间（秒），过期后按比例延长可返回旧数据的时间并后台刷新
+    SPIDER_RESPONSE_TTL = {"list": 10 * 60, "detail": 60 * 60, "search": 5 * 60}
+    SPIDER_RESPONSE_DEFAULT_TTL = 5 * 60
+    SPIDER_RESPONSE_STALE_RATIO = 2
+    SPIDER_RESPONSE_MAX_ITEMS = 1024
+
+    # 点播播放地址：地址中没有过期参数时的缓存秒数，最近播放过的视频在过期前主动刷新
+    PLAYER_CACHE_TTL = 3 * 3600
+    PLAYER_URL_SAFETY_MARGIN = 60
+    PLAYER_REFRESH_AHEAD = 5 * 60
+    PLAYER_HOT_WINDOW = 30 * 60
+    PLAYER_REFRESH_INTERVAL = 30
+    PLAYER_REFRESH_WORKERS = 2
+    # 热点视频刷新失败后的退避时间：首次等待秒数，之后每次加倍，不超过上限
+    PLAYER_REFRESH_BACKOFF_BASE = 60
+    PLAYER_REFRESH_BACKOFF_MAX = 15 * 60
+    # 采集后预解析播放地址：每个分类最多预解析的视频数，解析速率（次/秒）及并发数（低于 yt-dlp 进程数，保留给实时播放）
+    PLAYER_PREFETCH_MAX_PER_CATEGORY = 50
+    PLAYER_PREFETCH_RATE = 0.5
+    PLAYER_PREFETCH_BURST = 2
+    PLAYER_PREFETCH_WORKERS = 1
+
+    # 点播文档站采集：并发视频数、每批读写 Redis 的视频数，镜像站点连续失败多少次后降低优先级及恢复时间
+    DOCS_COLLECT_WORKERS = 8
+    DOCS_COLLECT_CHUNK = 50
+    DOCS_MIRROR_FAILURE_THRESHOLD = 3
+    DOCS_MIRROR_RESET_TIMEOUT = 5 * 60
+
+    # YouTube 采集：并发频道数、上游请求速率（次/秒）及突发数，频道 handle 对应 ID 的缓存时间
+    YOUTUB_COLLECT_WORKERS = 4
+    YOUTUB_COLLECT_RATE = 0.5
+    YOUTUB_COLLECT_BURST = 2
+    YOUTUB_CHANNEL_ID_TTL = 30 * 86400
+
+    # yt-dlp 常驻解析进程数、等待队列长度、单次解析超时秒数、进程启动超时秒数，进程处理一定次数后重建
+    YTDLP_WORKERS = 2
+    YTDLP_MAX_QUEUE = 16
+    YTDLP_TIMEOUT = 20
+    YTDLP_START_TIMEOUT = 30
+    YTDLP_MAX_TASKS = 200
+
+    # 改写后的 m3u8 播放列表缓存：直播按目标分片时长计算缓存时间，点播列表固定缓存
+    M3U8_CACHE_MAX_ITEMS = 512
+    M3U8_CACHE_DEFAULT_TTL = 2
+    M3U8_CACHE_VOD_TTL = 5 * 60
+
+    # 视频分片缓存：内存按字节数限制容量，淘汰的分片写入本地磁盘目录
+    SEGMENT_CACHE_DIR = os.getenv("SEGMENT_CACHE_DIR", "cache/segments")
+    SEGMENT_CACHE_MEMORY_BYTES = 128 * 1024 * 1024
+    SEGMENT_CACHE_DISK_BYTES = 1024 * 1024 * 1024
+    SEGMENT_CACHE_MAX_ITEM_BYTES = 16 * 1024 * 1024
+    SEGMENT_CACHE_TTL = 30 * 60
+
+    # 节目单缓存时间：历史日期不再变化，当天及未来的节目单可能调整
+    EPG_CACHE_TTL_PAST = 7 * 86400
+    EPG_CACHE_TTL_CURRENT = 4 * 3600
+
     _MIGU_CID_MAP = {
         "CCTV1综合": "cctv1",
         "CCTV2财经": "cctv2",
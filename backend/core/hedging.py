@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+from core.constants import Constants
+from core.metrics import LatencyHistogram
+
+_T = TypeVar("_T")
+
+
+class HedgeBudget:
+    """
+    对冲请求预算：对冲次数不超过请求数的固定比例（允许少量突发），
+    计数超过窗口后减半衰减，预算跟随最近的流量变化
+    """
+
+    def __init__(self, ratio: float = Constants.HEDGE_BUDGET_RATIO, burst: int = 3, window: int = 1000):
+        self._ratio = ratio
+        self._burst = burst
+        self._window = window
+        self._requests = 0
+        self._hedges = 0
+        self._denied = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._requests += 1
+            if self._requests > self._window:
+                self._requests //= 2
+                self._hedges //= 2
+
+    def try_hedge(self) -> bool:
+        with self._lock:
+            if self._hedges + 1 > self._ratio * self._requests + self._burst:
+                self._denied += 1
+                return False
+            self._hedges += 1
+            return True
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"requests": self._requests, "hedges": self._hedges, "denied": self._denied}
+
+
+def hedge_delay(latency: LatencyHistogram) -> float:
+    """对冲等待时间取观测到的 p90 延迟，样本不足时使用默认值"""
+    if latency.count < Constants.HEDGE_MIN_SAMPLES:
+        return Constants.HEDGE_DEFAULT_DELAY
+    return max(Constants.HEDGE_MIN_DELAY, latency.quantile(0.9) or Constants.HEDGE_DEFAULT_DELAY)
+
+
+async def hedged_first(factories: List[Callable[[], Awaitable[Optional[_T]]]],
+                       delay: Callable[[int], float],
+                       budget: HedgeBudget) -> Optional[_T]:
+    """
+    依次尝试多个候选请求（如多个镜像站点），返回第一个非空结果并取消其余请求：
+    当前请求失败或返回空结果时立即启动下一个；超过 delay(当前下标) 仍未完成且预算允许时提前启动下一个（对冲）
+    """
+    if not factories:
+        return None
+
+    pending = set()
+    next_idx = 0
+
+    def launch() -> None:
+        nonlocal next_idx
+        pending.add(asyncio.ensure_future(factories[next_idx]()))
+        next_idx += 1
+
+    budget.record_request()
+    launch()
+    can_hedge = True
+    try:
+        while pending:
+            timeout = delay(next_idx - 1) if can_hedge and next_idx < len(factories) else None
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                if budget.try_hedge():
+                    launch()
+                else:
+                    can_hedge = False
+                continue
+
+            for task in done:
+                pending.discard(task)
+                if task.exception() is None and task.result() is not None:
+                    return task.result()
+                if next_idx < len(factories):
+                    launch()
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,69 @@
+import fnmatch
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TtlLruCache:
+    """
+    线程安全的进程内缓存：容量满时淘汰最久未使用的条目，每个条目有独立的过期时间
+    """
+
+    def __init__(self, max_items: int, clock: Callable[[], float] = time.monotonic):
+        self._max_items = max_items
+        self._clock = clock
+        self._data: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        """:return: (是否命中, 缓存值)，缓存值本身可以是 None"""
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return False, None
+            value, expire_at = item
+            if expire_at <= self._clock():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        found, value = self.lookup(key)
+        return value if found else default
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            self.delete(key)
+            return
+        with self._lock:
+            self._data[key] = (value, self._clock() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_items:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.pop(key, None)
+            return item[0] if item else None
+
+    def delete_prefix(self, prefix: str) -> int:
+        """前缀中的 * 与 Redis SCAN 一致，匹配任意字符"""
+        with self._lock:
+            if "*" in prefix:
+                keys = [key for key in self._data if fnmatch.fnmatchcase(key, f"{prefix}*")]
+            else:
+                keys = [key for key in self._data if key.startswith(prefix)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
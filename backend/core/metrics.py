@@ -0,0 +1,62 @@
+import bisect
+import threading
+from typing import Dict, List
+
+
+class LatencyHistogram:
+    """
+    线程安全的延迟直方图：固定毫秒分桶计数，分位数取所在分桶的上界，内存占用与请求数无关
+    """
+
+    BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    def __init__(self, buckets_ms: tuple = BUCKETS_MS):
+        self._bounds = list(buckets_ms)
+        self._counts: List[int] = [0] * (len(self._bounds) + 1)
+        self._total = 0
+        self._sum_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        idx = bisect.bisect_left(self._bounds, ms)
+        with self._lock:
+            self._counts[idx] += 1
+            self._total += 1
+            self._sum_ms += ms
+
+    @property
+    def count(self) -> int:
+        return self._total
+
+    def quantile(self, q: float) -> float | None:
+        """分位数（秒），没有样本时返回 None，超过最大分桶时返回最大分桶上界"""
+        with self._lock:
+            if self._total == 0:
+                return None
+            rank = q * self._total
+            seen = 0
+            for idx, count in enumerate(self._counts):
+                seen += count
+                if seen >= rank and count:
+                    bound = self._bounds[min(idx, len(self._bounds) - 1)]
+                    return bound / 1000
+        return self._bounds[-1] / 1000
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            buckets = {f"le_{bound}ms": count for bound, count in zip(self._bounds, self._counts)}
+            buckets["inf"] = self._counts[-1]
+            total, sum_ms = self._total, self._sum_ms
+        return {
+            "count": total,
+            "avg_ms": round(sum_ms / total, 2) if total else 0,
+            "p50_ms": self._quantile_ms(0.5),
+            "p90_ms": self._quantile_ms(0.9),
+            "p99_ms": self._quantile_ms(0.99),
+            "buckets": buckets,
+        }
+
+    def _quantile_ms(self, q: float) -> int | None:
+        value = self.quantile(q)
+        return int(value * 1000) if value is not None else None
@@ -0,0 +1,47 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶限流器：按固定速率补充令牌，允许不超过容量的突发请求
+    """
+
+    def __init__(self, rate: float, capacity: int | None = None):
+        self._rate = rate
+        self._capacity = capacity if capacity is not None else max(1, int(rate))
+        self._tokens = float(self._capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def _take_or_wait(self, tokens: int) -> float:
+        """获取成功返回 0，否则返回需要等待的秒数"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0
+            return (tokens - self._tokens) / self._rate
+
+    def acquire(self, tokens: int = 1) -> None:
+        """阻塞直到获取到令牌"""
+        while wait := self._take_or_wait(tokens):
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 1) -> None:
+        """协程版：等待令牌时不阻塞事件循环"""
+        while wait := self._take_or_wait(tokens):
+            await asyncio.sleep(wait)
@@ -0,0 +1,366 @@
+import asyncio
+import hashlib
+import mmap
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# 缓存文件名为分片地址的 sha1（写入中的临时文件带线程号后缀），启动清理时只删除符合该格式的文件
+_FILE_NAME_PATTERN = re.compile(r"^[0-9a-f]{40}(\.\d+\.tmp)?$")
+# 缓存在配置目录下自建的子目录，不直接使用（也不清理）配置的目录本身
+_DATA_DIR_NAME = "talk-segments"
+
+
+class SegmentHit:
+    """
+    分片缓存命中结果：内存命中时持有 bytes，磁盘命中时持有只读 mmap，按块输出后需要调用 close
+    """
+
+    __slots__ = ("content_type", "size", "_data", "_file")
+
+    def __init__(self, data, content_type: str, file=None):
+        self.content_type = content_type
+        self.size = len(data)
+        self._data = data
+        self._file = file
+
+    def chunks(self, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        view = memoryview(self._data)
+        try:
+            for offset in range(0, self.size, chunk_size):
+                yield bytes(view[offset:offset + chunk_size])
+        finally:
+            view.release()
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        if self._file:
+            self._file.close()
+
+
+class SegmentWriter:
+    """
+    边转发边缓存：上游数据块在发送给客户端的同时复制一份，超过单个分片大小上限后停止复制；
+    完整读取后写入缓存，并唤醒等待同一分片的其他请求
+    """
+
+    def __init__(self, cache: "SegmentCache", url: str, content_type: str, waiter: asyncio.Future | None):
+        self._cache = cache
+        self._url = url
+        self._content_type = content_type
+        self._waiter = waiter
+        self._buffer: bytearray | None = bytearray() if waiter is not None else None
+        self._closed = False
+
+    def begin(self, content_type: str, cacheable: bool = True) -> None:
+        """收到上游响应头后调用；非完整响应（如错误状态、内容编码）不缓存"""
+        self._content_type = content_type
+        if not cacheable:
+            self._buffer = None
+
+    def write(self, chunk: bytes) -> None:
+        self._cache._stats.bytes_fetched += len(chunk)
+        if self._buffer is None:
+            return
+        if len(self._buffer) + len(chunk) > self._cache.max_item_bytes:
+            self._buffer = None
+            return
+        self._buffer.extend(chunk)
+
+    async def close(self, complete: bool) -> None:
+        """:param complete: 上游数据是否完整读取，中途断开的不缓存"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if complete and self._buffer:
+                # 内存淘汰时可能写磁盘，放到线程中执行，不阻塞事件循环
+                await asyncio.to_thread(self._cache.put, self._url, bytes(self._buffer), self._content_type)
+        finally:
+            self._buffer = None
+            self._cache._release_fill(self._url, self._waiter)
+
+
+class _Stats:
+    __slots__ = ("memory_hits", "disk_hits", "misses", "shared", "bytes_saved", "bytes_fetched", "spills",
+                 "evictions")
+
+    def __init__(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.bytes_saved = 0
+        self.bytes_fetched = 0
+        self.spills = 0
+        self.evictions = 0
+
+
+class SegmentCache:
+    """
+    视频分片缓存：按上游分片地址缓存，内存 LRU 按字节数限制容量，淘汰的分片写入本地磁盘，
+    磁盘命中时通过 mmap 读取；未命中时同一地址只请求一次上游，并发观看的客户端等待首个请求写入缓存后共享。
+    锁内只维护索引，文件读写都在锁外进行
+    """
+
+    def __init__(self,
+                 cache_dir: str,
+                 memory_bytes: int,
+                 disk_bytes: int,
+                 max_item_bytes: int,
+                 ttl: float,
+                 fill_timeout: float = 10,
+                 clock: Callable[[], float] = time.monotonic):
+        self._data_dir = os.path.join(cache_dir, _DATA_DIR_NAME)
+        self._memory_bytes = memory_bytes
+        self._disk_bytes = disk_bytes
+        self._max_item_bytes = max_item_bytes
+        self._ttl = ttl
+        self._fill_timeout = fill_timeout
+        self._clock = clock
+        # key -> (分片内容, Content-Type, 过期时间)
+        self._memory: "OrderedDict[str, Tuple[bytes, str, float]]" = OrderedDict()
+        self._memory_size = 0
+        # key -> (文件大小, Content-Type, 过期时间)
+        self._disk: "OrderedDict[str, Tuple[int, str, float]]" = OrderedDict()
+        self._disk_size = 0
+        self._disk_ready = False
+        self._disk_lock = threading.Lock()
+        # 正在从上游读取的分片：key -> 读取结束时完成的 Future
+        self._filling: Dict[str, asyncio.Future] = {}
+        self._stats = _Stats()
+        self._lock = threading.Lock()
+
+    @property
+    def max_item_bytes(self) -> int:
+        return self._max_item_bytes
+
+    @staticmethod
+    def key_of(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._data_dir, key)
+
+    def _ensure_disk(self) -> bool:
+        """首次写磁盘时删除上次运行残留的缓存文件（索引只在内存中），只处理自建子目录下 sha1 命名的文件"""
+        if self._disk_ready or self._disk_bytes <= 0:
+            return self._disk_ready
+        with self._disk_lock:
+            if self._disk_ready:
+                return True
+            try:
+                os.makedirs(self._data_dir, exist_ok=True)
+                for name in os.listdir(self._data_dir):
+                    if _FILE_NAME_PATTERN.match(name):
+                        self._unlink(os.path.join(self._data_dir, name))
+            except OSError:
+                return False
+            self._disk_ready = True
+        return True
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _pop_disk(self, key: str) -> None:
+        """从磁盘索引移除（需持有锁），文件由调用方在锁外删除"""
+        size, _, _ = self._disk.pop(key)
+        self._disk_size -= size
+
+    def _spill(self, victims: List[Tuple[str, bytes, str, float]]) -> None:
+        """内存淘汰的分片写入磁盘（锁外执行），磁盘超出容量时删除最久未使用的文件"""
+        for key, data, content_type, expire_at in victims:
+            if expire_at <= self._clock() or len(data) > self._disk_bytes or not self._ensure_disk():
+                self._stats.evictions += 1
+                continue
+            tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self._path(key))
+            except OSError:
+                self._unlink(tmp_path)
+                self._stats.evictions += 1
+                continue
+
+            removed = []
+            with self._lock:
+                if key in self._disk:
+                    # 同一分片的文件已被覆盖，只更新索引
+                    self._pop_disk(key)
+                while self._disk and self._disk_size + len(data) > self._disk_bytes:
+                    old_key = next(iter(self._disk))
+                    self._pop_disk(old_key)
+                    removed.append(old_key)
+                self._disk[key] = (len(data), content_type, expire_at)
+                self._disk_size += len(data)
+                self._stats.spills += 1
+                self._stats.evictions += len(removed)
+            for old_key in removed:
+                self._unlink(self._path(old_key))
+
+    def _lookup(self, key: str) -> Tuple[Optional[SegmentHit], Optional[Tuple[int, str]], Optional[str]]:
+        """
+        只查内存索引（需要在锁外打开磁盘文件）
+        :return: (内存命中结果, 磁盘命中的 (大小, Content-Type), 需要删除的过期文件 key)
+        """
+        now = self._clock()
+        with self._lock:
+            item = self._memory.get(key)
+            if item:
+                data, content_type, expire_at = item
+                if expire_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats.memory_hits += 1
+                    self._stats.bytes_saved += len(data)
+                    return SegmentHit(data, content_type), None, None
+                del self._memory[key]
+                self._memory_size -= len(data)
+
+            item = self._disk.get(key)
+            if not item:
+                return None, None, None
+            size, content_type, expire_at = item
+            if expire_at <= now:
+                self._pop_disk(key)
+                return None, None, key
+            self._disk.move_to_end(key)
+            return None, (size, content_type), None
+
+    def _open_disk(self, key: str, size: int, content_type: str) -> Optional[SegmentHit]:
+        try:
+            f = open(self._path(key), "rb")
+        except OSError:
+            with self._lock:
+                if key in self._disk:
+                    self._pop_disk(key)
+            return None
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            f.close()
+            return None
+        with self._lock:
+            self._stats.disk_hits += 1
+            self._stats.bytes_saved += size
+        return SegmentHit(data, content_type, f)
+
+    def get(self, url: str) -> Optional[SegmentHit]:
+        key = self.key_of(url)
+        hit, disk_item, expired = self._lookup(key)
+        if expired:
+            self._unlink(self._path(expired))
+        if hit or not disk_item:
+            return hit
+        return self._open_disk(key, *disk_item)
+
+    async def get_async(self, url: str) -> Optional[SegmentHit]:
+        """内存命中直接返回，磁盘命中时在线程中打开文件，不阻塞事件循环"""
+        key = self.key_of(url)
+        hit, disk_item, expired = self._lookup(key)
+        if expired:
+            await asyncio.to_thread(self._unlink, self._path(expired))
+        if hit or not disk_item:
+            return hit
+        return await asyncio.to_thread(self._open_disk, key, *disk_item)
+
+    def put(self, url: str, data: bytes, content_type: str) -> bool:
+        """超过单个分片大小上限的不缓存"""
+        if not data or len(data) > self._max_item_bytes or len(data) > self._memory_bytes:
+            return False
+        key = self.key_of(url)
+        expire_at = self._clock() + self._ttl
+        victims = []
+        stale_file = False
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old:
+                self._memory_size -= len(old[0])
+            if key in self._disk:
+                self._pop_disk(key)
+                stale_file = True
+            self._memory[key] = (data, content_type, expire_at)
+            self._memory_size += len(data)
+            while self._memory_size > self._memory_bytes:
+                old_key, (old_data, old_type, old_expire) = self._memory.popitem(last=False)
+                self._memory_size -= len(old_data)
+                victims.append((old_key, old_data, old_type, old_expire))
+        if stale_file:
+            self._unlink(self._path(key))
+        self._spill(victims)
+        return True
+
+    async def open(self, url: str) -> Tuple[Optional[SegmentHit], Optional["SegmentWriter"]]:
+        """
+        读取分片：命中时返回 (命中结果, None)；未命中时如已有请求在读取同一分片，等待其写入缓存后再读；
+        仍未命中时返回 (None, 写入器)，调用方边转发上游数据边写入，结束后调用 close
+        """
+        hit = await self.get_async(url)
+        if hit:
+            return hit, None
+
+        key = self.key_of(url)
+        waiter = self._filling.get(key)
+        if waiter is not None:
+            # 首个请求的客户端可能在开始转发前断开，等待有时间上限
+            done, _ = await asyncio.wait({waiter}, timeout=self._fill_timeout)
+            if not done:
+                self._release_fill(url, waiter)
+            hit = await self.get_async(url)
+            if hit:
+                self._stats.shared += 1
+                return hit, None
+            # 首个请求失败或分片超出上限未缓存，不再等待，各自请求上游
+            self._stats.misses += 1
+            return None, SegmentWriter(self, url, "", None)
+
+        self._stats.misses += 1
+        waiter = self._filling[key] = asyncio.get_running_loop().create_future()
+        return None, SegmentWriter(self, url, "", waiter)
+
+    def _release_fill(self, url: str, waiter: asyncio.Future | None) -> None:
+        if waiter is None:
+            return
+        key = self.key_of(url)
+        if self._filling.get(key) is waiter:
+            del self._filling[key]
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def clear(self) -> None:
+        with self._lock:
+            keys = list(self._disk)
+            for key in keys:
+                self._pop_disk(key)
+            self._memory.clear()
+            self._memory_size = 0
+        for key in keys:
+            self._unlink(self._path(key))
+
+    def stats(self) -> Dict:
+        s = self._stats
+        requests = s.memory_hits + s.disk_hits + s.misses + s.shared
+        return {
+            "requests": requests,
+            "memory_hits": s.memory_hits,
+            "disk_hits": s.disk_hits,
+            "misses": s.misses,
+            "shared": s.shared,
+            "hit_ratio": round((requests - s.misses) / requests, 4) if requests else 0,
+            "bytes_saved": s.bytes_saved,
+            "bytes_fetched": s.bytes_fetched,
+            "spills": s.spills,
+            "evictions": s.evictions,
+            "memory_items": len(self._memory),
+            "memory_bytes": self._memory_size,
+            "disk_items": len(self._disk),
+            "disk_bytes": self._disk_size,
+        }
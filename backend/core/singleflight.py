@@ -0,0 +1,79 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+_T = TypeVar("_T")
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    线程版请求合并：同一个 key 同时只执行一次函数，并发调用方等待并共享同一个结果
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[], _T]) -> _T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
+
+
+class AsyncSingleFlight:
+    """
+    协程版请求合并：同一个 key 同时只执行一次协程，并发调用方等待同一个 Future；
+    发起方被取消时不影响其他等待方，由后台任务继续执行
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[_T]]) -> _T:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._done(key, f))
+        # shield：某个等待方断开连接被取消时不取消共享的任务
+        return await asyncio.shield(future)
+
+    def _done(self, key: str, future: asyncio.Future) -> None:
+        self._calls.pop(key, None)
+        # 所有等待方都已取消时，避免出现 "exception was never retrieved" 警告
+        if not future.cancelled():
+            future.exception()
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
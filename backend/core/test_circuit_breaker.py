@@ -0,0 +1,38 @@
+import time
+import unittest
+
+from core.circuit_breaker import CircuitBreaker
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """测试熔断器状态切换"""
+
+    def test_open_after_threshold(self):
+        """测试连续失败达到阈值后拒绝请求"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        self.assertEqual(CircuitBreaker.OPEN, breaker.state)
+
+    def test_half_open_probe(self):
+        """测试冷却结束后只放行一个探测请求"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(CircuitBreaker.CLOSED, breaker.state)
+        self.assertTrue(breaker.allow())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+
+from core.hedging import HedgeBudget, hedged_first
+
+
+def make_factory(result, seconds: float, started: list, name: str):
+    async def run():
+        started.append(name)
+        await asyncio.sleep(seconds)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return run
+
+
+class TestHedging(unittest.TestCase):
+    """测试对冲请求"""
+
+    def test_budget(self):
+        """测试对冲次数受请求比例限制"""
+        budget = HedgeBudget(ratio=0.1, burst=1)
+        for _ in range(10):
+            budget.record_request()
+        self.assertTrue(budget.try_hedge())
+        self.assertTrue(budget.try_hedge())
+        self.assertFalse(budget.try_hedge())
+
+    def test_hedge_slow_request(self):
+        """测试慢请求超过等待时间后启动对冲，取先返回的结果"""
+        started = []
+        factories = [
+            make_factory("slow", 0.5, started, "a"),
+            make_factory("fast", 0.01, started, "b"),
+        ]
+        result = asyncio.run(hedged_first(factories, lambda idx: 0.05, HedgeBudget(burst=1)))
+        self.assertEqual("fast", result)
+        self.assertEqual(["a", "b"], started)
+
+    def test_no_hedge_without_budget(self):
+        """测试预算不足时等待当前请求完成"""
+        started = []
+        factories = [
+            make_factory("slow", 0.1, started, "a"),
+            make_factory("fast", 0.01, started, "b"),
+        ]
+        result = asyncio.run(hedged_first(factories, lambda idx: 0.01, HedgeBudget(burst=0)))
+        self.assertEqual("slow", result)
+        self.assertEqual(["a"], started)
+
+    def test_fallback_on_empty_or_error(self):
+        """测试失败或空结果时立即尝试下一个"""
+        started = []
+        factories = [
+            make_factory(ValueError("boom"), 0, started, "a"),
+            make_factory(None, 0, started, "b"),
+            make_factory("ok", 0, started, "c"),
+        ]
+        result = asyncio.run(hedged_first(factories, lambda idx: 10, HedgeBudget(burst=0)))
+        self.assertEqual("ok", result)
+        self.assertEqual(["a", "b", "c"], started)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,51 @@
+import unittest
+
+from core.lru import TtlLruCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTtlLruCache(unittest.TestCase):
+    """测试进程内 LRU/TTL 缓存"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TtlLruCache(max_items=2, clock=self.clock)
+
+    def test_expire(self):
+        """测试条目到期后失效"""
+        self.cache.set("a", 1, ttl=10)
+        self.assertEqual(1, self.cache.get("a"))
+        self.clock.now = 10
+        self.assertEqual((False, None), self.cache.lookup("a"))
+
+    def test_lru_eviction(self):
+        """测试容量满时淘汰最久未使用的条目"""
+        self.cache.set("a", 1, ttl=10)
+        self.cache.set("b", 2, ttl=10)
+        self.cache.get("a")
+        self.cache.set("c", 3, ttl=10)
+        self.assertEqual(1, self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(2, len(self.cache))
+
+    def test_none_value_and_prefix(self):
+        """测试缓存空值及按前缀删除"""
+        self.cache.set("x:1", None, ttl=10)
+        self.assertEqual((True, None), self.cache.lookup("x:1"))
+        self.assertEqual(1, self.cache.delete_prefix("x:"))
+        self.cache.set("tv-vod:a:player:1", 1, 10)
+        self.cache.set("tv-vod:b:resp:2", 2, 10)
+        self.assertEqual(1, self.cache.delete_prefix("tv-vod:*:player:"))
+        self.assertEqual((True, 2), self.cache.lookup("tv-vod:b:resp:2"))
+        self.assertEqual((False, None), self.cache.lookup("x:1"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,37 @@
+import unittest
+
+from core.metrics import LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """测试延迟直方图"""
+
+    def test_empty(self):
+        """测试没有样本时的分位数"""
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.quantile(0.9))
+        self.assertEqual(0, histogram.snapshot()["count"])
+
+    def test_quantile(self):
+        """测试分位数取所在分桶上界"""
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.observe(0.02)
+        for _ in range(10):
+            histogram.observe(0.8)
+
+        self.assertEqual(0.025, histogram.quantile(0.5))
+        self.assertEqual(0.025, histogram.quantile(0.9))
+        self.assertEqual(1.0, histogram.quantile(0.99))
+        self.assertEqual(100, histogram.snapshot()["count"])
+
+    def test_overflow(self):
+        """测试超出最大分桶的样本"""
+        histogram = LatencyHistogram(buckets_ms=(10, 100))
+        histogram.observe(5)
+        self.assertEqual(0.1, histogram.quantile(0.5))
+        self.assertEqual(1, histogram.snapshot()["buckets"]["inf"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
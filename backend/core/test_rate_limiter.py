@@ -0,0 +1,49 @@
+import asyncio
+import time
+import unittest
+
+from core.rate_limiter import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    """测试令牌桶限流"""
+
+    def test_burst_capacity(self):
+        """测试突发请求不超过容量"""
+        bucket = TokenBucket(rate=1, capacity=3)
+        self.assertEqual([True, True, True, False], [bucket.try_acquire() for _ in range(4)])
+
+    def test_acquire_waits_for_refill(self):
+        """测试令牌耗尽后按速率等待"""
+        bucket = TokenBucket(rate=20, capacity=1)
+        start = time.monotonic()
+        for _ in range(3):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_acquire_async_does_not_block_loop(self):
+        """测试协程等待令牌期间其他协程可以继续执行"""
+        bucket = TokenBucket(rate=20, capacity=1)
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def consumer():
+            for _ in range(3):
+                await bucket.acquire_async()
+
+        async def main():
+            start = time.monotonic()
+            await asyncio.gather(consumer(), ticker())
+            return time.monotonic() - start
+
+        self.assertGreaterEqual(asyncio.run(main()), 0.09)
+        self.assertEqual(5, len(ticks))
+        self.assertLess(ticks[1] - ticks[0], 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from core.segment_cache import SegmentCache
+
+
+class TestSegmentCache(unittest.TestCase):
+    """测试视频分片缓存"""
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.now = 0
+        self.cache = SegmentCache(os.path.join(self._tmp_dir.name, "segments"), memory_bytes=10, disk_bytes=12,
+                                  max_item_bytes=8, ttl=60, clock=lambda: self.now)
+
+    def tearDown(self):
+        self.cache.clear()
+        self._tmp_dir.cleanup()
+
+    def read(self, url: str):
+        hit = self.cache.get(url)
+        if not hit:
+            return None
+        try:
+            return b"".join(hit.chunks(chunk_size=3))
+        finally:
+            hit.close()
+
+    def test_memory_spill_to_disk(self):
+        """测试内存超出容量时淘汰到磁盘，磁盘命中通过 mmap 读取"""
+        self.cache.put("seg-1", b"aaaaaa", "video/mp2t")
+        self.cache.put("seg-2", b"bbbbbb", "video/mp2t")
+        stats = self.cache.stats()
+        self.assertEqual((1, 1), (stats["memory_items"], stats["disk_items"]))
+
+        self.assertEqual(b"bbbbbb", self.read("seg-2"))
+        self.assertEqual(b"aaaaaa", self.read("seg-1"))
+        stats = self.cache.stats()
+        self.assertEqual((1, 1, 12), (stats["memory_hits"], stats["disk_hits"], stats["bytes_saved"]))
+
+    def test_disk_budget_and_ttl(self):
+        """测试磁盘容量淘汰最旧的文件，过期分片不再命中"""
+        for idx in range(4):
+            self.cache.put(f"seg-{idx}", b"x" * 6, "video/mp2t")
+        self.assertIsNone(self.read("seg-0"))
+        self.assertEqual(b"x" * 6, self.read("seg-1"))
+        self.assertFalse(self.cache.put("large", b"x" * 9, "video/mp2t"))
+
+        self.now = 61
+        self.assertIsNone(self.read("seg-3"))
+        self.assertIsNone(self.read("seg-1"))
+
+    def test_clear_only_owned_files(self):
+        """测试首次写磁盘时只清理自建子目录下的缓存文件，配置目录中的其他文件保留"""
+        root = os.path.join(self._tmp_dir.name, "segments")
+        data_dir = os.path.join(root, "talk-segments")
+        os.makedirs(data_dir)
+        stale = os.path.join(data_dir, SegmentCache.key_of("old"))
+        other = os.path.join(data_dir, "keep.txt")
+        outside = os.path.join(root, SegmentCache.key_of("outside"))
+        for path in (stale, other, outside):
+            with open(path, "wb") as f:
+                f.write(b"x")
+
+        self.cache.put("seg-1", b"aaaaaa", "video/mp2t")
+        self.cache.put("seg-2", b"bbbbbb", "video/mp2t")
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(other))
+        self.assertTrue(os.path.exists(outside))
+
+    def test_stream_fill_shared(self):
+        """测试边转发边写入缓存，并发请求等待首个请求完成后共享缓存"""
+
+        async def fill(chunks, complete=True):
+            hit, writer = await self.cache.open("seg-1")
+            if hit:
+                hit.close()
+                return "hit"
+            writer.begin("video/mp2t")
+            for chunk in chunks:
+                await asyncio.sleep(0.01)
+                writer.write(chunk)
+            await writer.close(complete)
+            return "miss"
+
+        async def main():
+            return await asyncio.gather(*[fill([b"seg", b"ment"]) for _ in range(4)])
+
+        self.assertEqual(["miss", "hit", "hit", "hit"], asyncio.run(main()))
+        self.assertEqual(b"segment", self.read("seg-1"))
+        stats = self.cache.stats()
+        self.assertEqual((1, 3, 7), (stats["misses"], stats["shared"], stats["bytes_fetched"]))
+
+    def test_stream_fill_skip(self):
+        """测试超过单个分片上限或中途断开的数据不缓存"""
+
+        async def fill(url, chunks, complete):
+            _, writer = await self.cache.open(url)
+            writer.begin("video/mp2t")
+            for chunk in chunks:
+                writer.write(chunk)
+            await writer.close(complete)
+
+        asyncio.run(fill("large", [b"x" * 5, b"x" * 5], True))
+        asyncio.run(fill("broken", [b"x" * 5], False))
+        self.assertIsNone(self.read("large"))
+        self.assertIsNone(self.read("broken"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from core.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """测试并发请求合并"""
+
+    def test_concurrent_calls_share_result(self):
+        """测试同一 key 的并发调用只执行一次"""
+        flight = SingleFlight()
+        calls = []
+        results = []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.1)
+            return "url"
+
+        threads = [threading.Thread(target=lambda: results.append(flight.do("cctv1", work))) for _ in range(10)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual(["url"] * 10, results)
+        self.assertFalse(flight.in_flight("cctv1"))
+
+    def test_error_propagates(self):
+        """测试异常传递给调用方，且不影响下一次调用"""
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            flight.do("cctv1", fail)
+        self.assertEqual("ok", flight.do("cctv1", lambda: "ok"))
+
+
+class TestAsyncSingleFlight(unittest.TestCase):
+    """测试协程版请求合并"""
+
+    def test_concurrent_calls_share_result(self):
+        """测试同一 key 的并发协程只执行一次，且等待方取消不影响其他等待方"""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return b"seg"
+
+        async def main():
+            waiters = [asyncio.ensure_future(flight.do("seg-1", work)) for _ in range(5)]
+            await asyncio.sleep(0.01)
+            waiters[0].cancel()
+            results = await asyncio.gather(*waiters[1:])
+            return results, flight.in_flight("seg-1")
+
+        results, in_flight = asyncio.run(main())
+        self.assertEqual(1, len(calls))
+        self.assertEqual([b"seg"] * 4, results)
+        self.assertFalse(in_flight)
+
+    def test_error_propagates(self):
+        """测试异常传递给所有等待方"""
+        flight = AsyncSingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def main():
+            return await asyncio.gather(flight.do("seg-1", fail), flight.do("seg-1", fail), return_exceptions=True)
+
+        results = asyncio.run(main())
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -55,6 +55,9 @@ class EpgRequest(BaseModel):
     domain: Optional[str] = Field(default="", description="访问视频的地址")
     show_logo: Optional[bool] = Field(default=True, description="全局开关，是否打开Logo显示")
     rename_cid: Optional[bool] = Field(default=True, description="是否替换图片后缀")
+    past_days: Optional[int] = Field(default=0, ge=0, le=7, description="节目单包含的历史天数")
+    future_days: Optional[int] = Field(default=0, ge=0, le=7, description="节目单包含的未来天数")
+    gzip: Optional[bool] = Field(default=False, description="是否同时输出gzip压缩的节目单")
 
 
 class UpdateLiveRequest(BaseModel):
@@ -68,6 +71,10 @@ class UpdateLiveRequest(BaseModel):
     check_m3u8: Optional[bool] = Field(False, description="是否检查视频的有效性")
     load_template: Optional[bool] = Field(True, description="是否加载本地模板文件")
     is_clear: Optional[bool] = Field(True, description="是否清空已有频道数据")
+    output_json: Optional[bool] = Field(False, description="是否同时输出JSON格式文件")
+    output_group: Optional[bool] = Field(False, description="是否按分组输出单独的M3U文件")
+    output_gzip: Optional[bool] = Field(False, description="是否同时输出gzip压缩文件")
+    direct_url: Optional[bool] = Field(False, description="Migu频道是否直接输出预解析的播放地址，仅在地址有效期充足时生效")
 
 
 class UpdateVodRequest(BaseModel):
@@ -75,6 +82,7 @@ class UpdateVodRequest(BaseModel):
 
     sp: str = Field("v-docs", description="来源标识，不能为空")
     is_full: bool = Field(False, description="True=强制更新所有缓存")
+    prefetch: int = Field(0, ge=0, le=50, description="采集完成后预解析每个分类最新N个视频的播放地址，0=不预解析")
 
 
 class ChannelQuery(BaseModel):
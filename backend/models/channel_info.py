@@ -91,13 +91,19 @@ class ChannelInfo:
         with self._lock:
             self.urls.discard(url_info)
 
-    def get_txt(self):
-        return "\n".join(
-            f"{self.name},{url.url}"
-            for url in sorted(self.urls, key=lambda x: (x.resolution, x.speed, -x.order), reverse=True)
-        )
+    def sorted_urls(self) -> List[ChannelUrl]:
+        """按分辨率、速度、添加顺序排序后的地址列表"""
+        with self._lock:
+            return sorted(self.urls, key=lambda x: (x.resolution, x.speed, -x.order), reverse=True)
 
-    def get_m3u(self, do_channel_logo: int, title, show_logo):
+    def get_txt(self, sorted_urls: List[ChannelUrl] = None):
+        if sorted_urls is None:
+            sorted_urls = self.sorted_urls()
+        return "\n".join(f"{self.name},{url.url}" for url in sorted_urls)
+
+    def get_m3u(self, do_channel_logo: int, title, show_logo, sorted_urls: List[ChannelUrl] = None):
+        if sorted_urls is None:
+            sorted_urls = self.sorted_urls()
         if not title:
             title = self.title
 
@@ -118,13 +124,13 @@ class ChannelInfo:
         return "\n".join(
             f'#EXTINF:-1 {tvg_id}{tvg_name}{tvg_logo}group-title="{title}",'
             f"{self.name}\n{url.url}"
-            for url in sorted(self.urls, key=lambda x: (x.resolution, x.speed, -x.order), reverse=True)
+            for url in sorted_urls
         )
 
     def get_all(self, title="") -> str:
         if not title:
             title = self.title
-        sorted_urls = sorted(self.urls, key=lambda x: (x.resolution, x.speed, -x.order), reverse=True)
+        sorted_urls = self.sorted_urls()
         separator = [
             "",
             "===============================================================",
@@ -182,6 +188,10 @@ class ChannelList:
                 return self._channels.get(channel_name)
         return ChannelInfo()
 
+    def sorted_channels(self) -> List[ChannelInfo]:
+        """获取排序后的频道列表快照，供单次遍历输出使用"""
+        return self._sorted_channels()
+
     def _sorted_channels(self) -> List[ChannelInfo]:
         """
         获取按 ChannelInfo.name 排序后的频道列表
@@ -224,10 +234,10 @@ class ChannelList:
                 if txt_line:
                     file_handle.write(f"{txt_line}\n")
 
-    def write_to_m3u_file(self, group_name, domain, show_logo, file_handle):
+    def write_to_m3u_file(self, group_name, show_logo, file_handle):
         with self._lock:
             do_channel_logo = config_manager.do_channel_logo(group_name)
             for channel_info in self._sorted_channels():
-                m3u_line = channel_info.get_m3u(do_channel_logo, group_name, domain, show_logo)
+                m3u_line = channel_info.get_m3u(do_channel_logo, group_name, show_logo)
                 if m3u_line:
                     file_handle.write(f"{m3u_line}\n")
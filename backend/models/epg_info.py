@@ -0,0 +1,83 @@
+import bisect
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class EpgChannel:
+    """
+    节目单频道：tvg_id/display_name 用于输出 XMLTV，source/source_id 用于定位上游节目单接口
+    """
+
+    def __init__(self, tvg_id: str, display_name: str, source: str, source_id: str):
+        self._tvg_id = tvg_id
+        self._display_name = display_name
+        self._source = source
+        self._source_id = source_id
+
+    @property
+    def tvg_id(self):
+        return self._tvg_id
+
+    @property
+    def display_name(self):
+        return self._display_name
+
+    @property
+    def source(self):
+        return self._source
+
+    @property
+    def source_id(self):
+        return self._source_id
+
+    def cache_key(self, date_str: str) -> str:
+        return f"tv-epg:{self._source}:{self._source_id}:{date_str}"
+
+
+class EpgIndex:
+    """
+    单个频道的节目区间索引：按开始时间排序的并行数组，使用二分查找定位节目，
+    查询当前/下一个节目或时间窗口内的节目时无需遍历全部数据
+    """
+
+    __slots__ = ("_starts", "_stops", "_titles", "_max_stops")
+
+    def __init__(self, programmes: Iterable[Tuple[int, int, str]]):
+        # 跨零点的节目可能同时出现在相邻两天的数据中，按开始时间去重
+        merged: Dict[int, Tuple[int, int, str]] = {}
+        for programme in programmes:
+            merged.setdefault(int(programme[0]), programme)
+
+        self._starts: List[int] = []
+        self._stops: List[int] = []
+        self._titles: List[str] = []
+        # 结束时间的前缀最大值，单调递增，用于窗口查询的二分定位
+        self._max_stops: List[int] = []
+        for start in sorted(merged):
+            _, stop, title = merged[start]
+            self._starts.append(start)
+            self._stops.append(int(stop))
+            self._titles.append(title)
+            self._max_stops.append(max(int(stop), self._max_stops[-1] if self._max_stops else int(stop)))
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[Tuple[int, int, str]]:
+        return zip(self._starts, self._stops, self._titles)
+
+    def _item(self, idx: int) -> Dict:
+        return {"start": self._starts[idx], "stop": self._stops[idx], "title": self._titles[idx]}
+
+    def now_next(self, at: int) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """获取指定时间正在播出的节目和下一个节目"""
+        idx = bisect.bisect_right(self._starts, at) - 1
+        current = self._item(idx) if idx >= 0 and self._stops[idx] > at else None
+        next_idx = idx + 1
+        following = self._item(next_idx) if next_idx < len(self._starts) else None
+        return current, following
+
+    def window(self, start: int, end: int) -> List[Dict]:
+        """获取与时间窗口 [start, end) 有交集的节目"""
+        lo = bisect.bisect_right(self._max_stops, start)
+        hi = bisect.bisect_left(self._starts, end)
+        return [self._item(idx) for idx in range(lo, hi) if self._stops[idx] > start]
@@ -0,0 +1,50 @@
+import unittest
+
+from models.epg_info import EpgIndex
+
+
+class TestEpgIndex(unittest.TestCase):
+    """测试节目区间索引"""
+
+    def setUp(self):
+        self.index = EpgIndex([
+            (200, 300, "午间新闻"),
+            (0, 100, "早间新闻"),
+            (100, 200, "朝闻天下"),
+            (400, 500, "晚间新闻"),
+            (200, 300, "午间新闻"),
+        ])
+
+    def test_sorted_and_deduplicated(self):
+        """测试按开始时间排序并去重"""
+        self.assertEqual([0, 100, 200, 400], [p[0] for p in self.index])
+
+    def test_now_next(self):
+        """测试当前及下一个节目"""
+        current, following = self.index.now_next(150)
+        self.assertEqual("朝闻天下", current["title"])
+        self.assertEqual("午间新闻", following["title"])
+
+        # 边界：开始时间属于当前节目
+        current, _ = self.index.now_next(200)
+        self.assertEqual("午间新闻", current["title"])
+
+    def test_now_next_gap(self):
+        """测试节目空档期和超出范围"""
+        current, following = self.index.now_next(350)
+        self.assertIsNone(current)
+        self.assertEqual("晚间新闻", following["title"])
+
+        current, following = self.index.now_next(600)
+        self.assertIsNone(current)
+        self.assertIsNone(following)
+
+    def test_window(self):
+        """测试时间窗口查询包含部分重叠的节目"""
+        titles = [p["title"] for p in self.index.window(150, 410)]
+        self.assertEqual(["朝闻天下", "午间新闻", "晚间新闻"], titles)
+        self.assertEqual([], self.index.window(300, 400))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,187 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.constants import Constants
+from core.logger_factory import LoggerFactory
+from core.lru import TtlLruCache
+from core.metrics import LatencyHistogram
+from core.segment_cache import SegmentCache
+from core.singleton import singleton
+from services.redis import async_redis_client, redis_client
+
+logger = LoggerFactory.get_logger(__name__)
+
+# 负缓存标记：上游确认不存在的数据只缓存在进程内，避免短时间内重复请求
+_NEGATIVE = object()
+
+
+class _PrefixStats:
+    __slots__ = ("l1_hits", "l2_hits", "misses", "negative_hits", "sets", "invalidations", "l2_latency")
+
+    def __init__(self):
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.sets = 0
+        self.invalidations = 0
+        self.l2_latency = LatencyHistogram()
+
+    def snapshot(self) -> Dict:
+        lookups = self.l1_hits + self.l2_hits + self.misses + self.negative_hits
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "sets": self.sets,
+            "invalidations": self.invalidations,
+            "hit_ratio": round((lookups - self.misses) / lookups, 4) if lookups else 0,
+            "l2_latency": self.l2_latency.snapshot(),
+        }
+
+
+@singleton
+class TwoTierCache:
+    """
+    二级缓存：L1 为进程内 LRU/TTL，L2 为 Redis；L1 的缓存时间不超过 L2 的剩余过期时间，
+    保证签名地址等有时效的数据不会在进程内过期后仍被使用。按 key 前缀统计命中率和 Redis 延迟
+    """
+
+    def __init__(self,
+                 max_items: int = Constants.CACHE_L1_MAX_ITEMS,
+                 l1_ttl: int = Constants.CACHE_L1_TTL):
+        self._l1 = TtlLruCache(max_items)
+        self._l1_ttl = l1_ttl
+        self._stats: Dict[str, _PrefixStats] = {}
+        self._hooks: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def prefix_of(key: str) -> str:
+        """统计维度：去掉 key 的最后一段，如 tv-vod:v-docs:player:abc -> tv-vod:v-docs:player"""
+        return key.rsplit(":", 1)[0] if ":" in key else key
+
+    def _get_stats(self, key: str) -> _PrefixStats:
+        prefix = self.prefix_of(key)
+        stats = self._stats.get(prefix)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(prefix, _PrefixStats())
+        return stats
+
+    def _l1_ttl_for(self, ttl: Optional[int]) -> int:
+        # Redis 返回 -1 表示永不过期，-2 表示不存在
+        if ttl is None or ttl == -1:
+            return self._l1_ttl
+        return min(self._l1_ttl, ttl)
+
+    def _lookup_l1(self, key: str, stats: _PrefixStats) -> Tuple[bool, Optional[str]]:
+        found, value = self._l1.lookup(key)
+        if not found:
+            return False, None
+        if value is _NEGATIVE:
+            stats.negative_hits += 1
+            return True, None
+        stats.l1_hits += 1
+        return True, value
+
+    def _fill_l1(self, key: str, value: Optional[str], ttl: int, stats: _PrefixStats) -> None:
+        if value is None:
+            stats.misses += 1
+            return
+        stats.l2_hits += 1
+        self._l1.set(key, value, self._l1_ttl_for(ttl))
+
+    def lookup(self, key: str) -> Tuple[bool, Optional[str]]:
+        """
+        :return: (是否命中, 缓存值)；命中负缓存时返回 (True, None)
+        """
+        stats = self._get_stats(key)
+        found, value = self._lookup_l1(key, stats)
+        if found:
+            return found, value
+
+        start = time.monotonic()
+        value, ttl = redis_client.get_with_ttl(key)
+        stats.l2_latency.observe(time.monotonic() - start)
+        self._fill_l1(key, value, ttl, stats)
+        return value is not None, value
+
+    def get(self, key: str) -> Optional[str]:
+        return self.lookup(key)[1]
+
+    def set(self, key: str, value: str, ex: int = -1) -> None:
+        self._get_stats(key).sets += 1
+        redis_client.set_ex(key, value, ex)
+        self._l1.set(key, value, self._l1_ttl_for(redis_client.expire if ex == -1 else ex))
+
+    async def lookup_async(self, key: str) -> Tuple[bool, Optional[str]]:
+        stats = self._get_stats(key)
+        found, value = self._lookup_l1(key, stats)
+        if found:
+            return found, value
+
+        start = time.monotonic()
+        value, ttl = await async_redis_client.get_with_ttl(key)
+        stats.l2_latency.observe(time.monotonic() - start)
+        self._fill_l1(key, value, ttl, stats)
+        return value is not None, value
+
+    async def get_async(self, key: str) -> Optional[str]:
+        return (await self.lookup_async(key))[1]
+
+    async def set_async(self, key: str, value: str, ex: int = -1) -> None:
+        self._get_stats(key).sets += 1
+        await async_redis_client.set_ex(key, value, ex)
+        self._l1.set(key, value, self._l1_ttl_for(redis_client.expire if ex == -1 else ex))
+
+    def set_negative(self, key: str, ttl: int = Constants.CACHE_NEGATIVE_TTL) -> None:
+        """记录不存在的结果，只缓存在 L1，到期后重新查询"""
+        self._l1.set(key, _NEGATIVE, ttl)
+
+    def add_invalidation_hook(self, hook: Callable[[str], None]) -> None:
+        """注册失效回调，参数为失效的 key 或前缀（以 * 结尾）"""
+        self._hooks.append(hook)
+
+    def _notify(self, target: str) -> None:
+        for hook in self._hooks:
+            try:
+                hook(target)
+            except Exception as e:
+                logger.warning(f"cache invalidation hook failed, target={target}, error={e}")
+
+    def invalidate(self, key: str, include_l2: bool = False) -> None:
+        self._get_stats(key).invalidations += 1
+        self._l1.delete(key)
+        if include_l2:
+            redis_client.delete(key)
+        self._notify(key)
+
+    def invalidate_prefix(self, prefix: str, include_l2: bool = False) -> int:
+        count = self._l1.delete_prefix(prefix)
+        if include_l2:
+            redis_client.delete(*redis_client.prefix_keys(prefix))
+        self._notify(f"{prefix}*")
+        return count
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            stats = dict(self._stats)
+        return {
+            "l1_items": len(self._l1),
+            "prefixes": {prefix: item.snapshot() for prefix, item in sorted(stats.items())},
+        }
+
+
+two_tier_cache = TwoTierCache()
+
+# 代理播放的视频分片缓存，多个客户端观看同一视频时共享上游请求
+segment_cache = SegmentCache(
+    cache_dir=Constants.SEGMENT_CACHE_DIR,
+    memory_bytes=Constants.SEGMENT_CACHE_MEMORY_BYTES,
+    disk_bytes=Constants.SEGMENT_CACHE_DISK_BYTES,
+    max_item_bytes=Constants.SEGMENT_CACHE_MAX_ITEM_BYTES,
+    ttl=Constants.SEGMENT_CACHE_TTL,
+)
@@ -1,6 +1,6 @@
 import re
 import threading
-from typing import Dict
+from typing import Dict, List, Tuple
 
 from core.singleton import singleton
 from models.channel_info import ChannelList, ChannelInfo
@@ -133,6 +133,11 @@ class ChannelBaseModel:
                 return self._channelGroups[group_name]
         return ChannelList()
 
+    def get_group_items(self) -> List[Tuple[str, ChannelList]]:
+        """获取分组快照，遍历输出时不需要长时间持有锁"""
+        with self._lock:
+            return list(self._channelGroups.items())
+
     def channel_ids(self):
         with self._lock:
             result = []
@@ -140,6 +145,9 @@ class ChannelBaseModel:
                 result.append(channel_list.get_channle_ids())
             return sorted(result)
 
+    def get_extm3u_header(self) -> str:
+        return self._get_extm3u_header()
+
     def _get_extm3u_header(self) -> str:
         base_header = "#EXTM3U"
         if not self._epg:
@@ -181,9 +189,7 @@ class ChannelBaseModel:
         with self._lock:
             file_handle.write(f"{self._get_extm3u_header()}\n")
             for group_name, channel_list in self._channelGroups.items():
-                do_channel_logo = config_manager.do_channel_logo(group_name)
-                file_handle.write(channel_list.get_m3u(do_channel_logo, group_name, self._epg.show_logo))
-                file_handle.write("\n")
+                channel_list.write_to_m3u_file(group_name, self._epg.show_logo, file_handle)
 
 
 @singleton
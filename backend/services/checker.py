@@ -5,7 +5,6 @@ import subprocess
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
 from urllib.parse import urlparse, unquote
 
 import requests
@@ -17,6 +16,7 @@ from core.logger_factory import LoggerFactory
 from models.channel_info import ChannelInfo, ChannelUrl
 from models.counter import Counter
 from services import channel_manager, config_manager
+from services.publisher import ChannelPublisher
 
 logger = LoggerFactory.get_logger(__name__)
 
@@ -236,7 +236,8 @@ class ChannelChecker:
         channel_manager.sort()
         return success_count.get_value()
 
-    def update_batch_live(self, threads, task_status, check_m3u8_invalid, output_file=None) -> int:
+    def update_batch_live(self, threads, task_status, check_m3u8_invalid, output_file=None,
+                          output_json=False, output_group=False, output_gzip=False) -> int:
         task_status_lock = threading.Lock()
         success_counter = Counter()
         processed_counter = Counter()
@@ -288,47 +289,12 @@ class ChannelChecker:
                     logger.error(f"Future unexpected error: {e}")
 
         final_success = success_counter.get_value()
-        self._write_data_to_txt_file(output_file)
-        self._write_data_to_m3u_file(output_file)
+        self._write_data_to_files(output_file, output_json, output_group, output_gzip)
         return final_success
 
-    def _write_data_to_txt_file(self, file_path):
-        """将分组管理器中的频道信息保存到文件"""
+    def _write_data_to_files(self, file_path, output_json=False, output_group=False, output_gzip=False):
+        """一次遍历频道数据，同时输出 txt/m3u 及可选格式，并原子替换目标文件"""
         if not file_path:
             return
-        try:
-            # 确保目录存在
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-            # 写入数据
-            with open(file_path, "w", encoding="utf-8") as f:
-                channel_manager.write_to_txt_file(f)
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"## 频道数据导出时间: {timestamp}")
-            logger.info(f"channel data saved to txt file {file_path}")
-        except Exception as e:
-            logger.error(f"save data to txt file error: {e}")
-
-    def _write_data_to_m3u_file(self, file_path):
-        """将分组管理器中的频道信息保存到文件"""
-
-        def replace_file_extension(target_path, new_ext):
-            file_name, _ = os.path.splitext(target_path)
-            return file_name + new_ext
-
-        if not file_path:
-            return
-
-        new_file_path = replace_file_extension(file_path, ".m3u")
-        try:
-            # 确保目录存在
-            os.makedirs(os.path.dirname(new_file_path), exist_ok=True)
-
-            # 写入数据
-            with open(new_file_path, "w", encoding="utf-8") as f:
-                channel_manager.write_to_m3u_file(f)
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"## 频道数据导出时间: {timestamp}")
-            logger.info(f"channel data saved to m3u file {new_file_path}")
-        except Exception as e:
-            logger.error(f"save data to m3u file error: {e}")
+        publisher = ChannelPublisher(file_path, output_json, output_group, output_gzip)
+        publisher.publish(channel_manager)
@@ -41,6 +41,8 @@ class SiteVideoConfig:
 
     def __init__(self, config_data: Dict[str, Any]):
         self._default_cover = config_data.get("default_cover", "")
+        # 接口响应缓存时间（秒），如 {list: 600, detail: 3600, search: 300}，0 表示不缓存
+        self._response_ttl: Dict[str, int] = config_data.get("response_cache_ttl") or {}
 
         self._site_collects: List[CollectInfo] = []
         self._site_class: List[Dict] = []
@@ -67,6 +69,10 @@ class SiteVideoConfig:
     def site_video_cover(self):
         return self._default_cover
 
+    @property
+    def response_ttl(self) -> Dict[str, int]:
+        return self._response_ttl
+
     @property
     def video_total(self):
         return self._video_total if self._video_total > 0 else 1
@@ -0,0 +1,232 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from core.constants import Constants
+from core.logger_factory import LoggerFactory
+from core.singleton import singleton
+from models.epg_info import EpgChannel, EpgIndex
+from services.redis import redis_bytes_client, redis_client
+from utils.atomic_writer import AtomicFileWriter
+from utils.codec import default_codec
+from utils.string_util import get_xml_cvt_string, seconds_to_time_str
+
+logger = LoggerFactory.get_logger(__name__)
+
+# 节目：(开始时间戳秒, 结束时间戳秒, 标题)
+Programme = Tuple[int, int, str]
+ProgrammeFetcher = Callable[[str, str], List[Programme]]
+
+
+class EpgBuilder:
+    """
+    增量节目单构建器：按 频道+日期 缓存节目数据，只抓取缺失或过期的日期，
+    合并为内存区间索引后一次遍历输出 XMLTV 文件（可选 gzip 副本）
+    """
+
+    XMLTV_HEADER = ('<?xml version="1.0" encoding="utf-8"?>\n'
+                    '<tv generator-info-name="Talk" generator-info-url="https://ak3721.top/tv">\n')
+    XMLTV_FOOTER = "</tv>\n"
+
+    def __init__(self, fetchers: Dict[str, ProgrammeFetcher], max_workers: int = Constants.MIGU_EPG_WORKERS):
+        self._fetchers = fetchers
+        self._max_workers = max_workers
+
+    @staticmethod
+    def get_dates(past_days: int = 0, future_days: int = 0) -> List[str]:
+        today = datetime.now().date()
+        return [
+            (today + timedelta(days=offset)).strftime("%Y%m%d")
+            for offset in range(-past_days, future_days + 1)
+        ]
+
+    @staticmethod
+    def _cache_ttl(date_str: str) -> int:
+        # 已经过去的日期节目单不会再变化，缓存时间更长
+        if date_str < datetime.now().strftime("%Y%m%d"):
+            return Constants.EPG_CACHE_TTL_PAST
+        return Constants.EPG_CACHE_TTL_CURRENT
+
+    @staticmethod
+    def load_cache(channel: EpgChannel, date_str: str) -> List[Programme] | None:
+        cache_data = redis_bytes_client.get(channel.cache_key(date_str))
+        if not cache_data:
+            return None
+        try:
+            return [tuple(item) for item in default_codec.decode(cache_data)]
+        except Exception as e:
+            logger.warning(f"decode epg cache failed [{channel.display_name}, {date_str}]: {e}")
+            return None
+
+    def _fetch(self, channel: EpgChannel, date_str: str) -> List[Programme]:
+        fetcher = self._fetchers.get(channel.source)
+        if not fetcher:
+            return []
+        try:
+            programmes = fetcher(channel.source_id, date_str)
+        except Exception as e:
+            logger.error(f"fetch epg [{channel.display_name}, {date_str}] failed: {e}")
+            return []
+
+        # 空数据不缓存，下次构建时重新获取
+        if programmes:
+            redis_bytes_client.set_ex(channel.cache_key(date_str), default_codec.encode(programmes),
+                                      self._cache_ttl(date_str))
+        return programmes
+
+    def refresh(self, channels: List[EpgChannel], dates: List[str]) -> Dict[Tuple[str, str], List[Programme]]:
+        """
+        确保所有 频道+日期 的节目数据可用，缓存命中的直接使用，缺失的限流并发获取
+        :return: {(tvg_id, date): programmes}
+        """
+        result: Dict[Tuple[str, str], List[Programme]] = {}
+        missing: List[Tuple[EpgChannel, str]] = []
+        for channel in channels:
+            for date_str in dates:
+                cached = self.load_cache(channel, date_str)
+                if cached is None:
+                    missing.append((channel, date_str))
+                else:
+                    result[(channel.tvg_id, date_str)] = cached
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                fetched = executor.map(lambda item: self._fetch(*item), missing)
+                for (channel, date_str), programmes in zip(missing, fetched):
+                    result[(channel.tvg_id, date_str)] = programmes
+
+        logger.info(f"epg refresh finished, cached: {len(result) - len(missing)}, fetched: {len(missing)}")
+        return result
+
+    @staticmethod
+    def build_indexes(channels: List[EpgChannel],
+                      dates: List[str],
+                      programme_data: Dict[Tuple[str, str], List[Programme]]) -> Dict[str, EpgIndex]:
+        """把多天的节目数据合并为每个频道一个区间索引"""
+        indexes: Dict[str, EpgIndex] = {}
+        for channel in channels:
+            if channel.tvg_id in indexes:
+                continue
+            index = EpgIndex(p for date_str in dates for p in programme_data.get((channel.tvg_id, date_str), []))
+            if len(index) > 0:
+                indexes[channel.tvg_id] = index
+        return indexes
+
+    def write_xmltv(self,
+                    file_path: str,
+                    channels: List[EpgChannel],
+                    indexes: Dict[str, EpgIndex],
+                    with_gzip: bool = False) -> None:
+        """按频道顺序从内存索引一次遍历输出 XMLTV，写入临时文件后原子替换"""
+        written_ids = set()
+        with AtomicFileWriter(file_path, with_gzip) as writer:
+            writer.write(self.XMLTV_HEADER)
+            for channel in channels:
+                index = indexes.get(channel.tvg_id)
+                if not index or channel.tvg_id in written_ids:
+                    continue
+                written_ids.add(channel.tvg_id)
+                writer.write(
+                    f'    <channel id="{channel.tvg_id}">\n'
+                    f'        <display-name lang="zh">{channel.display_name}</display-name>\n'
+                    "    </channel>\n"
+                )
+                for start, stop, title in index:
+                    writer.write(
+                        f'    <programme channel="{channel.tvg_id}" '
+                        f'start="{seconds_to_time_str(start)} +0800" stop="{seconds_to_time_str(stop)} +0800">\n'
+                        f'        <title lang="zh">{get_xml_cvt_string(title)}</title>\n'
+                        "    </programme>\n"
+                    )
+            writer.write(self.XMLTV_FOOTER)
+        logger.info(f"epg data saved to xmltv file {file_path}, channels: {len(written_ids)}")
+
+    def build(self,
+              file_path: str,
+              channels: List[EpgChannel],
+              past_days: int = 0,
+              future_days: int = 0,
+              with_gzip: bool = False) -> None:
+        dates = self.get_dates(past_days, future_days)
+        programme_data = self.refresh(channels, dates)
+        indexes = self.build_indexes(channels, dates, programme_data)
+        epg_manager.update(channels, dates, indexes)
+        self.write_xmltv(file_path, channels, indexes, with_gzip)
+
+
+@singleton
+class EpgManager:
+    """
+    节目单内存索引，每次构建 EPG 后整体替换；进程重启后首次查询时从 Redis 缓存恢复，不需要解析 XML
+    """
+
+    META_KEY = "tv-epg:meta"
+
+    def __init__(self):
+        self._indexes: Dict[str, EpgIndex] = {}
+        self._names: Dict[str, str] = {}
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def update(self, channels: List[EpgChannel], dates: List[str], indexes: Dict[str, EpgIndex]) -> None:
+        names = {}
+        for channel in channels:
+            if channel.tvg_id in indexes:
+                names.setdefault(channel.tvg_id, channel.tvg_id)
+                names.setdefault(channel.display_name, channel.tvg_id)
+
+        with self._lock:
+            self._indexes = indexes
+            self._names = names
+            self._loaded = True
+
+        meta = {
+            "channels": [[c.tvg_id, c.display_name, c.source, c.source_id] for c in channels],
+            "dates": dates,
+        }
+        redis_client.set_ex(self.META_KEY, json.dumps(meta, ensure_ascii=False), Constants.EPG_CACHE_TTL_PAST)
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            meta_data = redis_client.get(self.META_KEY)
+            if not meta_data:
+                return
+            try:
+                meta = json.loads(meta_data)
+                channels = [EpgChannel(*item) for item in meta.get("channels", [])]
+                dates = meta.get("dates", [])
+            except (ValueError, TypeError) as e:
+                logger.warning(f"load epg meta failed: {e}")
+                return
+
+            # 只读取缓存，不触发上游请求
+            programme_data = {}
+            for channel in channels:
+                for date_str in dates:
+                    cached = EpgBuilder.load_cache(channel, date_str)
+                    if cached:
+                        programme_data[(channel.tvg_id, date_str)] = cached
+            indexes = EpgBuilder.build_indexes(channels, dates, programme_data)
+            self.update(channels, dates, indexes)
+            logger.info(f"epg index restored from cache, channels: {len(indexes)}")
+
+    def get_index(self, channel: str) -> EpgIndex | None:
+        self._ensure_loaded()
+        with self._lock:
+            tvg_id = self._names.get(channel, channel)
+            return self._indexes.get(tvg_id)
+
+    def list_channels(self) -> List[str]:
+        self._ensure_loaded()
+        with self._lock:
+            return list(self._indexes.keys())
+
+
+epg_manager = EpgManager()
@@ -0,0 +1,227 @@
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, List
+
+from core.logger_factory import LoggerFactory
+from models.channel_info import ChannelInfo, ChannelUrl
+from services.channel import ChannelBaseModel
+from services.config import config_manager
+from utils.atomic_writer import AtomicFileWriter
+
+logger = LoggerFactory.get_logger(__name__)
+
+GROUP_FILE_PATTERN = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+class OutputSink:
+    """输出格式的基类，按分组/频道的顺序接收一次遍历产生的数据"""
+
+    def __init__(self, writer: AtomicFileWriter):
+        self._writer = writer
+
+    @property
+    def writer(self):
+        return self._writer
+
+    def begin(self, header: str, timestamp: str):
+        pass
+
+    def group(self, group_name: str):
+        pass
+
+    def channel(self, group_name: str, channel_info: ChannelInfo, sorted_urls: List[ChannelUrl], show_logo: bool):
+        pass
+
+    def group_end(self, group_name: str):
+        pass
+
+    def end(self, timestamp: str):
+        pass
+
+
+class TxtSink(OutputSink):
+
+    def group(self, group_name: str):
+        self._writer.write(f"{group_name},#genre#\n")
+
+    def channel(self, group_name, channel_info, sorted_urls, show_logo):
+        txt_line = channel_info.get_txt(sorted_urls)
+        if txt_line:
+            self._writer.write(f"{txt_line}\n")
+
+    def group_end(self, group_name: str):
+        self._writer.write("\n")
+
+    def end(self, timestamp: str):
+        self._writer.write(f"## 频道数据导出时间: {timestamp}")
+
+
+class M3uSink(OutputSink):
+
+    def __init__(self, writer: AtomicFileWriter):
+        super().__init__(writer)
+        self._logo_flags: Dict[str, int] = {}
+
+    def begin(self, header: str, timestamp: str):
+        self._writer.write(f"{header}\n")
+
+    def group(self, group_name: str):
+        self._logo_flags[group_name] = config_manager.do_channel_logo(group_name)
+
+    def channel(self, group_name, channel_info, sorted_urls, show_logo):
+        m3u_line = channel_info.get_m3u(self._logo_flags[group_name], group_name, show_logo, sorted_urls)
+        if m3u_line:
+            self._writer.write(f"{m3u_line}\n")
+
+    def end(self, timestamp: str):
+        self._writer.write(f"## 频道数据导出时间: {timestamp}")
+
+
+class JsonSink(OutputSink):
+
+    def __init__(self, writer: AtomicFileWriter):
+        super().__init__(writer)
+        self._first_group = True
+        self._first_channel = True
+
+    def begin(self, header: str, timestamp: str):
+        self._writer.write(f'{{"updated_at": {json.dumps(timestamp)}, "groups": [')
+
+    def group(self, group_name: str):
+        prefix = "" if self._first_group else ","
+        self._first_group = False
+        self._first_channel = True
+        self._writer.write(f'{prefix}\n{{"name": {json.dumps(group_name, ensure_ascii=False)}, "channels": [')
+
+    def channel(self, group_name, channel_info, sorted_urls, show_logo):
+        if not sorted_urls:
+            return
+        prefix = "" if self._first_channel else ","
+        self._first_channel = False
+        item = {
+            "id": channel_info.id,
+            "name": channel_info.name,
+            "logo": channel_info.logo if show_logo else None,
+            "urls": [url.url for url in sorted_urls],
+        }
+        self._writer.write(f"{prefix}\n{json.dumps(item, ensure_ascii=False)}")
+
+    def group_end(self, group_name: str):
+        self._writer.write("]}")
+
+    def end(self, timestamp: str):
+        self._writer.write("\n]}\n")
+
+
+class GroupM3uSink(OutputSink):
+    """每个分组单独输出一个 m3u 文件，目录为 <输出文件名>_groups/"""
+
+    def __init__(self, group_dir: str, with_gzip: bool):
+        super().__init__(None)
+        self._group_dir = group_dir
+        self._with_gzip = with_gzip
+        self._header = ""
+        self._group_sinks: Dict[str, M3uSink] = {}
+
+    @property
+    def writers(self) -> List[AtomicFileWriter]:
+        return [sink.writer for sink in self._group_sinks.values()]
+
+    def begin(self, header: str, timestamp: str):
+        self._header = header
+
+    def group(self, group_name: str):
+        file_name = GROUP_FILE_PATTERN.sub("_", group_name).strip("_") or "default"
+        writer = AtomicFileWriter(os.path.join(self._group_dir, f"{file_name}.m3u"), self._with_gzip).open()
+        sink = M3uSink(writer)
+        sink.begin(self._header, "")
+        sink.group(group_name)
+        self._group_sinks[group_name] = sink
+
+    def channel(self, group_name, channel_info, sorted_urls, show_logo):
+        self._group_sinks[group_name].channel(group_name, channel_info, sorted_urls, show_logo)
+
+    def end(self, timestamp: str):
+        for sink in self._group_sinks.values():
+            sink.end(timestamp)
+
+
+class ChannelPublisher:
+    """
+    频道数据输出流水线：只遍历、排序一次频道库，同时把 TXT/M3U/JSON/分组 M3U 写入
+    各自的临时文件，全部写完后再统一原子替换，避免读取方看到写了一半的文件
+    """
+
+    def __init__(self,
+                 file_path: str,
+                 with_json: bool = False,
+                 with_group: bool = False,
+                 with_gzip: bool = False):
+        self._file_path = file_path
+        self._with_json = with_json
+        self._with_group = with_group
+        self._with_gzip = with_gzip
+
+    @staticmethod
+    def _replace_file_extension(target_path, new_ext):
+        file_name, _ = os.path.splitext(target_path)
+        return file_name + new_ext
+
+    def _create_sinks(self, sinks: List[OutputSink]):
+        m3u_path = self._replace_file_extension(self._file_path, ".m3u")
+        sinks.append(TxtSink(AtomicFileWriter(self._file_path, self._with_gzip).open()))
+        sinks.append(M3uSink(AtomicFileWriter(m3u_path, self._with_gzip).open()))
+        if self._with_json:
+            json_path = self._replace_file_extension(self._file_path, ".json")
+            sinks.append(JsonSink(AtomicFileWriter(json_path, self._with_gzip).open()))
+        if self._with_group:
+            group_dir = self._replace_file_extension(self._file_path, "_groups")
+            sinks.append(GroupM3uSink(group_dir, self._with_gzip))
+
+    @staticmethod
+    def _all_writers(sinks: List[OutputSink]) -> List[AtomicFileWriter]:
+        writers = []
+        for sink in sinks:
+            if isinstance(sink, GroupM3uSink):
+                writers.extend(sink.writers)
+            elif sink.writer:
+                writers.append(sink.writer)
+        return writers
+
+    def publish(self, channel_model: ChannelBaseModel) -> bool:
+        if not self._file_path:
+            return False
+
+        sinks: List[OutputSink] = []
+        try:
+            self._create_sinks(sinks)
+            show_logo = channel_model.epg.show_logo if channel_model.epg else False
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            header = channel_model.get_extm3u_header()
+
+            for sink in sinks:
+                sink.begin(header, timestamp)
+            for group_name, channel_list in channel_model.get_group_items():
+                for sink in sinks:
+                    sink.group(group_name)
+                for channel_info in channel_list.sorted_channels():
+                    # 每个频道的地址只排序一次，供所有输出格式共用
+                    sorted_urls = channel_info.sorted_urls()
+                    for sink in sinks:
+                        sink.channel(group_name, channel_info, sorted_urls, show_logo)
+                for sink in sinks:
+                    sink.group_end(group_name)
+            for sink in sinks:
+                sink.end(timestamp)
+
+            for writer in self._all_writers(sinks):
+                writer.commit()
+            logger.info(f"channel data published to {self._file_path}, formats: {len(sinks)}")
+            return True
+        except Exception as e:
+            logger.error(f"publish channel data error: {e}")
+            for writer in self._all_writers(sinks):
+                writer.abort()
+            return False
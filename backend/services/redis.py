@@ -1,20 +1,36 @@
-from typing import Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from core.constants import Constants
 from core.logger_factory import LoggerFactory
 from services.config import config_manager
 
 try:
     import redis
+    import redis.asyncio as aioredis
 except ImportError:
     redis = None
+    aioredis = None
 
 logger = LoggerFactory.get_logger(__name__)
 
 
+def _connection_kwargs(decode_responses: bool = True) -> Dict:
+    redis_config = config_manager.redis_config
+    return {
+        "host": redis_config.get("host"),
+        "port": int(redis_config.get("port", "6379")),
+        "db": int(redis_config.get("db", "1")),
+        "password": redis_config.get("password"),
+        "decode_responses": decode_responses,
+    }
+
+
 class RedisClient:
 
-    def __init__(self):
+    def __init__(self, decode_responses: bool = True):
         self._client = None
+        self._expire = None
+        self._decode_responses = decode_responses
 
     def _init_client(self):
         if self._client is not None:
@@ -25,17 +41,18 @@ class RedisClient:
             return
 
         try:
-            redis_config = config_manager.redis_config
-            host = redis_config.get("host")
-            port = int(redis_config.get("port", "6379"))
-            db = int(redis_config.get("db", "1"))
-            password = redis_config.get("password")
-            self._expire = redis_config.get("expire")
-            self._client = redis.Redis(host=host, port=port, db=db, password=password, decode_responses=True)
+            self._expire = config_manager.redis_config.get("expire")
+            self._client = redis.Redis(**_connection_kwargs(self._decode_responses))
         except Exception as e:
             logger.error(f"init redis client failed: {e}")
             self._client = None
 
+    @property
+    def expire(self) -> Optional[int]:
+        """配置的默认缓存秒数"""
+        self._init_client()
+        return int(self._expire) if self._expire else None
+
     def exists(self, key: str) -> bool:
         self._init_client()
         if self._client is None:
@@ -63,7 +80,7 @@ class RedisClient:
         except Exception as e:
             logger.warning(f"redis set failed, key={key}, error={e}")
 
-    def set_ex(self, key: str, value: str, ex: int = -1) -> None:
+    def set_ex(self, key: str, value: str | bytes, ex: int = -1) -> None:
         self._init_client()
         if not self._client:
             return
@@ -75,16 +92,244 @@ class RedisClient:
         except Exception as e:
             logger.warning(f"redis set failed, key={key}, error={e}")
 
-    def prefix_keys(self, prefix: str):
+    def get_with_ttl(self, key: str) -> Tuple[Optional[str], int]:
+        """一次往返同时获取值和剩余过期秒数"""
         self._init_client()
         if not self._client:
+            return None, -2
+
+        try:
+            with self._client.pipeline(transaction=False) as pipe:
+                value, ttl = pipe.get(key).ttl(key).execute()
+            return value, ttl
+        except Exception as e:
+            logger.warning(f"redis get failed, key={key}, error={e}")
+            return None, -2
+
+    def delete(self, *keys: str) -> None:
+        self._init_client()
+        if not self._client or not keys:
             return
 
         try:
-            return self._client.keys(f"{prefix}*")
+            self._client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"redis delete failed, keys={keys}, error={e}")
+
+    def ttl(self, key: str) -> int:
+        """剩余过期秒数，key 不存在返回 -2，未设置过期时间返回 -1"""
+        self._init_client()
+        if not self._client:
+            return -2
+
+        try:
+            return self._client.ttl(key)
         except Exception as e:
-            logger.warning(f"redis keys failed, prefis={prefix}, error={e}")
+            logger.warning(f"redis ttl failed, key={key}, error={e}")
+            return -2
+
+    def execute_pipeline(self, build: Callable[[Any], None], transaction: bool = False) -> Optional[List]:
+        """
+        在一个 pipeline 中执行多条命令，一次往返完成
+        :param build: 接收 pipeline 对象并添加命令的函数
+        :return: 各命令的结果，失败时返回 None
+        """
+        self._init_client()
+        if not self._client:
+            return None
+
+        try:
+            with self._client.pipeline(transaction=transaction) as pipe:
+                build(pipe)
+                return pipe.execute()
+        except Exception as e:
+            logger.warning(f"redis pipeline failed, error={e}")
             return None
 
+    def scan_iter(self, pattern: str, count: int = 500) -> Iterator[str]:
+        """使用 SCAN 增量遍历匹配的 key，不会像 KEYS 一样阻塞 Redis"""
+        self._init_client()
+        if not self._client:
+            return
+
+        try:
+            yield from self._client.scan_iter(match=pattern, count=count)
+        except Exception as e:
+            logger.warning(f"redis scan failed, pattern={pattern}, error={e}")
+
+    def prefix_keys(self, prefix: str) -> List[str]:
+        return list(self.scan_iter(f"{prefix}*"))
+
+    def mget(self, keys: List[str], batch_size: int = 500) -> List[Optional[str]]:
+        """批量获取，按批次 MGET，返回值与 keys 顺序一一对应"""
+        self._init_client()
+        if not self._client or not keys:
+            return [None] * len(keys)
+
+        result: List[Optional[str]] = []
+        try:
+            for i in range(0, len(keys), batch_size):
+                result.extend(self._client.mget(keys[i:i + batch_size]))
+            return result
+        except Exception as e:
+            logger.warning(f"redis mget failed, keys={len(keys)}, error={e}")
+            return [None] * len(keys)
+
+    def set_many(self, mapping: Dict[str, str | bytes], ex: int = -1) -> None:
+        """使用 pipeline 批量写入，一次往返完成"""
+        self._init_client()
+        if not self._client or not mapping:
+            return
+
+        try:
+            if ex == -1:
+                ex = self._expire
+            with self._client.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, value, ex=ex)
+                pipe.execute()
+        except Exception as e:
+            logger.warning(f"redis set many failed, keys={len(mapping)}, error={e}")
+
+
+class AsyncRedisClient:
+    """
+    asyncio 版本的 Redis 客户端，供异步接口使用：共享连接池，缓存读写不阻塞事件循环
+    """
+
+    def __init__(self, decode_responses: bool = True):
+        self._client = None
+        self._expire = None
+        self._decode_responses = decode_responses
+
+    def _init_client(self):
+        if self._client is not None:
+            return
+
+        if aioredis is None:
+            logger.warning("redis library not installed, redis cache will not work")
+            return
+
+        try:
+            self._expire = config_manager.redis_config.get("expire")
+            # 连接用完时等待空闲连接，而不是直接报错被当作缓存未命中
+            pool = aioredis.BlockingConnectionPool(max_connections=Constants.REDIS_MAX_CONNECTIONS,
+                                                   timeout=Constants.REDIS_POOL_TIMEOUT,
+                                                   **_connection_kwargs(self._decode_responses))
+            self._client = aioredis.Redis(connection_pool=pool)
+        except Exception as e:
+            logger.error(f"init async redis client failed: {e}")
+            self._client = None
+
+    async def get(self, key: str) -> Optional[str]:
+        self._init_client()
+        if not self._client:
+            return None
+
+        try:
+            return await self._client.get(key)
+        except Exception as e:
+            logger.warning(f"redis get failed, key={key}, error={e}")
+            return None
+
+    async def set_ex(self, key: str, value: str | bytes, ex: int = -1) -> None:
+        self._init_client()
+        if not self._client:
+            return
+
+        try:
+            if ex == -1:
+                ex = self._expire
+            await self._client.set(key, value, ex=ex)
+        except Exception as e:
+            logger.warning(f"redis set failed, key={key}, error={e}")
+
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[str], int]:
+        self._init_client()
+        if not self._client:
+            return None, -2
+
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                value, ttl = await pipe.get(key).ttl(key).execute()
+            return value, ttl
+        except Exception as e:
+            logger.warning(f"redis get failed, key={key}, error={e}")
+            return None, -2
+
+    async def ttl(self, key: str) -> int:
+        self._init_client()
+        if not self._client:
+            return -2
+
+        try:
+            return await self._client.ttl(key)
+        except Exception as e:
+            logger.warning(f"redis ttl failed, key={key}, error={e}")
+            return -2
+
+    async def mget(self, keys: List[str], batch_size: int = 500) -> List[Optional[str]]:
+        self._init_client()
+        if not self._client or not keys:
+            return [None] * len(keys)
+
+        result: List[Optional[str]] = []
+        try:
+            for i in range(0, len(keys), batch_size):
+                result.extend(await self._client.mget(keys[i:i + batch_size]))
+            return result
+        except Exception as e:
+            logger.warning(f"redis mget failed, keys={len(keys)}, error={e}")
+            return [None] * len(keys)
+
+    async def set_many(self, mapping: Dict[str, str | bytes], ex: int = -1) -> None:
+        self._init_client()
+        if not self._client or not mapping:
+            return
+
+        try:
+            if ex == -1:
+                ex = self._expire
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, value, ex=ex)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"redis set many failed, keys={len(mapping)}, error={e}")
+
+    async def execute_pipeline(self, build: Callable[[Any], None], transaction: bool = False) -> Optional[List]:
+        self._init_client()
+        if not self._client:
+            return None
+
+        try:
+            async with self._client.pipeline(transaction=transaction) as pipe:
+                build(pipe)
+                return await pipe.execute()
+        except Exception as e:
+            logger.warning(f"redis pipeline failed, error={e}")
+            return None
+
+    async def prefix_keys(self, prefix: str, count: int = 500) -> List[str]:
+        self._init_client()
+        if not self._client:
+            return []
+
+        try:
+            return [key async for key in self._client.scan_iter(match=f"{prefix}*", count=count)]
+        except Exception as e:
+            logger.warning(f"redis scan failed, prefix={prefix}, error={e}")
+            return []
+
+    async def close(self) -> None:
+        if self._client is not None:
+            # 连接池由本客户端创建，关闭时一并释放
+            await self._client.aclose(close_connection_pool=True)
+            self._client = None
+
 
 redis_client = RedisClient()
+async_redis_client = AsyncRedisClient()
+# 二进制客户端，读写经过 utils.codec 编码的缓存数据
+redis_bytes_client = RedisClient(decode_responses=False)
+async_redis_bytes_client = AsyncRedisClient(decode_responses=False)
@@ -0,0 +1,217 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from core.constants import Constants
+from core.logger_factory import LoggerFactory
+from core.rate_limiter import TokenBucket
+from core.singleflight import SingleFlight
+from core.singleton import singleton
+from services.cache import two_tier_cache
+from services.redis import redis_client
+from utils.url_util import get_url_ttl
+
+logger = LoggerFactory.get_logger(__name__)
+
+# /migu/{id} 播放时使用的清晰度
+DEFAULT_RATE_TYPE = 3
+
+
+class _HotEntry:
+    __slots__ = ("name", "rate_type", "expire_at", "last_access", "failures", "retry_at")
+
+    def __init__(self, name: str, rate_type: int):
+        self.name = name
+        self.rate_type = rate_type
+        self.expire_at: float | None = None
+        self.last_access = time.time()
+        self.failures = 0
+        self.retry_at = 0.0
+
+
+@singleton
+class MiguUrlResolver:
+    """
+    Migu 播放地址解析：同一频道的并发请求合并为一次解析，缓存时间跟随签名地址的过期时间，
+    最近被访问过的热点频道由后台线程在过期前主动刷新
+    """
+
+    def __init__(self):
+        self._flight = SingleFlight()
+        self._entries: Dict[str, _HotEntry] = {}
+        self._lock = threading.Lock()
+        self._refresher: threading.Thread | None = None
+        two_tier_cache.add_invalidation_hook(self._on_invalidate)
+
+    def _on_invalidate(self, target: str) -> None:
+        """缓存被主动失效时，清除记录的过期时间，下次刷新检查时重新读取"""
+        if not target.startswith("tv-live:"):
+            return
+        with self._lock:
+            for channel_id, entry in self._entries.items():
+                key = self.cache_key(channel_id, entry.rate_type)
+                if key == target or (target.endswith("*") and key.startswith(target[:-1])):
+                    entry.expire_at = None
+
+    @staticmethod
+    def cache_key(channel_id: str, rate_type: int = DEFAULT_RATE_TYPE) -> str:
+        """不同清晰度的地址分开缓存，默认清晰度沿用原来的 key"""
+        if rate_type == DEFAULT_RATE_TYPE:
+            return f"tv-live:{channel_id}"
+        return f"tv-live:{channel_id}:{rate_type}"
+
+    @staticmethod
+    def _default_ttl() -> int:
+        return redis_client.expire or Constants.MIGU_URL_CACHE_TTL
+
+    def resolve(self, channel_id: str, name: str, rate_type: int = DEFAULT_RATE_TYPE) -> Tuple[str, bool]:
+        """
+        获取频道播放地址
+        :return: (播放地址, 是否来自缓存)
+        """
+        self._touch(channel_id, name, rate_type)
+        cache_key = self.cache_key(channel_id, rate_type)
+        found, cached_url = two_tier_cache.lookup(cache_key)
+        if found:
+            return cached_url or "", True
+
+        url = self._flight.do(cache_key, lambda: self._resolve(channel_id, name, rate_type))
+        if not url:
+            # 解析失败的频道短时间内直接返回失败，避免播放端重试时反复请求上游
+            two_tier_cache.set_negative(cache_key)
+        return url, False
+
+    def resolve_many(self,
+                     items: List[Tuple[str, str]],
+                     rate_type: int = DEFAULT_RATE_TYPE,
+                     min_ttl: int = Constants.MIGU_URL_DIRECT_MIN_TTL) -> Dict[str, str]:
+        """
+        批量预解析播放地址并写入缓存，缓存中仍然有效的地址不重复解析，上游请求按令牌桶限流
+        :param items: [(频道ID, 频道名称)]
+        :param min_ttl: 返回结果只包含剩余有效期不少于该秒数的地址
+        :return: {频道ID: 播放地址}
+        """
+        bucket = TokenBucket(Constants.MIGU_URL_PREFETCH_RATE)
+        unique_items = list(dict(items).items())
+
+        def resolve_one(item: Tuple[str, str]) -> Tuple[str, bool]:
+            channel_id, name = item
+            cache_key = self.cache_key(channel_id, rate_type)
+            url = redis_client.get(cache_key)
+            if url and redis_client.ttl(cache_key) >= min_ttl:
+                return url, False
+
+            bucket.acquire()
+            url = self._flight.do(cache_key, lambda: self._resolve(channel_id, name, rate_type))
+            if url and redis_client.ttl(cache_key) >= min_ttl:
+                return url, True
+            return "", bool(url)
+
+        result: Dict[str, str] = {}
+        resolved = 0
+        with ThreadPoolExecutor(max_workers=Constants.MIGU_URL_PREFETCH_WORKERS) as executor:
+            for (channel_id, _), (url, fetched) in zip(unique_items, executor.map(resolve_one, unique_items)):
+                resolved += fetched
+                if url:
+                    result[channel_id] = url
+
+        logger.info(f"pre-resolve migu urls, total: {len(unique_items)}, resolved: {resolved}, fresh: {len(result)}")
+        return result
+
+    def _resolve(self, channel_id: str, name: str, rate_type: int) -> str:
+        from utils.parser import parser_manager
+
+        url = parser_manager.get_migu_video_url(name, channel_id, rate_type=rate_type)
+        if not url:
+            return ""
+
+        ttl = get_url_ttl(url, self._default_ttl())
+        two_tier_cache.set(self.cache_key(channel_id, rate_type), url, ttl)
+        with self._lock:
+            entry = self._entries.get(channel_id)
+            if entry and entry.rate_type == rate_type:
+                entry.expire_at = time.time() + ttl
+                entry.failures = 0
+                entry.retry_at = 0.0
+        return url
+
+    @staticmethod
+    def _backoff(entry: _HotEntry) -> None:
+        """刷新失败后按指数退避推迟下次刷新，避免每个检查周期都重复解析失败的频道"""
+        entry.failures += 1
+        entry.retry_at = time.time() + min(Constants.MIGU_URL_REFRESH_BACKOFF_MAX,
+                                           Constants.MIGU_URL_REFRESH_BACKOFF_BASE * 2 ** (entry.failures - 1))
+
+    def _touch(self, channel_id: str, name: str, rate_type: int) -> None:
+        with self._lock:
+            entry = self._entries.get(channel_id)
+            if entry is None:
+                entry = _HotEntry(name, rate_type)
+                self._entries[channel_id] = entry
+            else:
+                entry.name = name
+                entry.rate_type = rate_type
+                entry.last_access = time.time()
+
+            if self._refresher is None:
+                self._refresher = threading.Thread(target=self._refresh_loop, name="migu-url-refresher", daemon=True)
+                self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            time.sleep(Constants.MIGU_URL_REFRESH_INTERVAL)
+            try:
+                self.refresh_hot()
+            except Exception as e:
+                logger.error(f"refresh hot migu urls failed: {e}", exc_info=True)
+
+    def refresh_hot(self) -> int:
+        """刷新即将过期的热点频道地址，长时间未访问的频道不再跟踪"""
+        now = time.time()
+        due = []
+        unknown = []
+        with self._lock:
+            for channel_id, entry in list(self._entries.items()):
+                if now - entry.last_access > Constants.MIGU_URL_HOT_WINDOW:
+                    del self._entries[channel_id]
+                    continue
+                if entry.retry_at > now:
+                    continue
+                if entry.expire_at is None:
+                    unknown.append((channel_id, entry, entry.rate_type))
+                elif entry.expire_at - now <= Constants.MIGU_URL_REFRESH_AHEAD:
+                    due.append((channel_id, entry, entry.name, entry.rate_type))
+
+        # 地址由其他进程或重启前写入缓存，以 Redis 剩余时间为准；在锁外读取，不阻塞播放请求
+        for channel_id, entry, rate_type in unknown:
+            ttl = redis_client.ttl(self.cache_key(channel_id, rate_type))
+            with self._lock:
+                if entry.expire_at is None and entry.rate_type == rate_type:
+                    entry.expire_at = now + ttl if ttl > 0 else now
+                if entry.expire_at is not None and entry.expire_at - now <= Constants.MIGU_URL_REFRESH_AHEAD:
+                    due.append((channel_id, entry, entry.name, entry.rate_type))
+
+        if not due:
+            return 0
+
+        def refresh(item) -> bool:
+            channel_id, entry, name, rate_type = item
+            cache_key = self.cache_key(channel_id, rate_type)
+            try:
+                url = self._flight.do(cache_key, lambda: self._resolve(channel_id, name, rate_type))
+            except Exception as e:
+                logger.warning(f"refresh migu url failed, key={cache_key}, error={e}")
+                url = ""
+            if not url:
+                with self._lock:
+                    self._backoff(entry)
+            return bool(url)
+
+        with ThreadPoolExecutor(max_workers=Constants.MIGU_URL_REFRESH_WORKERS) as executor:
+            refreshed = sum(executor.map(refresh, due))
+        logger.info(f"refresh hot migu urls, due: {len(due)}, refreshed: {refreshed}")
+        return refreshed
+
+
+migu_resolver = MiguUrlResolver()
@@ -1,10 +1,15 @@
+import asyncio
 import time
-from typing import Dict
+from typing import Dict, List, Set
 from urllib.parse import urlencode
 
 import httpx
 
+from core.circuit_breaker import CircuitBreaker
+from core.constants import Constants
+from core.hedging import HedgeBudget, hedge_delay, hedged_first
 from core.logger_factory import LoggerFactory
+from core.metrics import LatencyHistogram
 from services.spider.base import BaseSpider, headers
 from services.spider.factory import register_spider
 
@@ -17,55 +22,134 @@ class DocsSpider(BaseSpider):
     async def collect(self, task_info: Dict, is_full: bool = False) -> Dict:
         total = task_info["total"]
         success = failed = skipped = processed = 0
+        semaphore = asyncio.Semaphore(Constants.DOCS_COLLECT_WORKERS)
 
-        async with httpx.AsyncClient(timeout=15, verify=False) as client:
-            for cat_name, video_names in self.config.site_videos.items():
-                for video_name in video_names:
-                    processed += 1
-                    redis_key = self.make_redis_key(cat_name, video_name)
-                    if not is_full and self.redis_get(redis_key):
+        def update_progress():
+            task_info.update({
+                "processed": processed,
+                "progress": round(processed / total * 100, 2),
+                "success": success,
+                "updated_at": int(time.time()),
+            })
+
+        async def collect_one(client: httpx.AsyncClient, cat_name: str, video_name: str) -> Dict | None:
+            nonlocal success, failed, processed
+            async with semaphore:
+                video_data = await self._collect_detail(client, video_name, self.config)
+            processed += 1
+            if video_data:
+                success += 1
+                logger.debug(f"[{self._sp}] 采集成功：{cat_name}/{video_name}")
+            else:
+                failed += 1
+                logger.warning(f"[{self._sp}] 采集失败：{cat_name}/{video_name}")
+            update_progress()
+            return video_data
+
+        client = self.http_client
+        for cat_name, video_names in self.config.site_videos.items():
+            catalog_entries = {}
+            # 按块处理：一次 MGET 读取已缓存数据，未缓存的并发采集，整块采集完成后批量写入
+            for offset in range(0, len(video_names), Constants.DOCS_COLLECT_CHUNK):
+                chunk = video_names[offset:offset + Constants.DOCS_COLLECT_CHUNK]
+                redis_keys = [self.make_redis_key(cat_name, video_name) for video_name in chunk]
+                cached_list = [None] * len(chunk) if is_full else self.redis_get_many(redis_keys)
+
+                missing = []
+                for video_name, cached_data in zip(chunk, cached_list):
+                    if cached_data:
                         skipped += 1
-                        continue
+                        processed += 1
+                        catalog_entries[video_name] = self.catalog_entry(cached_data)
+                    else:
+                        missing.append(video_name)
+                update_progress()
 
-                    video_data = await self._collect_detail(client, video_name, self.config)
+                results = await asyncio.gather(*[collect_one(client, cat_name, name) for name in missing])
+                collected = {}
+                for video_name, video_data in zip(missing, results):
                     if video_data:
-                        self.redis_set(redis_key, video_data)
-                        success += 1
-                        logger.debug(f"[{self._sp}] 采集成功：{cat_name}/{video_name}")
+                        collected[self.make_redis_key(cat_name, video_name)] = video_data
+                        catalog_entries[video_name] = self.catalog_entry(video_data)
                     else:
-                        failed += 1
-                        logger.warning(f"[{self._sp}] 采集失败：{cat_name}/{video_name}")
+                        catalog_entries[video_name] = self.catalog_placeholder(cat_name, video_name)
+                if collected:
+                    self.redis_set_many(collected)
 
-                    task_info.update({
-                        "processed": processed,
-                        "progress": round(processed / total * 100, 2),
-                        "success": success,
-                        "updated_at": int(time.time()),
-                    })
+            # 分类采集完成后整体替换目录索引，配置中移除的视频同时从索引中删除
+            self.catalog.replace(cat_name, catalog_entries)
 
         # 最终状态
-        task_info.update({
-            "processed": processed,
-            "progress": round(processed / total * 100, 2),
-            "success": success,
-            "updated_at": int(time.time()),
-        })
+        update_progress()
         return {"fail": failed, "success": success, "skipped": skipped}
 
     async def _collect_detail(self, client: httpx.AsyncClient, video_name: str, site_config):
-        for site in site_config.site_collections:
+        sites = _ordered_sites(site_config.site_collections)
+
+        async def fetch(site):
+            start = time.monotonic()
+            breaker = _site_breaker(site.url)
+            _site_attempted.add(site.url)
             try:
                 params = {"ac": "detail", "wd": video_name}
                 url = f"{site.url}?{urlencode(params)}"
                 resp = await client.get(url, headers=headers)
                 resp.raise_for_status()
                 data = resp.json()
-                if data and len(data.get("list", [])) > 0:
-                    data_list = self.filter_detail_list(data["list"])
-                    for video in data_list:
-                        if video.get("vod_name") == video_name:
-                            site.repair_pic_url("vod_pic", video)
-                            return video
-            except Exception as e:
-                continue
-        return None
+            except Exception:
+                breaker.record_failure()
+                raise
+            # 只记录成功响应的延迟：对冲中被取消的请求和快速失败的请求不代表站点的真实延迟
+            _site_latency(site.url).observe(time.monotonic() - start)
+            breaker.record_success()
+
+            if data and len(data.get("list", [])) > 0:
+                data_list = self.filter_detail_list(data["list"])
+                for video in data_list:
+                    if video.get("vod_name") == video_name:
+                        site.repair_pic_url("vod_pic", video)
+                        return video
+            return None
+
+        # 按健康度顺序尝试镜像站点，当前站点超过其 p90 延迟仍未返回时提前请求下一个站点
+        return await hedged_first(
+            [lambda site=site: fetch(site) for site in sites],
+            lambda idx: hedge_delay(_site_latency(sites[idx].url)),
+            _hedge_budget,
+        )
+
+
+# 爬虫实例按请求创建，站点延迟统计、健康状态和对冲预算在模块级共享
+_site_latencies: Dict[str, LatencyHistogram] = {}
+_site_breakers: Dict[str, CircuitBreaker] = {}
+# 发起过请求的站点，用于区分尚未尝试的站点和一直没有成功响应（如总是对冲落败）的站点
+_site_attempted: Set[str] = set()
+_hedge_budget = HedgeBudget()
+
+
+def _site_latency(site_url: str) -> LatencyHistogram:
+    return _site_latencies.setdefault(site_url, LatencyHistogram())
+
+
+def _site_breaker(site_url: str) -> CircuitBreaker:
+    return _site_breakers.setdefault(site_url, CircuitBreaker(
+        Constants.DOCS_MIRROR_FAILURE_THRESHOLD, Constants.DOCS_MIRROR_RESET_TIMEOUT))
+
+
+def _ordered_sites(sites: List) -> List:
+    """
+    镜像站点排序：连续失败被熔断的站点排在最后（仍作为兜底），其余按 p50 延迟从快到慢；
+    尚未尝试的站点按配置顺序排在已知站点之前，便于尽快获得样本，尝试过但没有成功响应的站点排在已知站点之后
+    """
+
+    def sort_key(item):
+        idx, site = item
+        unhealthy = _site_breaker(site.url).state == CircuitBreaker.OPEN
+        p50 = _site_latency(site.url).quantile(0.5)
+        if p50 is not None:
+            rank = 1
+        else:
+            rank = 2 if site.url in _site_attempted else 0
+        return unhealthy, rank, p50 or 0, idx
+
+    return [site for _, site in sorted(enumerate(sites), key=sort_key)]
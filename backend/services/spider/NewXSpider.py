@@ -1,9 +1,7 @@
 import time
-from typing import Dict, override
+from typing import Dict, List, override
 from urllib.parse import urlencode
 
-import httpx
-
 from core.logger_factory import LoggerFactory
 from services.spider.base import BaseSpider, headers
 from services.spider.factory import register_spider
@@ -36,96 +34,89 @@ class NewXSpider(BaseSpider):
             "vod_play_url": f"播放${item.get("hls", "")}",
         }
 
+    async def _fetch_videos(self, params: Dict) -> List[Dict]:
+        """按参数请求所有站点并合并视频列表，单个站点失败时跳过"""
+        client = self.http_client
+        videos = []
+        for site in self.config.site_collections:
+            try:
+                url = f"{site.url}?{urlencode(params)}"
+                resp = await client.get(url, headers=headers)
+                resp.raise_for_status()
+                data = resp.json()
+                if data and len(data) > 0:
+                    for item in data:
+                        videos.append(self._process_cate_detail(item, site.url))
+            except Exception as e:
+                continue
+        return videos
+
+    async def _fetch_detail(self, ids: str) -> Dict | None:
+        client = self.http_client
+        for site in self.config.site_collections:
+            try:
+                params = {"xvid": ids}
+                url = f"{site.url}?{urlencode(params)}"
+                resp = await client.get(url, headers=headers)
+                resp.raise_for_status()
+                resp_json = resp.json()
+                if resp_json:
+                    return self._process_video_detail(ids, resp_json)
+            except Exception as e:
+                continue
+        return None
+
+    # 上游一次返回分类或搜索的全部结果，按分类/关键词缓存完整列表，翻页时不再请求上游
     @override
     async def get_list_data(self, t: str, pg: int) -> Dict:
-        async with httpx.AsyncClient(timeout=15, verify=False) as client:
-            videos = []
-            for site in self.config.site_collections:
-                try:
-                    params = {"play": "class", "c": t}
-                    url = f"{site.url}?{urlencode(params)}"
-                    resp = await client.get(url, headers=headers)
-                    resp.raise_for_status()
-                    data = resp.json()
-                    if data and len(data) > 0:
-                        for item in data:
-                            videos.append(self._process_cate_detail(item, site.url))
-                except Exception as e:
-                    continue
+        videos = await self.cached_response("list", (t,), lambda: self._fetch_videos({"play": "class", "c": t}))
         return self.paginate_list(videos, pg)
 
     @override
     async def get_detail_data(self, ids: str) -> Dict:
-        async with httpx.AsyncClient(timeout=15, verify=False) as client:
-            data = None
-            for site in self.config.site_collections:
-                try:
-                    params = {"xvid": ids}
-                    url = f"{site.url}?{urlencode(params)}"
-                    resp = await client.get(url, headers=headers)
-                    resp.raise_for_status()
-                    resp_json = resp.json()
-                    if resp_json:
-                        data = self._process_video_detail(ids, resp_json)
-                        break
-                except Exception as e:
-                    continue
+        data = await self.cached_response("detail", (ids,), lambda: self._fetch_detail(ids))
         return {"list": [data] if data else []}
 
     @override
     async def search_data(self, keyword: str, pg: int) -> Dict:
-        async with httpx.AsyncClient(timeout=15, verify=False) as client:
-            videos = []
-            for site in self.config.site_collections:
-                try:
-                    params = {"play": "k", "k": keyword}
-                    url = f"{site.url}?{urlencode(params)}"
-                    resp = await client.get(url, headers=headers)
-                    resp.raise_for_status()
-                    data = resp.json()
-                    if data and len(data) > 0:
-                        for item in data:
-                            videos.append(self._process_cate_detail(item, site.url))
-                except Exception as e:
-                    continue
+        videos = await self.cached_response("search", (keyword,),
+                                            lambda: self._fetch_videos({"play": "k", "k": keyword}))
         return self.paginate_list(videos, pg)
 
     async def collect(self, task_info: Dict, is_full: bool = False) -> Dict:
         total = task_info["total"]
         success = failed = skipped = processed = total  # 0
 
-        async with httpx.AsyncClient(timeout=15, verify=False) as client:
-            pass
-            # for site_c in self.config.site_class:
-            #     cat_id = site_c["type_id"]
-            #     cat_name = site_c["type_name"]
-            #     processed += 1
-            #     # redis_key = self.make_redis_key(cat_name, cat_id)
-            #     # if not is_full and self.redis_get(redis_key):
-            #     #     skipped += 1
-            #     #     continue
-            #
-            #     video_datas = await self._collect_videos(client, cat_id, cat_name, self.config)
-            #     for video in video_datas:
-            #         redis_key = self.make_redis_key(cat_id, video["vod_key"])
-            #         # if not is_full and self.redis_get(redis_key):
-            #         #     skipped += 1
-            #         #     continue
-            #
-            #     if video_datas:
-            #         self.redis_set(redis_key, video_data)
-            #         success += 1
-            #         logger.debug(f"[{self._sp}] 采集成功：{cat_name}/{video_name}")
-            #     else:
-            #         failed += 1
-            #         logger.warning(f"[{self._sp}] 采集失败：{cat_name}/{video_name}")
-            #
-            #     task_info.update({
-            #         "processed": processed,
-            #         "progress": round(processed / total * 100, 2),
-            #         "success": success,
-            #         "updated_at": int(time.time()),
-            #     })
+        # for site_c in self.config.site_class:
+        #     cat_id = site_c["type_id"]
+        #     cat_name = site_c["type_name"]
+        #     processed += 1
+        #     # redis_key = self.make_redis_key(cat_name, cat_id)
+        #     # if not is_full and self.redis_get(redis_key):
+        #     #     skipped += 1
+        #     #     continue
+        #
+        #     video_datas = await self._collect_videos(client, cat_id, cat_name, self.config)
+        #     for video in video_datas:
+        #         redis_key = self.make_redis_key(cat_id, video["vod_key"])
+        #         # if not is_full and self.redis_get(redis_key):
+        #         #     skipped += 1
+        #         #     continue
+        #
+        #     if video_datas:
+        #         self.redis_set(redis_key, video_data)
+        #         success += 1
+        #         logger.debug(f"[{self._sp}] 采集成功：{cat_name}/{video_name}")
+        #     else:
+        #         failed += 1
+        #         logger.warning(f"[{self._sp}] 采集失败：{cat_name}/{video_name}")
+        #
+        #     task_info.update({
+        #         "processed": processed,
+        #         "progress": round(processed / total * 100, 2),
+        #         "success": success,
+        #         "updated_at": int(time.time()),
+        #     })
 
         # 最终状态
         task_info.update({
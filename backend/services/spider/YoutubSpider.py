@@ -1,25 +1,27 @@
 import asyncio
-import json
 import os
-import random
 import re
 import shutil
-import subprocess
-import sys
 import time
 from datetime import datetime
 from typing import Dict, override, List, Optional
 
 import httpx
 
+from core.constants import Constants
 from core.logger_factory import LoggerFactory
+from core.rate_limiter import TokenBucket
 from services.spider.base import BaseSpider
 from services.spider.factory import register_spider
+from services.ytdlp import YtdlpBusyError, ytdlp_pool
 
 logger = LoggerFactory.get_logger(__name__)
 
 MAX_VIDEO_NUM = 8
 
+# 常驻解析进程使用的 yt-dlp 参数
+YTDLP_ARGS = ["--remote-components", "ejs:npm", "--no-playlist", "--socket-timeout", "20"]
+
 
 @register_spider("v-youtub")
 class YoutubSpider(BaseSpider):
@@ -28,6 +30,9 @@ class YoutubSpider(BaseSpider):
         "Referer": "https://www.youtube.com/",
         "Origin": "https://www.youtube.com"
     }
+    http_timeout = 20
+    http_verify = True
+    prefetch_player = True
     _deno_available = False
     _deno_bin_dir = None
 
@@ -71,52 +76,6 @@ class YoutubSpider(BaseSpider):
         self._deno_available = False
         return False
 
-    def _sync_parse(self, url: str, cookie_path: str) -> Optional[str]:
-        """同步解析逻辑（优化版：保留 Deno 检查，超时降至 20s，日志精简）"""
-        env = os.environ.copy()
-        if not self._ensure_deno(env):
-            return None
-
-        cmd = [
-            sys.executable,
-            "-m", "yt_dlp", "-v", "-j",
-            "--cookies", cookie_path,
-            "--remote-components", "ejs:npm",
-            "--no-playlist",
-            "--socket-timeout", "20",
-            url
-        ]
-        logger.debug(f"[YouTube] 执行命令: {' '.join(cmd)}")
-        try:
-            proc = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=20,
-                env=env,
-            )
-
-            # 记录 stderr 前 500 字符（便于排错）
-            if proc.stderr:
-                err_head = proc.stderr.strip()[:500]
-                logger.debug(f"[YouTube] yt-dlp stderr 头部:\n{err_head}")
-
-            if proc.returncode != 0:
-                logger.warning(f"[YouTube] yt-dlp 执行失败，返回码 {proc.returncode}")
-                return None
-
-            info = json.loads(proc.stdout)
-            return self._select_best_url(info, id=url.split("=")[-1], min_h=360, max_h=720)
-
-        except subprocess.TimeoutExpired:
-            logger.warning("[YouTube] yt-dlp 执行超时（20秒）")
-        except json.JSONDecodeError as e:
-            logger.warning(f"[YouTube] JSON 解析失败: {e}")
-        except Exception as e:
-            logger.warning(f"[YouTube] 命令行异常: {e}")
-
-        return None
-
     def _select_best_url(self, info: dict, id: str = "", min_h: int = 360, max_h: int = 720) -> Optional[str]:
         """优化：增加 protocol 过滤，使用生成器减少内存"""
         formats = info.get("formats") or []
@@ -169,7 +128,11 @@ class YoutubSpider(BaseSpider):
     @override
     async def get_list_data(self, t: str, pg: int) -> Dict:
         cat_name = self.config.get_site_cate_name(t)
-        cat_data_list = self.redis_dir_data(cat_name)
+        page_data = await self.get_catalog_page(cat_name, pg)
+        if page_data:
+            return page_data
+
+        cat_data_list = await self.redis_dir_data_async(cat_name)
         data = []
         for key, value in cat_data_list.items():
             filted_data = self.filter_base_fields(value)
@@ -186,16 +149,20 @@ class YoutubSpider(BaseSpider):
                 logger.error(f"[YouTube] cookie 文件不存在: {cookie_path}")
                 return None
 
-            url = f"https://www.youtube.com/watch?v={id}"
-            loop = asyncio.get_event_loop()
+            env = os.environ.copy()
+            if not self._ensure_deno(env):
+                return None
 
-            stream_url = await loop.run_in_executor(
-                None, self._sync_parse, url, cookie_path
-            )
+            url = f"https://www.youtube.com/watch?v={id}"
+            info = await ytdlp_pool.extract(url, YTDLP_ARGS + ["--cookies", cookie_path], env.get("PATH"))
+            stream_url = self._select_best_url(info, id=id, min_h=360, max_h=720)
             if stream_url:
                 return stream_url
             logger.warning(f"[YouTube] 未获取到可用流: {id}")
 
+        except (YtdlpBusyError, TimeoutError):
+            # 解析进程繁忙或超时属于临时故障，交给调用方处理，不能当作视频无可用流
+            raise
         except Exception as e:
             err = str(e)
             if "Sign in" in err or "bot" in err:
@@ -216,33 +183,40 @@ class YoutubSpider(BaseSpider):
     async def collect(self, task_info: Dict, is_full: bool = False) -> Dict:
         total = task_info["total"]
         success = failed = skipped = processed = 0
-
-        async with httpx.AsyncClient(timeout=20) as client:
-            for cat_name, channel_list in self.config.site_videos.items():
-                for uname in channel_list:
-                    processed += 1
-                    channel_user, channel_id = await self._get_channel_id(client, uname)
-                    if not channel_id:
-                        failed += 1
-                        continue
-
-                    time.sleep(random.uniform(1.5, 3))
+        # 频道并发采集，上游请求统一按令牌桶限流（原来每个频道之间 sleep 会阻塞事件循环）
+        limiter = TokenBucket(Constants.YOUTUB_COLLECT_RATE, capacity=Constants.YOUTUB_COLLECT_BURST)
+        semaphore = asyncio.Semaphore(Constants.YOUTUB_COLLECT_WORKERS)
+
+        async def collect_channel(client: httpx.AsyncClient, cat_name: str, uname: str) -> None:
+            nonlocal success, failed, processed
+            async with semaphore:
+                channel_user, channel_id = await self._get_channel_id(client, uname, limiter)
+                if channel_id:
+                    await limiter.acquire_async()
                     videos = await self._get_recent_videos(client, channel_user, channel_id)
-                    for v in videos:
-                        video_name = v.get("vod_key")
-                        video_data = self.filter_detail_fields(v)
-                        redis_key = self.make_redis_key(cat_name, video_name)
-                        if not is_full and self.redis_exists(redis_key):
-                            continue
-                        self.redis_set(redis_key, video_data, ex=2 * 86400)
-
+                    await self._save_videos(cat_name, videos, is_full)
                     success += 1
-                    task_info.update({
-                        "processed": processed,
-                        "progress": round(processed / total * 100, 2),
-                        "success": success,
-                        "updated_at": int(time.time()),
-                    })
+                else:
+                    failed += 1
+
+                processed += 1
+                task_info.update({
+                    "processed": processed,
+                    "progress": round(processed / total * 100, 2),
+                    "success": success,
+                    "updated_at": int(time.time()),
+                })
+
+        client = self.http_client
+        await asyncio.gather(*[
+            collect_channel(client, cat_name, uname)
+            for cat_name, channel_list in self.config.site_videos.items()
+            for uname in channel_list
+        ])
+
+        # 视频详情 2 天后过期，同步清理目录索引
+        for cat_name in self.config.site_videos:
+            await asyncio.to_thread(self.catalog_prune, cat_name)
 
         # 最终状态
         task_info.update({
@@ -253,18 +227,49 @@ class YoutubSpider(BaseSpider):
         })
         return {"fail": failed, "success": success, "skipped": skipped}
 
-    async def _get_channel_id(self, client: httpx.AsyncClient, handle: str) -> tuple[str, str]:
+    async def _save_videos(self, cat_name: str, videos: List[Dict], is_full: bool) -> None:
+        """批量写入视频详情和目录索引，增量采集时跳过已存在的视频；Redis 读写不阻塞事件循环"""
+        if not videos:
+            return
+        keys = [self.make_redis_key(cat_name, v.get("vod_key")) for v in videos]
+        exists = [] if is_full else await self.redis_exists_many_async(keys)
+
+        data, catalog_entries = {}, {}
+        for idx, (redis_key, v) in enumerate(zip(keys, videos)):
+            if idx < len(exists) and exists[idx]:
+                continue
+            video_data = self.filter_detail_fields(v)
+            data[redis_key] = video_data
+            catalog_entries[v.get("vod_key")] = self.catalog_entry(video_data)
+        await self.redis_set_many_async(data, ex=2 * 86400)
+        # 目录索引只有同步写入接口，放到线程中执行
+        await asyncio.to_thread(self.catalog.add_many, cat_name, catalog_entries, 2 * 86400)
+
+    async def _get_channel_id(self,
+                              client: httpx.AsyncClient,
+                              handle: str,
+                              limiter: TokenBucket | None = None) -> tuple[str, str]:
         match = re.search(r'(.*)[:：](.*)', handle)
         channel_name, channel_value = match.groups() if match else ("", handle.strip())
         if channel_value.startswith("UC"):
             return channel_name.strip(), channel_value.strip()
 
+        # 频道 handle 对应的 ID 不会变化，缓存后重复采集时不再请求频道页面
+        cache_key = self.make_redis_key("channel-id", channel_value.strip())
+        cached = await self.redis_get_async(cache_key)
+        if cached and cached.get("channel_id"):
+            return channel_name.strip(), cached["channel_id"]
+
         try:
+            if limiter:
+                await limiter.acquire_async()
             url = f"{self._get_base_url()}/{channel_value}"
             resp = await client.get(url, follow_redirects=True, timeout=10)
             resp.raise_for_status()
             match_id = re.search(r'\?channel_id=(UC[0-9A-Za-z_-]{22})\"', resp.text)
             if match_id:
+                await self.redis_set_async(cache_key, {"channel_id": match_id.group(1)},
+                                           ex=Constants.YOUTUB_CHANNEL_ID_TTL)
                 return channel_name.strip(), match_id.group(1)
             else:
                 return channel_name.strip(), ""
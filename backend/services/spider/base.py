@@ -3,30 +3,137 @@ import json
 from typing import Dict, Optional, List
 from urllib.parse import unquote
 
+import httpx
+
+from core.constants import Constants
 from core.logger_factory import LoggerFactory
 from services import config_manager
-from services.redis import redis_client
+from services.cache import two_tier_cache
+from services.spider.catalog import VodCatalog
+from services.spider.response_cache import ResponseLoader, response_cache
+from services.redis import async_redis_bytes_client, async_redis_client, redis_bytes_client, redis_client
+from utils.codec import default_codec
 
 logger = LoggerFactory.get_logger(__name__)
 
+try:
+    import h2  # noqa: F401 安装 h2 后客户端启用 HTTP/2
+    _HTTP2_ENABLED = True
+except ImportError:
+    _HTTP2_ENABLED = False
+
 headers = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/130.0.0.0 Safari/537.36",
     "Accept": "application/json, text/plain, */*"
 }
 
 
+class SpiderClientRegistry:
+    """
+    爬虫 HTTP 客户端注册表：每个站点持有两个长期复用的连接池客户端，
+    api 用于列表/详情/采集等接口请求，proxy 用于视频流代理；应用启动时创建，关闭时统一释放
+    """
+
+    API = "api"
+    PROXY = "proxy"
+
+    def __init__(self):
+        self._clients: Dict[tuple, httpx.AsyncClient] = {}
+
+    @staticmethod
+    def _limits(kind: str) -> httpx.Limits:
+        if kind == SpiderClientRegistry.PROXY:
+            return httpx.Limits(
+                max_connections=Constants.PROXY_MAX_CONNECTIONS,
+                max_keepalive_connections=Constants.PROXY_MAX_KEEPALIVE,
+                keepalive_expiry=Constants.PROXY_KEEPALIVE_EXPIRY,
+            )
+        return httpx.Limits(
+            max_connections=Constants.SPIDER_MAX_CONNECTIONS,
+            max_keepalive_connections=Constants.SPIDER_MAX_KEEPALIVE,
+            keepalive_expiry=Constants.SPIDER_KEEPALIVE_EXPIRY,
+        )
+
+    @staticmethod
+    def _new_client(spider: "BaseSpider", kind: str) -> httpx.AsyncClient:
+        if kind == SpiderClientRegistry.PROXY:
+            timeout = httpx.Timeout(Constants.PROXY_READ_TIMEOUT, connect=Constants.PROXY_CONNECT_TIMEOUT)
+            return httpx.AsyncClient(http2=_HTTP2_ENABLED, follow_redirects=True, timeout=timeout,
+                                     limits=SpiderClientRegistry._limits(kind))
+        return httpx.AsyncClient(
+            http2=_HTTP2_ENABLED,
+            timeout=spider.http_timeout,
+            verify=spider.http_verify,
+            headers=spider.http_headers,
+            limits=SpiderClientRegistry._limits(kind),
+        )
+
+    def get(self, spider: "BaseSpider", kind: str = API) -> httpx.AsyncClient:
+        key = (spider.sp, kind)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._clients[key] = self._new_client(spider, kind)
+        return client
+
+    def start(self, spiders: List["BaseSpider"]) -> None:
+        """预先创建已配置站点的客户端"""
+        for spider in spiders:
+            for kind in (self.API, self.PROXY):
+                self.get(spider, kind)
+        logger.info(f"spider http clients created: {len(self._clients)}, http2: {_HTTP2_ENABLED}")
+
+    async def close(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+spider_clients = SpiderClientRegistry()
+
+
 class BaseSpider(abc.ABC):
     """抽象爬虫基类：所有爬虫必须实现以下方法"""
 
+    # 接口请求客户端的超时秒数、是否校验证书，子类可覆盖
+    http_timeout = 15
+    http_verify = False
+    # 播放地址解析开销较大（如 yt-dlp）的爬虫开启，采集后可预解析最新视频的播放地址
+    prefetch_player = False
+
     def __init__(self, sp: str):
         self._sp = sp
         self._config = config_manager.get_vod_config(sp)
         self._service = config_manager.service_params
+        self._catalog = VodCatalog(sp)
 
     @property
     def config(self):
         return self._config
 
+    @property
+    def catalog(self) -> VodCatalog:
+        return self._catalog
+
+    @property
+    def http_headers(self) -> Dict:
+        """站点请求头，定义了 _header 的爬虫使用自己的请求头"""
+        return getattr(self, "_header", headers)
+
+    @property
+    def sp(self) -> str:
+        return self._sp
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """接口请求使用的连接池客户端，按站点复用"""
+        return spider_clients.get(self, SpiderClientRegistry.API)
+
+    @property
+    def proxy_client(self) -> httpx.AsyncClient:
+        """视频流代理使用的连接池客户端，按站点复用，避免每个分片重新建立连接"""
+        return spider_clients.get(self, SpiderClientRegistry.PROXY)
+
     # ------------------------------
     # 必须实现的抽象方法
     # ------------------------------
@@ -34,16 +141,22 @@ class BaseSpider(abc.ABC):
     async def get_list_data(self, t: str, pg: int) -> Dict:
         """获取列表数据（ac=detail & t=分类ID 时调用）"""
         cat_name = self.config.get_site_cate_name(t)
+        page_data = await self.get_catalog_page(cat_name, pg)
+        if page_data:
+            return page_data
+
+        # 目录索引尚未建立（未执行过采集）时按配置列表分页
         videos = self.config.site_videos.get(cat_name, [])
-        data = [self.get_video_base_from_redis(cat_name, name) for name in videos]
-        return self.paginate_list(data, pg)
+        page_data = self.paginate_list([(cat_name, name) for name in videos], pg)
+        page_data["list"] = await self.get_video_base_list_from_redis_async(page_data["list"])
+        return page_data
 
     # @abc.abstractmethod
     async def get_detail_data(self, ids: str) -> Dict:
         """获取详情数据（ac=detail & ids=cat/name 时调用）"""
         try:
             cat_name, video_name = unquote(ids).split("/", 1)
-            cache = self.get_video_detail_from_redis(cat_name, video_name)
+            cache = await self.get_video_detail_from_redis_async(cat_name, video_name)
             return {"list": [cache] if cache else []}
         except ValueError:
             logger.error(f"ids格式错误: {ids}，正确格式为 分类/文件名")
@@ -52,13 +165,20 @@ class BaseSpider(abc.ABC):
     # @abc.abstractmethod
     async def search_data(self, keyword: str, pg: int) -> Dict:
         """搜索数据（wd=关键词 时调用）"""
+        res = await self.catalog.search(self.config.site_videos.keys(), keyword)
+        if res is not None:
+            return self.paginate_list(res, pg)
+
+        # 目录索引尚未建立（未执行过采集）时按配置列表匹配
         res = [
-            self.get_video_base_from_redis(cat, name)
+            (cat, name)
             for cat, videos in self.config.site_videos.items()
             for name in videos
             if keyword in name
         ]
-        return self.paginate_list(res, pg)
+        page_data = self.paginate_list(res, pg)
+        page_data["list"] = await self.get_video_base_list_from_redis_async(page_data["list"])
+        return page_data
 
     # @abc.abstractmethod
     async def get_player(self, vid: str) -> str:
@@ -76,30 +196,124 @@ class BaseSpider(abc.ABC):
     # ------------------------------
     # 通用工具方法（所有爬虫复用）
     # ------------------------------
+    # ------------------------------
+    # 目录索引（采集时维护，分页时按区间读取）
+    # ------------------------------
+    def catalog_entry(self, video_data: Dict) -> tuple:
+        return self.catalog.score_of(video_data), self.filter_base_fields(video_data)
+
+    def catalog_placeholder(self, cat_name: str, video_name: str) -> tuple:
+        """未采集成功的视频，排在分类最后"""
+        return 0, {
+            "vod_name": video_name,
+            "vod_pic": self.config.site_video_cover,
+            "type_name": cat_name,
+            "vod_remarks": "未采集",
+        }
+
+    def catalog_prune(self, cat_name: str) -> int:
+        """移除详情数据已过期的目录条目"""
+        names = self.catalog.names(cat_name)
+        if not names:
+            return 0
+        exists = redis_client.execute_pipeline(
+            lambda pipe: [pipe.exists(self.make_redis_key(cat_name, name)) for name in names]) or []
+        expired = [name for name, exist in zip(names, exists) if not exist]
+        self.catalog.remove(cat_name, expired)
+        return len(expired)
+
+    async def get_catalog_page(self, cat_name: str, pg: int, page_size: int = 20) -> Dict | None:
+        total, items = await self.catalog.page(cat_name, pg, page_size)
+        if not total:
+            return None
+        return {
+            "list": [{"vod_id": f"{cat_name}/{name}", **base} for name, base in items],
+            "total": total,
+            "page": pg,
+        }
+
     def make_redis_key(self, *parts) -> str:
         return f"tv-vod:{self._sp}:{':'.join(parts)}"
 
     def redis_exists(self, key: str):
         return redis_client.exists(key)
 
+    # 视频数据经过 codec 编码（序列化+压缩）后以二进制存储，兼容旧版本的 JSON 字符串
+    @staticmethod
+    def _decode(key: str, val: bytes | None) -> Optional[dict]:
+        if not val:
+            return None
+        try:
+            return default_codec.decode(val)
+        except Exception as e:
+            logger.warning(f"decode redis data failed, key={key}, error={e}")
+            return None
+
     def redis_set(self, key: str, data: dict, ex: int = 90 * 86400):
-        redis_client.set_ex(key, json.dumps(data, ensure_ascii=False), ex)
+        redis_bytes_client.set_ex(key, default_codec.encode(data), ex)
 
     def redis_get(self, key: str) -> Optional[dict]:
-        val = redis_client.get(key)
+        return self._decode(key, redis_bytes_client.get(key))
+
+    def redis_get_many(self, keys: List[str]) -> List[Optional[dict]]:
+        """批量获取，返回值与 keys 顺序一一对应"""
+        return [self._decode(key, val) for key, val in zip(keys, redis_bytes_client.mget(keys))]
+
+    def redis_set_many(self, data: Dict[str, dict], ex: int = 90 * 86400):
+        redis_bytes_client.set_many({key: default_codec.encode(val) for key, val in data.items()}, ex)
+
+    # 异步版本，供 async 接口使用，不阻塞事件循环
+    async def redis_get_async(self, key: str) -> Optional[dict]:
+        return self._decode(key, await async_redis_bytes_client.get(key))
+
+    async def redis_set_async(self, key: str, data: dict, ex: int = 90 * 86400):
+        await async_redis_bytes_client.set_ex(key, default_codec.encode(data), ex)
+
+    async def redis_get_many_async(self, keys: List[str]) -> List[Optional[dict]]:
+        return [self._decode(key, val) for key, val in zip(keys, await async_redis_bytes_client.mget(keys))]
+
+    async def redis_set_many_async(self, data: Dict[str, dict], ex: int = 90 * 86400):
+        await async_redis_bytes_client.set_many({key: default_codec.encode(val) for key, val in data.items()}, ex)
+
+    async def redis_exists_many_async(self, keys: List[str]) -> List[bool]:
+        """批量判断 key 是否存在，返回值与 keys 顺序一一对应"""
+        result = await async_redis_bytes_client.execute_pipeline(lambda pipe: [pipe.exists(key) for key in keys])
+        return [bool(exist) for exist in result] if result else [False] * len(keys)
+
+    # 经过二级缓存读写，适合播放地址等读多写少的热点数据
+    async def cache_get_async(self, key: str) -> Optional[dict]:
+        val = await two_tier_cache.get_async(key)
         return json.loads(val) if val else None
 
+    async def cache_set_async(self, key: str, data: dict, ex: int = 90 * 86400):
+        await two_tier_cache.set_async(key, json.dumps(data, ensure_ascii=False), ex)
+
+    # 实时请求上游的接口响应缓存，按接口配置缓存时间，过期后先返回旧数据再后台刷新
+    async def cached_response(self, action: str, params: tuple, loader: ResponseLoader):
+        return await response_cache.get(self, action, params, loader)
+
+    async def redis_dir_data_async(self, prefix: str) -> Dict:
+        pattern = f"tv-vod:{self._sp}:{prefix}*"
+        keys = await async_redis_client.prefix_keys(pattern)
+        result = {}
+
+        for key, val in zip(keys, await self.redis_get_many_async(keys)):
+            if val:
+                key_str = key.replace(pattern.replace("*", ":"), "")
+                result[key_str] = val
+
+        return result
+
     def redis_dir_data(self, prefix: str) -> Dict:
         """
-        获取 Redis 指定目录下所有 key 对应的 value
+        获取 Redis 指定目录下所有 key 对应的 value，SCAN 遍历 key 后批量读取
         :return: {key: value} 字典
         """
         pattern = f"tv-vod:{self._sp}:{prefix}*"
         keys = redis_client.prefix_keys(pattern)
         result = {}
 
-        for key in keys:
-            val = self.redis_get(key)
+        for key, val in zip(keys, self.redis_get_many(keys)):
             if val:
                 key_str = key.replace(pattern.replace("*", ":"), "")
                 result[key_str] = val
@@ -153,9 +367,15 @@ class BaseSpider(abc.ABC):
         }
 
     def get_video_detail_from_redis(self, cat_name: str, video_name: str) -> Dict | None:
-        define_id = f"{cat_name}/{video_name}"
         redis_key = self.make_redis_key(cat_name, video_name)
-        redis_data = self.redis_get(redis_key)
+        return self._make_video_detail(cat_name, video_name, self.redis_get(redis_key))
+
+    async def get_video_detail_from_redis_async(self, cat_name: str, video_name: str) -> Dict | None:
+        redis_key = self.make_redis_key(cat_name, video_name)
+        return self._make_video_detail(cat_name, video_name, await self.redis_get_async(redis_key))
+
+    def _make_video_detail(self, cat_name: str, video_name: str, redis_data: Dict | None) -> Dict:
+        define_id = f"{cat_name}/{video_name}"
         if redis_data:
             video_data = {"vod_id": define_id, **redis_data}
             return video_data
@@ -169,9 +389,26 @@ class BaseSpider(abc.ABC):
         }
 
     def get_video_base_from_redis(self, cat_name: str, video_name: str) -> Dict | None:
-        define_id = f"{cat_name}/{video_name}"
         redis_key = self.make_redis_key(cat_name, video_name)
-        redis_data = self.redis_get(redis_key)
+        return self._make_video_base(cat_name, video_name, self.redis_get(redis_key))
+
+    def get_video_base_list_from_redis(self, items: List[tuple]) -> List[Dict]:
+        """批量获取视频基础信息，items 为 [(分类名, 视频名)]，一次 MGET 完成"""
+        redis_keys = [self.make_redis_key(cat_name, video_name) for cat_name, video_name in items]
+        return [
+            self._make_video_base(cat_name, video_name, redis_data)
+            for (cat_name, video_name), redis_data in zip(items, self.redis_get_many(redis_keys))
+        ]
+
+    async def get_video_base_list_from_redis_async(self, items: List[tuple]) -> List[Dict]:
+        redis_keys = [self.make_redis_key(cat_name, video_name) for cat_name, video_name in items]
+        return [
+            self._make_video_base(cat_name, video_name, redis_data)
+            for (cat_name, video_name), redis_data in zip(items, await self.redis_get_many_async(redis_keys))
+        ]
+
+    def _make_video_base(self, cat_name: str, video_name: str, redis_data: Dict | None) -> Dict:
+        define_id = f"{cat_name}/{video_name}"
         if redis_data:
             field_result = self.filter_base_fields(redis_data)
             video_data = {"vod_id": define_id, **field_result}
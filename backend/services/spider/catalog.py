@@ -0,0 +1,177 @@
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.logger_factory import LoggerFactory
+from services.redis import async_redis_bytes_client, redis_bytes_client
+from utils.codec import default_codec
+from utils.search_index import SearchIndex
+
+logger = LoggerFactory.get_logger(__name__)
+
+# 目录条目：{视频名: (排序分值, 基础字段)}
+CatalogEntries = Dict[str, Tuple[float, Dict]]
+
+# 每个站点一个搜索索引，进程内共享；首次搜索时从目录哈希加载，之后随采集增量更新
+_search_indexes: Dict[str, SearchIndex] = {}
+_search_loaded: set = set()
+_search_lock = threading.Lock()
+
+
+def _search_index(sp: str) -> SearchIndex:
+    with _search_lock:
+        index = _search_indexes.get(sp)
+        if index is None:
+            index = _search_indexes[sp] = SearchIndex()
+        return index
+
+
+class VodCatalog:
+    """
+    点播目录索引：每个分类一个有序集合（视频名，按 vod_time 倒序）和一个哈希（视频名 -> 基础字段），
+    在采集时维护；分页只按区间读取当前页，总数为 ZCARD，与目录大小无关
+    """
+
+    def __init__(self, sp: str):
+        self._sp = sp
+        self._search = _search_index(sp)
+
+    def _keys(self, cat_name: str) -> Tuple[str, str]:
+        return f"tv-vod:{self._sp}:catalog:{cat_name}", f"tv-vod:{self._sp}:catalog-base:{cat_name}"
+
+    @staticmethod
+    def score_of(video: Dict) -> float:
+        """排序分值取 vod_time 时间戳，缺失或格式错误时排在最后"""
+        vod_time = video.get("vod_time") or ""
+        try:
+            return datetime.strptime(vod_time[:19], "%Y-%m-%d %H:%M:%S").timestamp()
+        except ValueError:
+            return 0
+
+    def _write(self, cat_name: str, entries: CatalogEntries, ex: Optional[int], replace: bool) -> None:
+        zset_key, hash_key = self._keys(cat_name)
+
+        def build(pipe):
+            if replace:
+                pipe.delete(zset_key, hash_key)
+            if entries:
+                pipe.zadd(zset_key, {name: score for name, (score, _) in entries.items()})
+                pipe.hset(hash_key, mapping={name: default_codec.encode(base) for name, (_, base) in entries.items()})
+            if ex:
+                pipe.expire(zset_key, ex)
+                pipe.expire(hash_key, ex)
+
+        if redis_bytes_client.execute_pipeline(build, transaction=replace) is None:
+            logger.warning(f"[{self._sp}] 更新目录索引失败：{cat_name}")
+            return
+
+        if replace:
+            self._unindex_category(cat_name)
+        for name, (_, base) in entries.items():
+            self._index(cat_name, name, base)
+
+    def replace(self, cat_name: str, entries: CatalogEntries, ex: Optional[int] = None) -> None:
+        """整体替换分类的目录索引（事务执行，读取方不会看到中间状态）"""
+        self._write(cat_name, entries, ex, replace=True)
+
+    def add_many(self, cat_name: str, entries: CatalogEntries, ex: Optional[int] = None) -> None:
+        """增量添加或更新目录条目"""
+        if entries:
+            self._write(cat_name, entries, ex, replace=False)
+
+    def names(self, cat_name: str) -> List[str]:
+        zset_key, _ = self._keys(cat_name)
+        result = redis_bytes_client.execute_pipeline(lambda pipe: pipe.zrange(zset_key, 0, -1))
+        return [name.decode("utf-8") for name in result[0]] if result else []
+
+    def remove(self, cat_name: str, names: List[str]) -> None:
+        if not names:
+            return
+        zset_key, hash_key = self._keys(cat_name)
+
+        def build(pipe):
+            pipe.zrem(zset_key, *names)
+            pipe.hdel(hash_key, *names)
+
+        redis_bytes_client.execute_pipeline(build)
+        for name in names:
+            self._search.remove(f"{cat_name}/{name}")
+
+    # ------------------------------
+    # 搜索索引
+    # ------------------------------
+    def _index(self, cat_name: str, name: str, base: Dict) -> None:
+        vod_id = f"{cat_name}/{name}"
+        self._search.add(vod_id, base.get("vod_name") or name, {"vod_id": vod_id, **base})
+
+    def _unindex_category(self, cat_name: str) -> None:
+        prefix = f"{cat_name}/"
+        for doc_id in self._search.doc_ids():
+            if doc_id.startswith(prefix):
+                self._search.remove(doc_id)
+
+    async def load_search_index(self, cat_names: Iterable[str]) -> None:
+        """从目录哈希加载搜索索引，每个进程只加载一次"""
+        if self._sp in _search_loaded:
+            return
+        cat_names = list(cat_names)
+        hash_keys = [self._keys(cat_name)[1] for cat_name in cat_names]
+        result = await async_redis_bytes_client.execute_pipeline(
+            lambda pipe: [pipe.hgetall(hash_key) for hash_key in hash_keys])
+        if result is None:
+            # Redis 不可用时不标记已加载，下次搜索重试
+            return
+
+        for cat_name, values in zip(cat_names, result):
+            for name, value in values.items():
+                try:
+                    self._index(cat_name, name.decode("utf-8"), default_codec.decode(value))
+                except Exception as e:
+                    logger.warning(f"[{self._sp}] 目录数据解析失败：{cat_name}/{name}, {e}")
+        _search_loaded.add(self._sp)
+        logger.info(f"[{self._sp}] 搜索索引加载完成：{len(self._search)}")
+
+    async def search(self, cat_names: Iterable[str], keyword: str) -> List[Dict] | None:
+        """按相关度排序返回匹配视频的基础字段，不逐条读取 Redis；索引为空时返回 None"""
+        await self.load_search_index(cat_names)
+        if not len(self._search):
+            return None
+        return [payload for _, payload in self._search.search(keyword)]
+
+    async def newest(self, cat_name: str, count: int) -> List[str]:
+        """按 vod_time 倒序返回最新的视频名"""
+        if count <= 0:
+            return []
+        zset_key, _ = self._keys(cat_name)
+        result = await async_redis_bytes_client.execute_pipeline(lambda pipe: pipe.zrevrange(zset_key, 0, count - 1))
+        return [name.decode("utf-8") for name in result[0]] if result else []
+
+    async def page(self, cat_name: str, page: int, page_size: int = 20) -> Tuple[int, List[Tuple[str, Dict]]]:
+        """
+        按 vod_time 倒序分页读取
+        :return: (总数, [(视频名, 基础字段)])
+        """
+        zset_key, hash_key = self._keys(cat_name)
+        start = max(page - 1, 0) * page_size
+
+        def build_range(pipe):
+            pipe.zcard(zset_key)
+            pipe.zrevrange(zset_key, start, start + page_size - 1)
+
+        result = await async_redis_bytes_client.execute_pipeline(build_range)
+        if not result or not result[0]:
+            return 0, []
+        total, names = result
+        if not names:
+            return total, []
+
+        values = await async_redis_bytes_client.execute_pipeline(lambda pipe: pipe.hmget(hash_key, names))
+        items = []
+        for name, value in zip(names, values[0] if values else [None] * len(names)):
+            try:
+                base = default_codec.decode(value) if value else {}
+            except Exception as e:
+                logger.warning(f"[{self._sp}] 目录数据解析失败：{cat_name}/{name}, {e}")
+                base = {}
+            items.append((name.decode("utf-8"), base))
+        return total, items
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from core.constants import Constants
+from core.logger_factory import LoggerFactory
+from core.rate_limiter import TokenBucket
+from core.singleflight import AsyncSingleFlight
+from core.singleton import singleton
+from services.cache import two_tier_cache
+from services.spider.base import BaseSpider
+from utils.url_util import get_url_expire, get_url_ttl
+
+logger = LoggerFactory.get_logger(__name__)
+
+
+class _HotPlayer:
+    __slots__ = ("spider", "vid", "expire_at", "last_access", "failures", "retry_at")
+
+    def __init__(self, spider: BaseSpider, vid: str):
+        self.spider = spider
+        self.vid = vid
+        self.expire_at: float | None = None
+        self.last_access = time.time()
+        # 刷新连续失败次数及下次允许重试的时间
+        self.failures = 0
+        self.retry_at = 0.0
+
+
+@singleton
+class PlayerResolver:
+    """
+    点播播放地址解析：同一视频的并发请求合并为一次解析（yt-dlp 等开销较大），
+    缓存时间跟随地址中的过期参数（如 googlevideo 的 expire），最近播放过的视频在过期前由后台任务主动刷新
+    """
+
+    def __init__(self):
+        self._flight = AsyncSingleFlight()
+        self._entries: Dict[str, _HotPlayer] = {}
+        self._lock = threading.Lock()
+        self._refresher: asyncio.Task | None = None
+
+    @staticmethod
+    def cache_key(spider: BaseSpider, vid: str) -> str:
+        return spider.make_redis_key("player", vid)
+
+    @staticmethod
+    def _cached_url(cached: str) -> Tuple[Optional[str], Optional[float]]:
+        """
+        解析缓存的播放地址
+        :return: (地址, 过期时间戳)，地址已过期时返回 (None, None)
+        """
+        url = json.loads(cached).get("url")
+        # 旧版本写入的永久缓存没有过期时间，地址已过期时重新解析
+        expire_at = get_url_expire(url) if url else None
+        if url and (expire_at is None or expire_at > time.time()):
+            return url, expire_at
+        return None, None
+
+    async def resolve(self, spider: BaseSpider, vid: str) -> Optional[str]:
+        """获取播放地址，解析失败返回 None"""
+        cache_key = self.cache_key(spider, vid)
+        self._touch(cache_key, spider, vid)
+        found, cached = await two_tier_cache.lookup_async(cache_key)
+        if found:
+            if cached is None:
+                return None
+            url, expire_at = self._cached_url(cached)
+            if url:
+                self._set_expire(cache_key, expire_at)
+                return url
+
+        # 解析进程繁忙、超时等临时故障直接抛出，不写负缓存
+        url = await self._flight.do(cache_key, lambda: self._resolve(cache_key, spider, vid))
+        if not url:
+            # 确认没有可用流的视频短时间内直接返回失败，避免播放端重试时反复启动解析
+            two_tier_cache.set_negative(cache_key)
+        return url
+
+    async def _resolve(self, cache_key: str, spider: BaseSpider, vid: str) -> Optional[str]:
+        url = await spider.get_player(vid)
+        if not url:
+            return None
+
+        ttl = get_url_ttl(url, Constants.PLAYER_CACHE_TTL, Constants.PLAYER_URL_SAFETY_MARGIN)
+        await spider.cache_set_async(cache_key, {"url": url}, ex=ttl)
+        self._set_expire(cache_key, time.time() + ttl)
+        return url
+
+    def _set_expire(self, cache_key: str, expire_at: float | None) -> None:
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry and expire_at is not None:
+                entry.expire_at = expire_at
+                entry.failures = 0
+                entry.retry_at = 0.0
+
+    @staticmethod
+    def _backoff(entry: _HotPlayer) -> None:
+        """刷新失败后按指数退避推迟下次刷新，避免每个检查周期都重复解析失败的视频"""
+        entry.failures += 1
+        entry.retry_at = time.time() + min(Constants.PLAYER_REFRESH_BACKOFF_MAX,
+                                           Constants.PLAYER_REFRESH_BACKOFF_BASE * 2 ** (entry.failures - 1))
+
+    def _touch(self, cache_key: str, spider: BaseSpider, vid: str) -> None:
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self._entries[cache_key] = _HotPlayer(spider, vid)
+            else:
+                entry.last_access = time.time()
+
+            if self._refresher is None or self._refresher.done():
+                self._refresher = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(Constants.PLAYER_REFRESH_INTERVAL)
+            try:
+                await self.refresh_hot()
+            except Exception as e:
+                logger.error(f"refresh hot player urls failed: {e}", exc_info=True)
+
+    async def close(self) -> None:
+        """停止后台刷新任务"""
+        refresher, self._refresher = self._refresher, None
+        if refresher is None or refresher.done():
+            return
+        refresher.cancel()
+        try:
+            await refresher
+        except asyncio.CancelledError:
+            pass
+
+    async def refresh_hot(self) -> int:
+        """刷新即将过期的热点视频地址，长时间未播放的视频不再跟踪"""
+        now = time.time()
+        due = []
+        with self._lock:
+            for cache_key, entry in list(self._entries.items()):
+                if now - entry.last_access > Constants.PLAYER_HOT_WINDOW:
+                    del self._entries[cache_key]
+                    continue
+                if entry.retry_at > now:
+                    continue
+                if entry.expire_at is not None and entry.expire_at - now <= Constants.PLAYER_REFRESH_AHEAD:
+                    due.append((cache_key, entry))
+
+        if not due:
+            return 0
+
+        semaphore = asyncio.Semaphore(Constants.PLAYER_REFRESH_WORKERS)
+
+        async def refresh(cache_key: str, entry: _HotPlayer) -> bool:
+            async with semaphore:
+                try:
+                    url = await self._flight.do(cache_key, lambda: self._resolve(cache_key, entry.spider, entry.vid))
+                except Exception as e:
+                    logger.warning(f"refresh player url failed, key={cache_key}, error={e}")
+                    url = None
+                if not url:
+                    with self._lock:
+                        self._backoff(entry)
+                return bool(url)
+
+        refreshed = sum(await asyncio.gather(*[refresh(cache_key, entry) for cache_key, entry in due]))
+        logger.info(f"refresh hot player urls, due: {len(due)}, refreshed: {refreshed}")
+        return refreshed
+
+    async def prefetch(self, spider: BaseSpider, vids: List[str]) -> Dict[str, int]:
+        """
+        预解析播放地址写入缓存，已有有效缓存的视频跳过；按令牌桶限流，并发数低于解析进程数，不影响实时播放。
+        预解析的视频不加入热点列表，只有实际播放过的才会在过期前主动刷新
+        """
+        result = {"total": len(vids), "cached": 0, "resolved": 0, "failed": 0}
+        limiter = TokenBucket(Constants.PLAYER_PREFETCH_RATE, capacity=Constants.PLAYER_PREFETCH_BURST)
+        semaphore = asyncio.Semaphore(Constants.PLAYER_PREFETCH_WORKERS)
+
+        async def prefetch_one(vid: str) -> None:
+            cache_key = self.cache_key(spider, vid)
+            found, cached = await two_tier_cache.lookup_async(cache_key)
+            if found and cached and self._cached_url(cached)[0]:
+                result["cached"] += 1
+                return
+            async with semaphore:
+                await limiter.acquire_async()
+                try:
+                    url = await self._flight.do(cache_key, lambda: self._resolve(cache_key, spider, vid))
+                except Exception as e:
+                    logger.warning(f"prefetch player url failed, key={cache_key}, error={e}")
+                    url = None
+            result["resolved" if url else "failed"] += 1
+
+        await asyncio.gather(*[prefetch_one(vid) for vid in vids])
+        return result
+
+    async def prefetch_newest(self, spider: BaseSpider, count: int) -> Dict[str, int]:
+        """预解析每个分类最新 count 个视频的播放地址"""
+        count = min(count, Constants.PLAYER_PREFETCH_MAX_PER_CATEGORY)
+        vids = []
+        for cat_name in spider.config.site_videos:
+            vids.extend(await spider.catalog.newest(cat_name, count))
+        result = await self.prefetch(spider, list(dict.fromkeys(vids)))
+        logger.info(f"[{spider.sp}] prefetch player urls: {result}")
+        return result
+
+
+player_resolver = PlayerResolver()
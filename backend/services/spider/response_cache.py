@@ -0,0 +1,190 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from core.constants import Constants
+from core.logger_factory import LoggerFactory
+from core.lru import TtlLruCache
+from core.singleflight import AsyncSingleFlight
+from core.singleton import singleton
+from services.cache import two_tier_cache
+from services.redis import async_redis_bytes_client
+from utils.codec import default_codec
+
+logger = LoggerFactory.get_logger(__name__)
+
+# 上游加载函数，返回需要缓存的原始数据
+ResponseLoader = Callable[[], Awaitable[Any]]
+
+
+class _ActionStats:
+    __slots__ = ("fresh_hits", "stale_hits", "misses", "refreshes", "refresh_failed", "uncached")
+
+    def __init__(self):
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failed = 0
+        self.uncached = 0
+
+    def snapshot(self) -> Dict:
+        lookups = self.fresh_hits + self.stale_hits + self.misses
+        return {
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_failed": self.refresh_failed,
+            "uncached": self.uncached,
+            "hit_ratio": round((lookups - self.misses) / lookups, 4) if lookups else 0,
+        }
+
+
+@singleton
+class SpiderResponseCache:
+    """
+    实时请求上游站点的爬虫接口响应缓存（列表/详情/搜索）：进程内 LRU + Redis，缓存时间按接口分别配置；
+    过期后的一段时间内直接返回旧数据并在后台刷新（stale-while-revalidate），同一请求的加载和刷新只执行一次
+    """
+
+    def __init__(self, max_items: int = Constants.SPIDER_RESPONSE_MAX_ITEMS):
+        # key -> (数据, 新鲜截止时间戳)
+        self._l1 = TtlLruCache(max_items)
+        self._flight = AsyncSingleFlight()
+        # 持有后台刷新任务的引用，避免执行中被回收
+        self._refreshing: Set[asyncio.Task] = set()
+        self._stats: Dict[str, _ActionStats] = {}
+        self._lock = threading.Lock()
+        two_tier_cache.add_invalidation_hook(self._on_invalidate)
+
+    def _on_invalidate(self, target: str) -> None:
+        """按前缀失效缓存时同步清除进程内的响应缓存"""
+        if target.endswith("*"):
+            self._l1.delete_prefix(target[:-1])
+        else:
+            self._l1.delete(target)
+
+    @staticmethod
+    def cache_key(spider, action: str, params: Tuple) -> str:
+        """参数可能包含中文、冒号等字符，摘要后放到爬虫的 key 命名空间下"""
+        digest = hashlib.sha1(json.dumps(params, ensure_ascii=False).encode("utf-8")).hexdigest()
+        return spider.make_redis_key("resp", action, digest)
+
+    @staticmethod
+    def ttl_of(spider, action: str) -> Tuple[int, int]:
+        """:return: (新鲜时间, 过期后仍可返回旧数据的时间)，站点配置 response_cache_ttl 可覆盖默认值"""
+        ttl = Constants.SPIDER_RESPONSE_TTL.get(action, Constants.SPIDER_RESPONSE_DEFAULT_TTL)
+        config = spider.config
+        if config is not None:
+            ttl = config.response_ttl.get(action, ttl)
+        return int(ttl), int(ttl * Constants.SPIDER_RESPONSE_STALE_RATIO)
+
+    def _get_stats(self, action: str) -> _ActionStats:
+        stats = self._stats.get(action)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(action, _ActionStats())
+        return stats
+
+    async def _lookup(self, key: str, stale: int) -> Optional[Tuple[Any, float]]:
+        found, entry = self._l1.lookup(key)
+        if found:
+            return entry
+
+        val = await async_redis_bytes_client.get(key)
+        if not val:
+            return None
+        try:
+            item = default_codec.decode(val)
+            entry = (item["data"], item["fresh_until"])
+        except Exception as e:
+            logger.warning(f"decode spider response cache failed, key={key}, error={e}")
+            return None
+        self._l1.set(key, entry, min(Constants.CACHE_L1_TTL, entry[1] + stale - time.time()))
+        return entry
+
+    async def _load(self,
+                    key: str,
+                    loader: ResponseLoader,
+                    ttl: int,
+                    stale: int,
+                    cacheable: Callable[[Any], bool],
+                    stats: _ActionStats) -> Any:
+        data = await loader()
+        # 上游全部失败时返回的是空数据，不缓存，下次请求重新获取
+        if not cacheable(data):
+            stats.uncached += 1
+            return data
+
+        fresh_until = time.time() + ttl
+        self._l1.set(key, (data, fresh_until), min(Constants.CACHE_L1_TTL, ttl + stale))
+        await async_redis_bytes_client.set_ex(
+            key, default_codec.encode({"data": data, "fresh_until": fresh_until}), ttl + stale)
+        return data
+
+    def _refresh(self, key: str, load: Callable[[], Awaitable[Any]], stats: _ActionStats) -> None:
+        if self._flight.in_flight(key):
+            return
+
+        async def refresh() -> None:
+            stats.refreshes += 1
+            try:
+                await self._flight.do(key, load)
+            except Exception as e:
+                stats.refresh_failed += 1
+                logger.warning(f"refresh spider response failed, key={key}, error={e}")
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._refreshing.add(task)
+        task.add_done_callback(self._refreshing.discard)
+
+    async def get(self,
+                  spider,
+                  action: str,
+                  params: Tuple,
+                  loader: ResponseLoader,
+                  cacheable: Callable[[Any], bool] = bool) -> Any:
+        """
+        获取缓存的上游响应，未命中时加载；旧数据在可用期内直接返回，同时在后台刷新
+        :param action: 接口名称（list/detail/search），决定缓存时间
+        :param params: 区分缓存的请求参数，如分类 ID、关键词
+        :param cacheable: 判断加载结果是否可以缓存，默认非空才缓存
+        """
+        key = self.cache_key(spider, action, params)
+        ttl, stale = self.ttl_of(spider, action)
+        stats = self._get_stats(action)
+        if ttl <= 0:
+            stats.misses += 1
+            return await loader()
+
+        def load() -> Awaitable[Any]:
+            return self._load(key, loader, ttl, stale, cacheable, stats)
+
+        entry = await self._lookup(key, stale)
+        if entry is not None:
+            data, fresh_until = entry
+            if fresh_until > time.time():
+                stats.fresh_hits += 1
+            else:
+                stats.stale_hits += 1
+                self._refresh(key, load, stats)
+            return data
+
+        stats.misses += 1
+        return await self._flight.do(key, load)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        return {
+            "l1_items": len(self._l1),
+            "refreshing": len(self._refreshing),
+            "actions": {action: item.snapshot() for action, item in sorted(stats.items())},
+        }
+
+
+response_cache = SpiderResponseCache()
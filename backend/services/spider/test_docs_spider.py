@@ -0,0 +1,65 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import httpx
+
+from core.constants import Constants
+from core.hedging import HedgeBudget
+from services.config import CollectInfo
+from services.spider import DocsSpider as docs
+
+
+class _SiteConfig:
+
+    def __init__(self, sites):
+        self.site_collections = sites
+
+
+class TestDocsMirrorOrder(unittest.TestCase):
+    """测试镜像站点的延迟统计及排序"""
+
+    def setUp(self):
+        self.slow = CollectInfo({"url": "http://slow.test/api"})
+        self.fast = CollectInfo({"url": "http://fast.test/api"})
+        for site in (self.slow, self.fast):
+            docs._site_latencies.pop(site.url, None)
+            docs._site_breakers.pop(site.url, None)
+            docs._site_attempted.discard(site.url)
+
+    def collect(self, video_name: str):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(1 if request.url.host == "slow.test" else 0.01)
+            body = {"list": [{"vod_name": video_name}]}
+            return httpx.Response(200, content=json.dumps(body).encode("utf-8"))
+
+        async def main():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                spider = docs.DocsSpider.__new__(docs.DocsSpider)
+                return await spider._collect_detail(client, video_name, _SiteConfig([self.slow, self.fast]))
+
+        with mock.patch.object(Constants, "HEDGE_DEFAULT_DELAY", 0.05), \
+                mock.patch.object(docs, "_hedge_budget", HedgeBudget(burst=1)):
+            return asyncio.run(main())
+
+    def test_untried_sites_keep_config_order(self):
+        """测试尚未尝试的站点按配置顺序排列"""
+        self.assertEqual([self.slow, self.fast], docs._ordered_sites([self.slow, self.fast]))
+
+    def test_hedge_loser_not_sampled(self):
+        """测试对冲落败被取消的慢站点不记录延迟，仍排在快站点之后"""
+        video = self.collect("demo")
+        self.assertEqual("demo", video["vod_name"])
+        self.assertEqual(0, docs._site_latency(self.slow.url).count)
+        self.assertEqual(1, docs._site_latency(self.fast.url).count)
+        self.assertEqual([self.fast, self.slow], docs._ordered_sites([self.slow, self.fast]))
+
+        # 快站点排在前面后不再触发对冲，慢站点始终没有延迟样本
+        self.collect("demo")
+        self.assertEqual(0, docs._site_latency(self.slow.url).count)
+        self.assertEqual([self.fast, self.slow], docs._ordered_sites([self.slow, self.fast]))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,112 @@
+import asyncio
+import sys
+import time
+import unittest
+
+from services.ytdlp import YtdlpBusyError, YtdlpError, YtdlpPool
+
+# 模拟工作进程：按 url 决定正常返回、解析失败或超时不返回
+STUB_WORKER = """
+import json, os, sys, time
+print(json.dumps({"ok": True, "ready": os.getpid()}), flush=True)
+for line in sys.stdin:
+    url = json.loads(line)["url"]
+    if url == "slow":
+        time.sleep(30)
+    elif url == "bad":
+        print(json.dumps({"ok": False, "error": "Video unavailable"}), flush=True)
+    else:
+        print(json.dumps({"ok": True, "info": {"url": url, "pid": os.getpid()}}), flush=True)
+"""
+
+
+class TestYtdlpPool(unittest.TestCase):
+    """测试 yt-dlp 进程池的请求、超时、进程回收及排队上限"""
+
+    def new_pool(self, **kwargs) -> YtdlpPool:
+        options = {"size": 1, "max_queue": 2, "timeout": 2, "max_tasks": 100}
+        options.update(kwargs)
+        pool = YtdlpPool(command=(sys.executable, "-c", STUB_WORKER), **options)
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def test_extract_reuses_worker(self):
+        """测试请求复用同一个常驻进程，解析失败不结束进程"""
+        pool = self.new_pool()
+
+        async def main():
+            first = await pool.extract("a", [])
+            with self.assertRaises(YtdlpError):
+                await pool.extract("bad", [])
+            second = await pool.extract("b", [])
+            return first, second
+
+        first, second = asyncio.run(main())
+        self.assertEqual("a", first["url"])
+        self.assertEqual(first["pid"], second["pid"])
+        stats = pool.stats()
+        self.assertEqual((3, 2, 1, 1), (stats["requests"], stats["success"], stats["failed"], stats["spawned"]))
+
+    def test_timeout_kills_worker(self):
+        """测试超时的进程被结束并重建"""
+        pool = self.new_pool(timeout=1)
+
+        async def main():
+            with self.assertRaises(TimeoutError):
+                await pool.extract("slow", [])
+            return await pool.extract("a", [])
+
+        self.assertEqual("a", asyncio.run(main())["url"])
+        stats = pool.stats()
+        self.assertEqual((1, 2, 1), (stats["timeouts"], stats["spawned"], stats["workers"]))
+
+    def test_recycle_after_max_tasks(self):
+        """测试处理次数达到上限后重建进程"""
+        pool = self.new_pool(max_tasks=2)
+
+        async def main():
+            return [(await pool.extract(url, []))["pid"] for url in ("a", "b", "c")]
+
+        pids = asyncio.run(main())
+        self.assertEqual(pids[0], pids[1])
+        self.assertNotEqual(pids[1], pids[2])
+        self.assertEqual(1, pool.stats()["recycled"])
+
+    def test_start_warms_workers(self):
+        """测试预启动全部进程，首次请求直接使用空闲进程"""
+        pool = self.new_pool(size=2)
+        pool.start()
+        self.assertEqual((2, 2, 2), (pool.stats()["spawned"], pool.stats()["workers"], pool.stats()["idle"]))
+
+        asyncio.run(pool.extract("a", []))
+        self.assertEqual(2, pool.stats()["spawned"])
+
+    def test_respawn_in_background(self):
+        """测试回收的进程在后台重建，不等待下一次请求"""
+        pool = self.new_pool(max_tasks=1)
+        asyncio.run(pool.extract("a", []))
+        self.assertEqual(1, pool.stats()["recycled"])
+
+        deadline = time.monotonic() + 5
+        while pool.stats()["idle"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual((2, 1, 1), (pool.stats()["spawned"], pool.stats()["workers"], pool.stats()["idle"]))
+
+    def test_reject_when_queue_full(self):
+        """测试等待队列已满时直接拒绝"""
+        pool = self.new_pool(max_queue=0, timeout=1)
+
+        async def main():
+            slow = asyncio.ensure_future(pool.extract("slow", []))
+            await asyncio.sleep(0.1)
+            with self.assertRaises(YtdlpBusyError):
+                await pool.extract("a", [])
+            with self.assertRaises(TimeoutError):
+                await slow
+
+        asyncio.run(main())
+        self.assertEqual(1, pool.stats()["rejected"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
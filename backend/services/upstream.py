@@ -0,0 +1,184 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import Dict, Iterable
+from urllib.parse import urlparse
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from core.constants import Constants
+from core.hedging import HedgeBudget, hedge_delay
+from core.logger_factory import LoggerFactory
+from core.metrics import LatencyHistogram
+from core.singleton import singleton
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+logger = LoggerFactory.get_logger(__name__)
+
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def backoff_delay(attempt: int,
+                  base: float = Constants.UPSTREAM_BACKOFF_BASE,
+                  cap: float = Constants.UPSTREAM_BACKOFF_MAX) -> float:
+    """指数退避加全量随机抖动，避免大量请求同时重试"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class _Endpoint:
+    __slots__ = ("breaker", "latency", "requests", "errors", "rejected", "_lock")
+
+    def __init__(self):
+        self.breaker = CircuitBreaker(Constants.UPSTREAM_BREAKER_THRESHOLD, Constants.UPSTREAM_BREAKER_RESET)
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        # 对冲请求在线程池中执行，计数需要加锁
+        self._lock = threading.Lock()
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def failed(self) -> None:
+        self.count("errors")
+        self.breaker.record_failure()
+
+
+@singleton
+class UpstreamClient:
+    """
+    Migu/CNTV 等上游接口的共享客户端：keep-alive 连接池复用 TCP/TLS 连接，
+    网络错误和 5xx 按指数退避+抖动重试，按接口（域名+一级路径）熔断并统计延迟分布
+    """
+
+    def __init__(self):
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=Constants.UPSTREAM_POOL_SIZE,
+            pool_maxsize=Constants.UPSTREAM_POOL_SIZE,
+            max_retries=0,
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._endpoints: Dict[str, _Endpoint] = {}
+        self._lock = threading.Lock()
+        self._hedge_budget = HedgeBudget()
+        self._hedge_pool = ThreadPoolExecutor(max_workers=Constants.HEDGE_WORKERS, thread_name_prefix="upstream-hedge")
+
+    @staticmethod
+    def endpoint_of(url: str) -> str:
+        parsed = urlparse(url)
+        segments = [segment for segment in parsed.path.split("/") if segment]
+        return f"{parsed.netloc}/{segments[0]}" if segments else parsed.netloc
+
+    def _get_endpoint(self, name: str) -> _Endpoint:
+        endpoint = self._endpoints.get(name)
+        if endpoint is None:
+            with self._lock:
+                endpoint = self._endpoints.setdefault(name, _Endpoint())
+        return endpoint
+
+    def request(self,
+                method: str,
+                url: str,
+                retries: int = Constants.UPSTREAM_RETRIES,
+                retry_status: Iterable[int] = RETRY_STATUS,
+                endpoint: str = None,
+                **kwargs) -> requests.Response:
+        """
+        发送请求，熔断打开时抛出 CircuitOpenError；重试耗尽后抛出最后一次的异常，
+        或返回最后一次的响应（状态码由调用方判断）
+        """
+        stats = self._get_endpoint(endpoint or self.endpoint_of(url))
+        kwargs.setdefault("timeout", Constants.REQUEST_TIMEOUT)
+
+        attempt = 0
+        while True:
+            if not stats.breaker.allow():
+                stats.count("rejected")
+                raise CircuitOpenError(f"circuit open: {endpoint or self.endpoint_of(url)}")
+
+            stats.count("requests")
+            start = time.monotonic()
+            try:
+                response = self._session.request(method, url, **kwargs)
+                stats.latency.observe(time.monotonic() - start)
+                if response.status_code not in retry_status:
+                    stats.breaker.record_success()
+                    return response
+                stats.failed()
+                if attempt >= retries:
+                    return response
+            except (requests.ConnectionError, requests.Timeout) as e:
+                stats.latency.observe(time.monotonic() - start)
+                stats.failed()
+                if attempt >= retries:
+                    raise
+                logger.debug(f"upstream request retry [{attempt + 1}/{retries}]: {url}, {e}")
+            except Exception:
+                # 其他异常（无效地址、重定向过多、SSL 等）不重试，同样记为失败，半开状态的探测不会一直占用
+                stats.failed()
+                raise
+
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def hedged_get(self, url: str, **kwargs) -> requests.Response:
+        """
+        对冲请求：超过该接口观测到的 p90 延迟仍未返回时，在预算允许的情况下再发起一次相同请求，
+        取先成功返回的结果；落后的请求无法中断，在后台线程完成后丢弃
+        """
+        delay = hedge_delay(self._get_endpoint(self.endpoint_of(url)).latency)
+        self._hedge_budget.record_request()
+        futures = [self._hedge_pool.submit(self.get, url, **kwargs)]
+        done, _ = wait(futures, timeout=delay, return_when=FIRST_COMPLETED)
+        if not done and self._hedge_budget.try_hedge():
+            logger.debug(f"hedge upstream request after {delay:.3f}s: {url}")
+            futures.append(self._hedge_pool.submit(self.get, url, **{**kwargs, "retries": 0}))
+
+        response, error = None, None
+        for future in as_completed(futures):
+            try:
+                response = future.result()
+            except Exception as e:
+                error = e
+                continue
+            if response.status_code not in RETRY_STATUS:
+                return response
+        if response is not None:
+            return response
+        raise error
+
+    def get_json(self, url: str, **kwargs) -> dict:
+        response = self.get(url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            endpoints = dict(self._endpoints)
+        return {
+            "hedge": self._hedge_budget.snapshot(),
+            "endpoints": {
+                name: {
+                    "requests": endpoint.requests,
+                    "errors": endpoint.errors,
+                    "rejected": endpoint.rejected,
+                    "breaker": endpoint.breaker.snapshot(),
+                    "latency": endpoint.latency.snapshot(),
+                }
+                for name, endpoint in sorted(endpoints.items())
+            },
+        }
+
+
+upstream_client = UpstreamClient()
@@ -0,0 +1,259 @@
+import asyncio
+import json
+import os
+import queue
+import select
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from core.constants import Constants
+from core.logger_factory import LoggerFactory
+from core.metrics import LatencyHistogram
+
+logger = LoggerFactory.get_logger(__name__)
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 工作进程启动命令，按行读写 JSON 协议（见 utils/ytdlp_worker.py）
+WORKER_COMMAND = (sys.executable, "-m", "utils.ytdlp_worker")
+
+
+class YtdlpError(Exception):
+    """yt-dlp 解析失败"""
+
+
+class YtdlpBusyError(YtdlpError):
+    """等待队列已满"""
+
+
+class _Worker:
+    """单个常驻工作进程，通过 stdin/stdout 按行收发 JSON；同一时间只被一个调用方持有"""
+
+    def __init__(self, start_timeout: float, command: Tuple[str, ...] = WORKER_COMMAND):
+        self.process = subprocess.Popen(
+            list(command),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=_BACKEND_DIR,
+        )
+        self.tasks = 0
+        # 等待子进程导入 yt_dlp 完成
+        try:
+            self._read(start_timeout)
+        except BaseException:
+            self.kill()
+            raise
+        self.ready_at = time.monotonic()
+
+    def _read(self, timeout: float) -> Dict:
+        ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+        if not ready:
+            raise TimeoutError(f"yt-dlp timeout after {timeout}s")
+        line = self.process.stdout.readline()
+        if not line:
+            raise YtdlpError(f"yt-dlp worker exited: {self.process.poll()}")
+        return json.loads(line)
+
+    def call(self, url: str, argv: List[str], path: Optional[str], timeout: float) -> Dict:
+        self.tasks += 1
+        self.process.stdin.write(json.dumps({"url": url, "argv": argv, "path": path}).encode("utf-8") + b"\n")
+        self.process.stdin.flush()
+        response = self._read(timeout)
+        if not response.get("ok"):
+            raise YtdlpError(response.get("error"))
+        return response["info"]
+
+    def kill(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait(timeout=1)
+        for stream in (self.process.stdin, self.process.stdout):
+            stream.close()
+
+
+class YtdlpPool:
+    """
+    yt-dlp 解析进程池：少量常驻进程保持 yt_dlp 已导入，通过 Python API 复用 YoutubeDL 实例，
+    省去每次解析启动解释器、加载提取器的开销；等待队列有上限，超时或回收的进程直接结束并在后台重建
+    """
+
+    def __init__(self,
+                 size: int = Constants.YTDLP_WORKERS,
+                 max_queue: int = Constants.YTDLP_MAX_QUEUE,
+                 timeout: float = Constants.YTDLP_TIMEOUT,
+                 max_tasks: int = Constants.YTDLP_MAX_TASKS,
+                 command: Tuple[str, ...] = WORKER_COMMAND,
+                 start_timeout: float = Constants.YTDLP_START_TIMEOUT):
+        self._command = command
+        self._size = size
+        self._max_queue = max_queue
+        self._timeout = timeout
+        self._max_tasks = max_tasks
+        self._start_timeout = start_timeout
+        self._idle: "queue.LifoQueue[_Worker]" = queue.LifoQueue()
+        self._workers = 0
+        self._pending = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        # 调用方在线程中阻塞等待管道，线程数 = 进程数 + 等待队列长度
+        self._executor = ThreadPoolExecutor(max_workers=size + max_queue, thread_name_prefix="ytdlp")
+        # 预启动及重建进程在单独的线程中执行，不占用请求的超时时间
+        self._spawner = ThreadPoolExecutor(max_workers=size, thread_name_prefix="ytdlp-spawn")
+        self._latency = LatencyHistogram()
+        self._counters = {"requests": 0, "success": 0, "failed": 0, "timeouts": 0, "rejected": 0,
+                          "spawned": 0, "recycled": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _spawn(self) -> _Worker:
+        """启动进程，调用前已计入进程数，启动失败时退还"""
+        try:
+            worker = _Worker(self._start_timeout, self._command)
+        except Exception:
+            with self._lock:
+                self._workers -= 1
+            raise
+        self._count("spawned")
+        return worker
+
+    def _spawn_idle(self) -> None:
+        try:
+            worker = self._spawn()
+        except Exception as e:
+            logger.warning(f"start yt-dlp worker failed: {e}")
+            return
+        with self._lock:
+            closed = self._closed
+        if closed:
+            self._discard(worker)
+        else:
+            self._idle.put(worker)
+
+    def _replenish(self) -> Optional[Future]:
+        """进程数不足时在后台启动新进程，启动完成后放入空闲队列"""
+        with self._lock:
+            if self._closed or self._workers >= self._size:
+                return None
+            self._workers += 1
+        try:
+            return self._spawner.submit(self._spawn_idle)
+        except RuntimeError:
+            # 进程池已关闭
+            with self._lock:
+                self._workers -= 1
+            return None
+
+    def _acquire(self, deadline: float) -> _Worker:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        # 后台启动失败等原因导致进程数不足时在请求中启动
+        with self._lock:
+            spawn = self._workers < self._size
+            if spawn:
+                self._workers += 1
+        if spawn:
+            return self._spawn()
+
+        try:
+            return self._idle.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            raise TimeoutError("wait for yt-dlp worker timeout")
+
+    def _discard(self, worker: _Worker) -> None:
+        worker.kill()
+        with self._lock:
+            self._workers -= 1
+
+    def _release(self, worker: _Worker) -> None:
+        # 处理一定次数后重建进程，避免长期运行的内存增长
+        if worker.tasks >= self._max_tasks:
+            self._count("recycled")
+            self._discard(worker)
+            self._replenish()
+        else:
+            self._idle.put(worker)
+
+    def _run(self, url: str, argv: List[str], path: Optional[str]) -> Dict:
+        started = time.monotonic()
+        worker = self._acquire(started + self._timeout)
+        # 请求中新启动的进程，启动耗时不计入解析超时
+        deadline = max(started, worker.ready_at) + self._timeout
+        try:
+            result = worker.call(url, argv, path, max(deadline - time.monotonic(), 1))
+        except YtdlpError:
+            self._release(worker)
+            raise
+        except BaseException:
+            # 超时或管道异常时进程状态未知，直接结束
+            self._discard(worker)
+            self._replenish()
+            raise
+        self._release(worker)
+        self._latency.observe(time.monotonic() - started)
+        return result
+
+    def start(self) -> None:
+        """预先并行启动全部工作进程，等待启动完成；启动失败的进程在首次请求时重试"""
+        futures = [self._replenish() for _ in range(self._size)]
+        for future in futures:
+            if future is not None:
+                future.result()
+
+    async def extract(self, url: str, argv: List[str], path: Optional[str] = None) -> Dict:
+        """
+        解析视频信息，返回精简后的 info（url/formats/requested_formats）
+        :param argv: yt-dlp 命令行参数（不含 url）
+        :param path: 子进程使用的 PATH 环境变量（用于查找 Deno）
+        """
+        with self._lock:
+            self._counters["requests"] += 1
+            if self._pending >= self._size + self._max_queue:
+                self._counters["rejected"] += 1
+                raise YtdlpBusyError("yt-dlp queue is full")
+            self._pending += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, self._run, url, argv, path)
+            self._count("success")
+            return result
+        except TimeoutError:
+            self._count("timeouts")
+            raise
+        except Exception:
+            self._count("failed")
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+        self._spawner.shutdown(wait=False, cancel_futures=True)
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "workers": self._workers,
+                "idle": self._idle.qsize(),
+                "pending": self._pending,
+                "latency": self._latency.snapshot(),
+            }
+
+
+ytdlp_pool = YtdlpPool()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 缓存编解码基准测试：对比 JSON 字符串与 codec 各组合的编码/解码耗时及数据大小，
+# 指定 --redis 时写入 Redis 并通过 MEMORY USAGE 统计实际内存占用
+#
+# 用法：python tests/codec-bench.py -n 2000
+#      python tests/codec-bench.py --redis redis://127.0.0.1:6379/15
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.codec import Codec, msgpack, zstandard  # noqa: E402
+
+
+def make_video(i: int) -> dict:
+    return {
+        "vod_name": f"测试视频{i}",
+        "vod_pic": f"https://img.example.com/cover/{i}.jpg",
+        "type_name": "纪录片",
+        "vod_remarks": "更新至50集",
+        "vod_year": "2024",
+        "vod_area": "中国大陆",
+        "vod_actor": "演员甲,演员乙,演员丙",
+        "vod_content": "这是一段用于测试的视频简介，内容会重复多次以模拟真实数据。" * 20,
+        "vod_play_from": "m3u8$$$mp4",
+        "vod_play_url": "#".join(f"第{n}集$https://cdn.example.com/video/{i}/{n}/index.m3u8"
+                                 for n in range(1, 51)),
+    }
+
+
+class JsonString:
+    """旧版本：json.dumps 字符串"""
+
+    def encode(self, data):
+        return json.dumps(data, ensure_ascii=False)
+
+    def decode(self, data):
+        return json.loads(data)
+
+
+def bench(name, codec, videos, redis_conn=None):
+    start = time.perf_counter()
+    encoded = [codec.encode(v) for v in videos]
+    encode_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for item in encoded:
+        codec.decode(item)
+    decode_ms = (time.perf_counter() - start) * 1000
+
+    size = sum(len(item.encode("utf-8") if isinstance(item, str) else item) for item in encoded)
+    memory = "-"
+    if redis_conn is not None:
+        prefix = f"bench:{name}:"
+        pipe = redis_conn.pipeline(transaction=False)
+        for i, item in enumerate(encoded):
+            pipe.set(f"{prefix}{i}", item)
+        pipe.execute()
+        memory = sum(redis_conn.memory_usage(f"{prefix}{i}") or 0 for i in range(len(encoded)))
+        redis_conn.delete(*[f"{prefix}{i}" for i in range(len(encoded))])
+
+    print(f"{name:<20}{encode_ms:>12.1f}{decode_ms:>12.1f}{size / len(videos):>12.0f}{str(memory):>14}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="缓存编解码基准测试")
+    parser.add_argument("-n", "--count", type=int, default=2000, help="视频数量")
+    parser.add_argument("--redis", default="", help="Redis 地址，例如 redis://127.0.0.1:6379/15")
+    args = parser.parse_args()
+
+    conn = None
+    if args.redis:
+        import redis
+
+        conn = redis.Redis.from_url(args.redis)
+
+    data = [make_video(i) for i in range(args.count)]
+    codecs = [
+        ("json-str", JsonString()),
+        ("json", Codec(serializer="json", compression="none")),
+        ("json+zlib", Codec(serializer="json", compression="zlib")),
+    ]
+    if msgpack:
+        codecs += [
+            ("msgpack", Codec(serializer="msgpack", compression="none")),
+            ("msgpack+zlib", Codec(serializer="msgpack", compression="zlib")),
+        ]
+    if zstandard:
+        codecs.append(("json+zstd", Codec(serializer="json", compression="zstd", level=3)))
+
+    print(f"{'codec':<20}{'encode(ms)':>12}{'decode(ms)':>12}{'avg bytes':>12}{'redis bytes':>14}")
+    for codec_name, item_codec in codecs:
+        bench(codec_name, item_codec, data, conn)
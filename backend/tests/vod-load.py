@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# 点播接口并发压测：统计 /site/vod、/site/player 的吞吐量和延迟分布
+#
+# 用法：python tests/vod-load.py --base http://127.0.0.1:5000 --sp v-docs -c 50 -n 2000
+#      python tests/vod-load.py --path "/site/vod?sp=v-docs&ac=detail&t=1&pg=1" -c 100 -n 5000
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def run(base: str, paths: list, concurrency: int, total: int) -> None:
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(paths[i % len(paths)])
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, timeout=30, limits=limits, follow_redirects=False) as client:
+
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                path = queue.get_nowait()
+                start = time.perf_counter()
+                try:
+                    resp = await client.get(path)
+                    if resp.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    quantile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+    print(f"请求数: {total}, 并发: {concurrency}, 失败: {errors}, 耗时: {elapsed:.2f}s")
+    print(f"吞吐量: {total / elapsed:.1f} req/s")
+    print(f"延迟(ms): avg={statistics.mean(latencies):.1f}, p50={quantile(0.5):.1f}, "
+          f"p90={quantile(0.9):.1f}, p99={quantile(0.99):.1f}, max={latencies[-1]:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="点播接口并发压测")
+    parser.add_argument("--base", default="http://127.0.0.1:5000", help="服务地址")
+    parser.add_argument("--sp", default="v-docs", help="来源标识")
+    parser.add_argument("--path", action="append", help="压测路径，可重复指定，默认分类列表+播放地址")
+    parser.add_argument("-c", "--concurrency", type=int, default=50, help="并发数")
+    parser.add_argument("-n", "--total", type=int, default=2000, help="总请求数")
+    args = parser.parse_args()
+
+    test_paths = args.path or [
+        f"/site/vod?sp={args.sp}&ac=detail&t=1&pg=1",
+        f"/site/vod?sp={args.sp}&wd=1&pg=1",
+        f"/site/player/{args.sp}/test?tp=json",
+    ]
+    asyncio.run(run(args.base, test_paths, args.concurrency, args.total))
@@ -0,0 +1,87 @@
+import gzip
+import os
+import tempfile
+from typing import Optional, TextIO
+
+
+class AtomicFileWriter:
+    """
+    原子写文件：先写入同目录下的临时文件，提交时再 rename 覆盖目标文件，
+    读取方只会看到旧文件或完整的新文件，不会读到写了一半的内容。
+    可选同时生成 gzip 压缩副本（目标文件名 + .gz），同样原子发布。
+    """
+
+    def __init__(self, file_path: str, with_gzip: bool = False, buffer_size: int = 1024 * 1024):
+        self._file_path = file_path
+        self._with_gzip = with_gzip
+        self._buffer_size = buffer_size
+        self._tmp_path: Optional[str] = None
+        self._tmp_gz_path: Optional[str] = None
+        self._fd: Optional[TextIO] = None
+        self._gz_fd: Optional[TextIO] = None
+
+    @property
+    def file_path(self):
+        return self._file_path
+
+    def _make_tmp(self, target_path: str) -> str:
+        dir_name = os.path.dirname(target_path) or "."
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(target_path)}.", suffix=".tmp", dir=dir_name)
+        os.close(fd)
+        return tmp_path
+
+    def open(self) -> "AtomicFileWriter":
+        os.makedirs(os.path.dirname(self._file_path) or ".", exist_ok=True)
+        self._tmp_path = self._make_tmp(self._file_path)
+        self._fd = open(self._tmp_path, "w", encoding="utf-8", buffering=self._buffer_size)
+        if self._with_gzip:
+            self._tmp_gz_path = self._make_tmp(self._file_path + ".gz")
+            self._gz_fd = gzip.open(self._tmp_gz_path, "wt", encoding="utf-8", compresslevel=6)
+        return self
+
+    def write(self, text: str) -> None:
+        self._fd.write(text)
+        if self._gz_fd:
+            self._gz_fd.write(text)
+
+    def commit(self) -> None:
+        """刷新并关闭临时文件，然后原子替换目标文件"""
+        self._fd.flush()
+        os.fsync(self._fd.fileno())
+        self._fd.close()
+        self._fd = None
+        os.chmod(self._tmp_path, 0o644)
+        os.replace(self._tmp_path, self._file_path)
+        self._tmp_path = None
+
+        if self._gz_fd:
+            self._gz_fd.close()
+            self._gz_fd = None
+            os.chmod(self._tmp_gz_path, 0o644)
+            os.replace(self._tmp_gz_path, self._file_path + ".gz")
+            self._tmp_gz_path = None
+
+    def abort(self) -> None:
+        """放弃写入，删除临时文件，目标文件保持不变"""
+        for handle in (self._fd, self._gz_fd):
+            if handle:
+                try:
+                    handle.close()
+                except OSError:
+                    pass
+        self._fd = self._gz_fd = None
+
+        for tmp_path in (self._tmp_path, self._tmp_gz_path):
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._tmp_path = self._tmp_gz_path = None
+
+    def __enter__(self) -> "AtomicFileWriter":
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,116 @@
+import json
+import zlib
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 头部：2 字节魔数 + 1 字节版本 + 1 字节标志（低 4 位序列化格式，高 4 位压缩算法）
+# 0xFE 不会出现在合法的 UTF-8 文本开头，可以与旧版本直接存储的 JSON 字符串区分
+MAGIC = b"\xfe\x54"
+VERSION = 1
+HEADER_SIZE = 4
+
+FORMAT_JSON = 0
+FORMAT_MSGPACK = 1
+
+COMPRESS_NONE = 0
+COMPRESS_ZLIB = 1
+COMPRESS_ZSTD = 2
+
+
+class Codec:
+    """
+    缓存数据编解码：JSON（优先 orjson）或 msgpack 序列化，超过阈值后压缩，
+    带版本头部；读取不带头部的旧数据时按 JSON 字符串解析，兼容已有的缓存
+    """
+
+    def __init__(self,
+                 serializer: str = "auto",
+                 compression: str = "zlib",
+                 threshold: int = 1024,
+                 level: int = 6):
+        if serializer == "auto":
+            serializer = "msgpack" if msgpack else "json"
+        if serializer == "msgpack" and msgpack is None:
+            raise ValueError("msgpack is not installed")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstandard is not installed")
+
+        self._format = FORMAT_MSGPACK if serializer == "msgpack" else FORMAT_JSON
+        self._compression = {"none": COMPRESS_NONE, "zlib": COMPRESS_ZLIB, "zstd": COMPRESS_ZSTD}[compression]
+        self._threshold = threshold
+        self._level = level
+
+    @staticmethod
+    def _dumps(data: Any, fmt: int) -> bytes:
+        if fmt == FORMAT_MSGPACK:
+            return msgpack.packb(data, use_bin_type=True)
+        if orjson is not None:
+            return orjson.dumps(data)
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def _loads(payload: bytes, fmt: int) -> Any:
+        if fmt == FORMAT_MSGPACK:
+            if msgpack is None:
+                raise ValueError("msgpack is not installed")
+            return msgpack.unpackb(payload, raw=False)
+        if orjson is not None:
+            return orjson.loads(payload)
+        return json.loads(payload)
+
+    def _compress(self, payload: bytes) -> bytes:
+        if self._compression == COMPRESS_ZSTD:
+            return zstandard.ZstdCompressor(level=self._level).compress(payload)
+        return zlib.compress(payload, self._level)
+
+    @staticmethod
+    def _decompress(payload: bytes, compression: int) -> bytes:
+        if compression == COMPRESS_ZLIB:
+            return zlib.decompress(payload)
+        if compression == COMPRESS_ZSTD:
+            if zstandard is None:
+                raise ValueError("zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        return payload
+
+    def encode(self, data: Any) -> bytes:
+        payload = self._dumps(data, self._format)
+        compression = COMPRESS_NONE
+        if self._compression != COMPRESS_NONE and len(payload) >= self._threshold:
+            compressed = self._compress(payload)
+            # 压缩收益太小时保留原始数据，读取时省去解压
+            if len(compressed) < len(payload) * 0.9:
+                payload, compression = compressed, self._compression
+        return MAGIC + bytes((VERSION, (compression << 4) | self._format)) + payload
+
+    def decode(self, data: bytes | str | None) -> Any:
+        if data is None:
+            return None
+        if isinstance(data, str):
+            return json.loads(data)
+        if not data.startswith(MAGIC):
+            # 旧版本直接存储的 JSON 字符串
+            return json.loads(data.decode("utf-8"))
+
+        version, flags = data[2], data[3]
+        if version != VERSION:
+            raise ValueError(f"unsupported codec version: {version}")
+        payload = self._decompress(data[HEADER_SIZE:], flags >> 4)
+        return self._loads(payload, flags & 0x0F)
+
+
+default_codec = Codec()
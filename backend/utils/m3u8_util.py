@@ -0,0 +1,32 @@
+import re
+from urllib.parse import quote
+
+# 需要代理的分片地址
+SEG_TS_PATTERN = re.compile(r'https?://[^\s#]+?/seg\.ts[^\s#]*')
+TARGET_DURATION_PATTERN = re.compile(r'#EXT-X-TARGETDURATION:\s*(\d+(?:\.\d+)?)')
+
+
+class PlaylistRewriter:
+    """把播放列表中的分片地址替换为代理地址，正则预编译，每个代理前缀一个实例"""
+
+    def __init__(self, proxy_prefix: str):
+        self._proxy_prefix = proxy_prefix
+
+    def _replace(self, match: re.Match) -> str:
+        return f"{self._proxy_prefix}{quote(match.group(0), safe='')}"
+
+    def rewrite(self, playlist: str) -> str:
+        return SEG_TS_PATTERN.sub(self._replace, playlist)
+
+
+def playlist_ttl(playlist: str, default_ttl: float, vod_ttl: float) -> float:
+    """
+    播放列表缓存秒数：点播列表（#EXT-X-ENDLIST）不再变化，使用 vod_ttl；
+    直播列表按 #EXT-X-TARGETDURATION 的一半缓存，保证客户端轮询时能及时拿到新分片
+    """
+    if "#EXT-X-ENDLIST" in playlist:
+        return vod_ttl
+    match = TARGET_DURATION_PATTERN.search(playlist)
+    if match:
+        return max(float(match.group(1)) / 2, 1)
+    return default_ttl
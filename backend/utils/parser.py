@@ -1,26 +1,27 @@
 import json
-import os
 import random
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List
-
-import requests
-import urllib3
+from typing import List, Tuple
 
 from api.live.converter import LiveConverter
+from core.circuit_breaker import CircuitOpenError
 from core.constants import Constants
 from core.logger_factory import LoggerFactory
 from models.counter import Counter
+from models.epg_info import EpgChannel
 from models.migu_info import MiguCateInfo, MiguDataInfo
 from services import channel_manager, config_manager, task_manager
+from services.cache import two_tier_cache
+from services.epg import EpgBuilder
 from services.redis import redis_client
+from services.resolver import DEFAULT_RATE_TYPE, migu_resolver
+from services.upstream import backoff_delay, upstream_client
 from utils.encry_util import getStringMD5
-from utils.string_util import get_xml_cvt_string, seconds_to_time_str, ms2time_str
 
 logger = LoggerFactory.get_logger(__name__)
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 CLIENT_CONFIG = {
     "h5": {
@@ -125,7 +126,7 @@ class Parser:
 
     def load_remote_url_txt(self, url, filters: [str] = None, use_ignore: bool = True):
         try:
-            response = requests.get(url, timeout=Constants.REQUEST_TIMEOUT, verify=False)
+            response = upstream_client.get(url, verify=False)
             response.raise_for_status()
             self.load_channel_txt(response.text.strip(), filters, use_ignore)
         except Exception as e:
@@ -133,7 +134,7 @@ class Parser:
 
     def load_channel_m3u(self, url: str, filters: [str] = None, use_ignore: bool = True):
         try:
-            response = requests.get(url, timeout=Constants.REQUEST_TIMEOUT, verify=False)
+            response = upstream_client.get(url, verify=False)
             response.raise_for_status()
             m3u_data = response.text.strip()
 
@@ -173,105 +174,137 @@ class Parser:
         except Exception as e:
             logger.error(f"load channel m3u data failed: {e}")
 
-    def load_remote_url_migu(self, task_id, epg_file, rate_type):
+    def load_remote_url_migu(self, task_id, epg_file, rate_type,
+                             epg_past_days: int = 0, epg_future_days: int = 0, epg_gzip: bool = False,
+                             direct_url: bool = False):
+
+        def add_migu_channels(processed_counter, channel_items) -> None:
+            """
+            批量预解析频道播放地址并写入解析缓存（按请求的清晰度分开缓存），跳转地址 /migu/{id} 直接读取默认清晰度的缓存；
+            开启 direct_url 时剩余有效期足够的地址直接写入播放列表，否则使用跳转地址
+            """
+            channel_items = [item for item in channel_items if item[2]]
+            direct_urls = {}
+            # 非默认清晰度的缓存跳转地址用不到，只在需要直链时解析
+            if direct_url or rate_type == DEFAULT_RATE_TYPE:
+                direct_urls = migu_resolver.resolve_many([(item[2], item[1]) for item in channel_items], rate_type)
+            for group_name, channel_name, pid, tvg_id, logo in channel_items:
+                play_url = direct_urls.get(pid) if direct_url else None
+                channel_manager.add_channel(False, group_name, channel_name,
+                                            play_url or f"{self._TVG_URL}/{pid}", tvg_id, logo)
+                processed_counter.increment()
+            task_manager.update_task(task_id, processed=processed_counter.get_value())
 
-        def process_channel_TV(processed_counter, migu_cate_list, epg_f):
-            processed_pids = set()
+        def process_channel_TV(processed_counter, migu_cate_list) -> List[EpgChannel]:
+            cate_items = []
             for cate in migu_cate_list:
                 cate_name = config_manager.get_category(cate.name)
-                if not config_manager.exists(cate_name):
-                    continue
-                data_list = self._get_migu_cate_data(processed_pids, cate_name, cate.vid, rate_type)
+                if config_manager.exists(cate_name):
+                    cate_items.append((cate_name, cate.vid))
+
+            # 1. 并发获取所有分类的频道数据，结果按分类原始顺序返回
+            with ThreadPoolExecutor(max_workers=Constants.MIGU_CATE_WORKERS) as executor:
+                cate_results = list(executor.map(
+                    lambda item: self._get_migu_cate_data(item[0], item[1], rate_type), cate_items))
+
+            # 2. 按分类顺序去重，先出现的分类优先，保证结果与串行处理一致
+            processed_pids = set()
+            epg_items = []
+            channel_items = []
+            for (cate_name, _), data_list in zip(cate_items, cate_results):
                 for data in data_list:
+                    if data.pid in processed_pids:
+                        continue
                     tvg_id = config_manager.get_channel_id(data.name)
                     channel_name = config_manager.get_channel(data.name)
                     # 在get_migu_cate_data函数内部已经做了过滤，古这里不用做重复的过滤了
-                    channel_manager.add_channel(False, cate_name, channel_name, data.url, tvg_id, data.pic)
-                    self._get_migu_playback_data(cate_name, data, epg_f)
+                    channel_items.append((cate_name, channel_name, data.pid, tvg_id, data.pic))
+                    epg_items.append((cate_name, data))
                     processed_pids.add(data.pid)
-                    processed_counter.increment()
-                task_manager.update_task(task_id, processed=processed_counter.get_value())
+
+            # 3. 批量预解析播放地址后添加频道
+            add_migu_channels(processed_counter, channel_items)
+
+            # 4. 节目单频道列表，由 EpgBuilder 单独限流获取
+            return [epg_channel for epg_channel in (self._get_migu_epg_channel(*item) for item in epg_items)
+                    if epg_channel]
 
         def process_channel_PE(processed_counter, migu_sport_list):
-            for (date_str, relative_date, data_list) in migu_sport_list:
-                for data in data_list:
-                    mgdb_id = data.get("mgdbId")
-                    pk_info_title = re.split(
-                        r"·", data.get("pkInfoTitle", ""), 1
-                    )[-1].replace("vs", "VS").replace(" ", "")
-                    competition_name = data.get('competitionName')
-                    teams = data.get("confrontTeams")
-                    if teams and len(teams) >= 2:
-                        pk_info_title = f"{teams[0].get('name')}VS{teams[1].get('name')}"
-                    try:
-                        url = (f"https://vms-sc.miguvideo.com/vms-match/v6/staticcache/basic/"
-                               f"basic-data/{mgdb_id}/miguvideo")
-                        body = self._get_url_body(url)
-
-                        # 1. 比赛已结束
-                        now_ms = int(time.time() * 1000)
-                        if body.get("endTime", 0) < now_ms:
-                            self._get_migu_sport_overed(
-                                processed_counter, task_id,
-                                relative_date, data, body, pk_info_title, mgdb_id)
+            matches = [
+                (relative_date, data)
+                for (date_str, relative_date, data_list) in migu_sport_list or []
+                for data in data_list
+            ]
+
+            # 1. 并发获取所有比赛的详情及回放列表，已结束的比赛优先走缓存
+            with ThreadPoolExecutor(max_workers=Constants.MIGU_SPORT_WORKERS) as executor:
+                futures = [executor.submit(self._get_migu_match_data, data.get("mgdbId")) for _, data in matches]
+
+            # 2. 按比赛原始顺序生成频道数据
+            channel_items = []
+            for (relative_date, data), future in zip(matches, futures):
+                pk_info_title = re.split(
+                    r"·", data.get("pkInfoTitle", ""), 1
+                )[-1].replace("vs", "VS").replace(" ", "")
+                competition_name = data.get('competitionName')
+                teams = data.get("confrontTeams")
+                if teams and len(teams) >= 2:
+                    pk_info_title = f"{teams[0].get('name')}VS{teams[1].get('name')}"
+                try:
+                    body, replay_body = future.result()
+
+                    # 1. 比赛已结束
+                    now_ms = int(time.time() * 1000)
+                    if body.get("endTime", 0) < now_ms:
+                        channel_items.extend(self._get_migu_sport_overed(
+                            relative_date, data, body, replay_body, pk_info_title))
+                        continue
+
+                    # 2. 比赛进行中或未开始
+                    live_list = body.get("multiPlayList", {}).get("liveList", [])
+                    for live in live_list:
+                        name = self._process_migu_title(live.get("name", ""))
+                        start_time_str = live.get("startTimeStr")
+                        if re.search(r".*集锦.*", name) or not start_time_str:
                             continue
 
-                        # 2. 比赛进行中或未开始
-                        live_list = body.get("multiPlayList", {}).get("liveList", [])
-                        for live in live_list:
-                            name = self._process_migu_title(live.get("name", ""))
-                            start_time_str = live.get("startTimeStr")
-                            if re.search(r".*集锦.*", name) or not start_time_str:
-                                continue
-
-                            competition_desc = f"{competition_name} {pk_info_title} {name} {start_time_str[11:16]}"
-                            category_info = config_manager.get_category_object(competition_desc, relative_date)
-                            if category_info and config_manager.is_exclude(category_info, competition_desc):
-                                continue
-                            # migu_video_play_url = self.get_migu_video_url(competition_desc, live.get("pID"))
-                            migu_video_play_url = f"{self._TVG_URL}/{live.get("pID")}"
-                            if migu_video_play_url:
-                                channel_manager.add_channel(False, relative_date,
-                                                            competition_desc,
-                                                            migu_video_play_url,
-                                                            pk_info_title,
-                                                            data.get("competitionLogo"))
-                                processed_counter.increment()
-                        task_manager.update_task(task_id, processed=processed_counter.get_value())
-
-                    except Exception as e:
-                        logger.error(f"process PE data failed: {e}")
+                        competition_desc = f"{competition_name} {pk_info_title} {name} {start_time_str[11:16]}"
+                        category_info = config_manager.get_category_object(competition_desc, relative_date)
+                        if category_info and config_manager.is_exclude(category_info, competition_desc):
+                            continue
+                        channel_items.append((relative_date, competition_desc, live.get("pID"),
+                                              pk_info_title, data.get("competitionLogo")))
+                except Exception as e:
+                    logger.error(f"process PE data failed: {e}")
 
-        try:
-            # 确保目录存在
-            os.makedirs(os.path.dirname(epg_file), exist_ok=True)
-            epg_file_bak = epg_file + ".bak"
+            # 3. 批量预解析播放地址后添加频道
+            add_migu_channels(processed_counter, channel_items)
 
+        try:
             counter = Counter()
             migu_cates = self._get_migu_cate_list()
             migu_sports = self._get_migu_sport_list()
-            with open(epg_file_bak, "w", encoding="utf-8") as f:
-                f.write(
-                    '<?xml version="1.0" encoding="utf-8"?>\n'
-                    '<tv generator-info-name="Talk" generator-info-url="https://ak3721.top/tv">\n'
-                )
-                process_channel_TV(counter, migu_cates, f)
-                process_channel_PE(counter, migu_sports)
-                f.write("</tv>\n")
-            os.rename(epg_file_bak, epg_file)
+            epg_channels = process_channel_TV(counter, migu_cates)
+            process_channel_PE(counter, migu_sports)
             channel_manager.sort()
+
+            epg_builder = EpgBuilder({
+                "cntv": self._fetch_cntv_programmes,
+                "migu": self._fetch_migu_programmes,
+            })
+            epg_builder.build(epg_file, epg_channels, epg_past_days, epg_future_days, epg_gzip)
         except Exception as e:
             logger.error(f"fetch migu data failed: {e}")
 
     def _get_migu_cate_list(self) -> List[MiguCateInfo]:
         cache_key = f"tv-live:list"
-        cache_data = redis_client.get(cache_key)
+        cache_data = two_tier_cache.get(cache_key)
         if cache_data:
             cached = json.loads(cache_data)
             return [MiguCateInfo(item.get("name", ""), item.get("vid", "")) for item in cached]
 
         migu_cate_url = self._MIGU_TV + "1ff892f2b5ab4a79be6e25b69d2f5d05"
-        response = requests.get(migu_cate_url, timeout=Constants.REQUEST_TIMEOUT * 60)
+        response = upstream_client.hedged_get(migu_cate_url, timeout=Constants.REQUEST_TIMEOUT * 3)
         response.raise_for_status()
         json_cate_data = response.json()
 
@@ -288,7 +321,7 @@ class Parser:
             cate_list.append(MiguCateInfo(name, vid))
             appended_cates.add(name)
 
-        redis_client.set_ex(
+        two_tier_cache.set(
             cache_key,
             json.dumps([{"name": c.name, "vid": c.vid} for c in cate_list]),
             24 * 3600
@@ -296,80 +329,45 @@ class Parser:
 
         return cate_list
 
-    def _get_migu_playback_data(self, category_name, channel_data, fd):
-        try:
-            date_str = datetime.now().strftime("%Y%m%d")
-            # 过滤掉排除的频道
-            category_info = config_manager.get_category_object(channel_data.name, category_name)
-            if category_info and not config_manager.is_exclude(category_info, channel_data.name):
-                if Constants.cvt_exist(channel_data.name):
-                    tv_name = Constants.get_cvt_name(channel_data.name)
-                    self._get_migu_playback_data_cctv(channel_data.name, date_str, tv_name, fd)
-                else:
-                    self._get_migu_playback_data_others(channel_data, date_str, fd)
-        except Exception as e:
-            logger.error(f"fetch migu playback data failed: {e}")
-
-    def _get_migu_playback_data_cctv(self, name, date_str, tv_name, fd):
-        fetch_url = f"https://api.cntv.cn/epg/epginfo3?serviceId=shiyi&d={date_str}&c={tv_name}"
-        try:
-            resp = requests.get(fetch_url, timeout=Constants.REQUEST_TIMEOUT)
-            resp.raise_for_status()
-            playback_data = resp.json().get(tv_name, {}).get("program", {})
-            if playback_data:
-                tvg_id = config_manager.get_channel_id(name)
-                display_name = config_manager.get_channel(name)
-                fd.write(
-                    f'    <channel id="{tvg_id}">\n'
-                    f'        <display-name lang="zh">{display_name}</display-name>\n'
-                    "    </channel>\n"
-                )
-                for data in playback_data:
-                    st_str = seconds_to_time_str(data.get("st"))
-                    et_str = seconds_to_time_str(data.get("et"))
-                    cont_name = get_xml_cvt_string(data.get("t"))
-                    fd.write(
-                        f'    <programme channel="{tvg_id}" start="{st_str} +0800" stop="{et_str} +0800">\n'
-                        f'        <title lang="zh">{cont_name}</title>\n'
-                        "    </programme>\n"
-                    )
-        except Exception as e:
-            logger.error(f"get migu playback data for CCTV failed: {e}")
+    def _get_migu_epg_channel(self, category_name, channel_data) -> EpgChannel | None:
+        # 过滤掉排除的频道
+        category_info = config_manager.get_category_object(channel_data.name, category_name)
+        if not category_info or config_manager.is_exclude(category_info, channel_data.name):
+            return None
 
-    def _get_migu_playback_data_others(self, channel_data, date_str, fd):
-        try:
-            fetch_url = f"https://program-sc.miguvideo.com/live/v2/tv-programs-data/{channel_data.pid}/{date_str}"
-            resp = requests.get(fetch_url, timeout=Constants.REQUEST_TIMEOUT)
-            resp.raise_for_status()
-            playback_data = (
-                resp.json().get("body", {}).get("program")[0].get("content", [])
-            )
-            if playback_data:
-                tvg_id = config_manager.get_channel_id(channel_data.name)
-                display_name = config_manager.get_channel(channel_data.name)
-                fd.write(
-                    f'    <channel id="{tvg_id}">\n'
-                    f'        <display-name lang="zh">{display_name}</display-name>\n'
-                    "    </channel>\n"
-                )
-                for data in playback_data:
-                    st_str = ms2time_str(data.get("startTime"))
-                    et_str = ms2time_str(data.get("endTime"))
-                    cont_name = get_xml_cvt_string(data.get("contName"))
-                    fd.write(
-                        f'    <programme channel="{tvg_id}" start="{st_str} +0800" stop="{et_str} +0800">\n'
-                        f'        <title lang="zh">{cont_name}</title>\n'
-                        "    </programme>\n"
-                    )
-        except Exception as e:
-            logger.error(f"get migu playback data failed: {e}")
+        tvg_id = config_manager.get_channel_id(channel_data.name)
+        display_name = config_manager.get_channel(channel_data.name)
+        if Constants.cvt_exist(channel_data.name):
+            return EpgChannel(tvg_id, display_name, "cntv", Constants.get_cvt_name(channel_data.name))
+        return EpgChannel(tvg_id, display_name, "migu", channel_data.pid)
 
-    def _get_migu_cate_data(self, processed_pids, category_name, pid: str, rate_type: int) -> List[MiguDataInfo]:
+    def _fetch_cntv_programmes(self, tv_name, date_str) -> List[tuple]:
+        fetch_url = f"https://api.cntv.cn/epg/epginfo3?serviceId=shiyi&d={date_str}&c={tv_name}"
+        resp = upstream_client.hedged_get(fetch_url)
+        resp.raise_for_status()
+        playback_data = resp.json().get(tv_name, {}).get("program", {})
+        return [
+            (int(data.get("st")), int(data.get("et")), data.get("t", ""))
+            for data in playback_data or []
+        ]
+
+    def _fetch_migu_programmes(self, pid, date_str) -> List[tuple]:
+        fetch_url = f"https://program-sc.miguvideo.com/live/v2/tv-programs-data/{pid}/{date_str}"
+        resp = upstream_client.get(fetch_url)
+        resp.raise_for_status()
+        programs = resp.json().get("body", {}).get("program") or [{}]
+        return [
+            (int(data.get("startTime")) // 1000, int(data.get("endTime")) // 1000, data.get("contName", ""))
+            for data in programs[0].get("content", [])
+        ]
+
+    def _get_migu_cate_data(self, category_name, pid: str, rate_type: int) -> List[MiguDataInfo]:
+        """获取单个分类的频道数据，跨分类的 pid 去重由调用方按分类顺序统一处理"""
         output_data = []
 
         try:
             migu_url = self._MIGU_TV + pid
-            response = requests.get(migu_url, timeout=Constants.REQUEST_TIMEOUT * 60)
+            response = upstream_client.hedged_get(migu_url, timeout=Constants.REQUEST_TIMEOUT * 3)
             response.raise_for_status()
             json_cate_data = response.json()
 
@@ -377,8 +375,6 @@ class Parser:
             data_list = body.get("dataList", [])
             for data in data_list:
                 pid = data.get("pID")
-                if pid in processed_pids:
-                    continue
                 pics = data.get("pics", [])
                 channel_name = config_manager.get_channel(data.get("name"))
                 # 提前做过滤处理，减少获取URL的调用
@@ -386,7 +382,6 @@ class Parser:
                 if category_info and config_manager.is_exclude(category_info, channel_name):
                     continue
                 migu_data_info = MiguDataInfo(channel_name, pid, pics.get("highResolutionH"))
-                # migu_video_play_url = self.get_migu_video_url(migu_data_info.name, migu_data_info.pid, rate_type)
                 migu_video_play_url = f"{self._TVG_URL}/{migu_data_info.pid}"
                 if migu_video_play_url:
                     migu_data_info.set_url(migu_video_play_url)
@@ -399,23 +394,23 @@ class Parser:
     def get_migu_video_url(self, pname, pid, rate_type: int = 3) -> str:
         def _get302URL(source_url):
             target_url = ""
+            # 网络错误已由 upstream_client 重试，这里只在调度地址尚未就绪（bofang）时重试，其余情况直接结束
             for retry in range(6):
                 try:
-                    resp = requests.get(source_url,
-                                        allow_redirects=False,
-                                        timeout=Constants.REQUEST_TIMEOUT,
-                                        verify=False)
-                    location = resp.headers.get("Location", "")
-                    if not location:
-                        continue
-                    if not location.startswith("http://bofang"):
-                        target_url = location
-                        break
+                    resp = upstream_client.get(source_url, allow_redirects=False, verify=False)
+                except CircuitOpenError as e:
+                    logger.warning(f"请求已熔断: {pname}, {str(e)}")
+                    break
                 except Exception as e:
                     logger.error(f"请求重试失败: {pname}, {str(e)}")
+                    break
 
+                location = resp.headers.get("Location", "")
+                if not location.startswith("http://bofang"):
+                    target_url = location
+                    break
                 if retry < 5:
-                    time.sleep(0.15)
+                    time.sleep(backoff_delay(retry, base=0.15, cap=1.0))
 
             return target_url
 
@@ -460,7 +455,7 @@ class Parser:
 
         playUrl = ""
         try:
-            resp = requests.get(full_url, headers=headers, timeout=Constants.REQUEST_TIMEOUT)
+            resp = upstream_client.get(full_url, headers=headers)
             resp.raise_for_status()
             resp_json = resp.json()
             respBody = resp_json.get("body", {})
@@ -552,13 +547,13 @@ class Parser:
 
         playUrl = ""
         try:
-            resp = requests.get(baseURL + params, headers=headers, timeout=Constants.REQUEST_TIMEOUT)
+            resp = upstream_client.get(baseURL + params, headers=headers)
             resp.raise_for_status()
             resp_json = resp.json()
             if resp_json.get("rid") == 'TIPS_NEED_MEMBER':
                 params = (f"?sign={sign}&rateType=3&contId={pid}&timestamp={timestamp}"
                           f"&salt={salt}&flvEnable=true&super4k=true{enableH265Str}{enableHDRStr}")
-                resp = requests.get(baseURL + params, headers=headers, timeout=Constants.REQUEST_TIMEOUT)
+                resp = upstream_client.get(baseURL + params, headers=headers)
                 resp.raise_for_status()
                 resp_json = resp.json()
             respBody = resp_json.get("body", {})
@@ -631,11 +626,42 @@ class Parser:
         return "".join(ddCalcu)
 
     def _get_url_body(self, url):
-        response = requests.get(url, timeout=Constants.REQUEST_TIMEOUT, verify=False)
+        response = upstream_client.get(url, verify=False)
         response.raise_for_status()
         resp_json = response.json()
         return resp_json.get("body", {})
 
+    def _get_migu_match_data(self, mgdb_id) -> Tuple[dict, dict | None]:
+        """
+        获取比赛详情，已结束的比赛同时获取回放列表
+        :return: (比赛详情, 回放数据)，未结束的比赛回放数据为 None
+        """
+        cache_key = f"tv-live:match:{mgdb_id}"
+        cache_data = redis_client.get(cache_key)
+        if cache_data:
+            cached = json.loads(cache_data)
+            return cached.get("body", {}), cached.get("replay", {})
+
+        url = f"https://vms-sc.miguvideo.com/vms-match/v6/staticcache/basic/basic-data/{mgdb_id}/miguvideo"
+        body = self._get_url_body(url)
+        if body.get("endTime", 0) >= int(time.time() * 1000):
+            return body, None
+
+        try:
+            url = f"https://app-sc.miguvideo.com/vms-match/v5/staticcache/basic/all-view-list/{mgdb_id}/2/miguvideo"
+            replay_body = self._get_url_body(url)
+        except Exception as e:
+            logger.warning(f"get migu match replay [{mgdb_id}] failed: {e}")
+            return body, {}
+
+        # 已结束的比赛数据不会再变化
+        redis_client.set_ex(
+            cache_key,
+            json.dumps({"body": body, "replay": replay_body}, ensure_ascii=False),
+            Constants.MIGU_MATCH_CACHE_TTL
+        )
+        return body, replay_body
+
     def _get_migu_sport_list(self):
         url = ("https://v0-sc.miguvideo.com/vms-match/v6/staticcache/basic/match-list/normal-match-list/"
                "0/all/default/1/miguvideo/")
@@ -687,15 +713,15 @@ class Parser:
 
         return converted_str
 
-    def _get_migu_sport_overed(self, processed_counter, task_id, relative_date, data, body, pk_info_title, mgdb_id):
+    def _get_migu_sport_overed(self, relative_date, data, body, replay_body, pk_info_title) -> List[tuple]:
+        """已结束比赛的回放频道：[(分组, 频道名称, pid, tvg_id, logo)]"""
+        channel_items = []
         try:
-            url = f"https://app-sc.miguvideo.com/vms-match/v5/staticcache/basic/all-view-list/{mgdb_id}/2/miguvideo"
-            relay_body = self._get_url_body(url)
-            replay_list = relay_body.get("replayList")
+            replay_list = (replay_body or {}).get("replayList")
             if not replay_list:
                 replay_list = body.get("multiPlayList", {}).get("replayList")
             if not replay_list:
-                return
+                return channel_items
 
             competition_name = data.get('competitionName')
             for replay in replay_list:
@@ -713,18 +739,11 @@ class Parser:
                     category_info = config_manager.get_category_object(competition_desc, relative_date)
                     if category_info and config_manager.is_exclude(category_info, competition_desc):
                         continue
-                    # migu_video_play_url = self.get_migu_video_url(competition_desc, replay.get("pID"))
-                    migu_video_play_url = f"{self._TVG_URL}/{replay.get("pID")}"
-                    if migu_video_play_url:
-                        channel_manager.add_channel(False, relative_date,
-                                                    competition_desc,
-                                                    migu_video_play_url,
-                                                    pk_info_title,
-                                                    data.get("competitionLogo"))
-                        processed_counter.increment()
-            task_manager.update_task(task_id, processed=processed_counter.get_value())
+                    channel_items.append((relative_date, competition_desc, replay.get("pID"),
+                                          pk_info_title, data.get("competitionLogo")))
         except Exception as e:
             logger.error(f"get migo sport overed [{pk_info_title}] failed,  {str(e)}")
+        return channel_items
 
 
 parser_manager = Parser()
@@ -0,0 +1,139 @@
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    from pypinyin import Style, lazy_pinyin
+except ImportError:
+    lazy_pinyin = None
+
+# 去掉空白和标点，只保留文字、数字、字母
+_CLEAN_PATTERN = re.compile(r"[\W_]+", re.UNICODE)
+_ASCII_LETTERS = re.compile(r"^[a-z]+$")
+
+
+def normalize(text: str) -> str:
+    return _CLEAN_PATTERN.sub("", unicodedata.normalize("NFKC", text or "").lower())
+
+
+def pinyin_initials(text: str) -> str:
+    """汉字转拼音首字母，其他字符保持不变，例如：我的世界2 -> wdsj2"""
+    if lazy_pinyin is None:
+        return ""
+    return normalize("".join(lazy_pinyin(text, style=Style.FIRST_LETTER)))
+
+
+def ngrams(text: str, n: int = 2) -> Set[str]:
+    """字符 n-gram，短于 n 的文本返回自身"""
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class SearchIndex:
+    """
+    内存倒排索引：名称按字符二元组（bigram）建立倒排表，适用于不分词的中文；
+    可选建立拼音首字母索引。查询时先用倒排表求交集得到候选，再按匹配程度排序：
+    完全匹配 > 前缀匹配 > 包含 > 拼音首字母匹配 > 部分匹配
+    """
+
+    def __init__(self, with_pinyin: bool = True):
+        self._with_pinyin = with_pinyin and lazy_pinyin is not None
+        self._docs: Dict[str, Tuple[str, str, Any]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._pinyin_postings: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, doc_id: str):
+        return doc_id in self._docs
+
+    @staticmethod
+    def _grams(text: str) -> Set[str]:
+        # 单字也建立索引，支持单字查询
+        return ngrams(text) | set(text)
+
+    def add(self, doc_id: str, name: str, payload: Any = None) -> None:
+        """添加或替换文档"""
+        text = normalize(name)
+        initials = pinyin_initials(name) if self._with_pinyin else ""
+        with self._lock:
+            self.remove(doc_id)
+            self._docs[doc_id] = (text, initials, payload)
+            for gram in self._grams(text):
+                self._postings.setdefault(gram, set()).add(doc_id)
+            for gram in self._grams(initials):
+                self._pinyin_postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            doc = self._docs.pop(doc_id, None)
+            if not doc:
+                return
+            text, initials, _ = doc
+            for postings, value in ((self._postings, text), (self._pinyin_postings, initials)):
+                for gram in self._grams(value):
+                    ids = postings.get(gram)
+                    if ids is not None:
+                        ids.discard(doc_id)
+                        if not ids:
+                            del postings[gram]
+
+    def doc_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._docs)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self._pinyin_postings.clear()
+
+    @staticmethod
+    def _candidates(postings: Dict[str, Set[str]], grams: Set[str], min_ratio: float) -> Dict[str, float]:
+        """返回命中 gram 比例不低于 min_ratio 的文档及其命中比例"""
+        counts: Dict[str, int] = {}
+        for gram in grams:
+            for doc_id in postings.get(gram, ()):
+                counts[doc_id] = counts.get(doc_id, 0) + 1
+        total = len(grams)
+        return {doc_id: count / total for doc_id, count in counts.items() if count / total >= min_ratio}
+
+    def search(self, query: str, limit: Optional[int] = None, min_ratio: float = 0.6) -> List[Tuple[str, Any]]:
+        """
+        :param min_ratio: 部分匹配时查询 bigram 的最低命中比例
+        :return: 按相关度排序的 [(doc_id, payload)]
+        """
+        text = normalize(query)
+        if not text:
+            return []
+
+        grams = ngrams(text)
+        with self._lock:
+            scored: Dict[str, float] = {}
+            for doc_id, ratio in self._candidates(self._postings, grams, min_ratio).items():
+                name = self._docs[doc_id][0]
+                if name == text:
+                    score = 4
+                elif name.startswith(text):
+                    score = 3
+                elif text in name:
+                    score = 2
+                else:
+                    score = ratio
+                scored[doc_id] = score
+
+            if self._with_pinyin and _ASCII_LETTERS.match(text):
+                for doc_id, ratio in self._candidates(self._pinyin_postings, grams, 1).items():
+                    initials = self._docs[doc_id][1]
+                    if text in initials:
+                        scored[doc_id] = max(scored.get(doc_id, 0), 1.5 if initials.startswith(text) else 1.2)
+
+            # 相关度相同时名称越短越靠前
+            ranked = sorted(scored.items(), key=lambda item: (-item[1], len(self._docs[item[0]][0]), item[0]))
+            if limit is not None:
+                ranked = ranked[:limit]
+            return [(doc_id, self._docs[doc_id][2]) for doc_id, _ in ranked]
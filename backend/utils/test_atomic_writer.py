@@ -0,0 +1,54 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from utils.atomic_writer import AtomicFileWriter
+
+
+class TestAtomicFileWriter(unittest.TestCase):
+    """测试原子写文件"""
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self._tmp_dir.name, "out", "result.txt")
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_commit_replace(self):
+        """测试提交前目标文件保持旧内容，提交后整体替换"""
+        os.makedirs(os.path.dirname(self.file_path))
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write("old")
+
+        writer = AtomicFileWriter(self.file_path).open()
+        writer.write("新内容\n")
+        with open(self.file_path, encoding="utf-8") as f:
+            self.assertEqual("old", f.read())
+
+        writer.commit()
+        with open(self.file_path, encoding="utf-8") as f:
+            self.assertEqual("新内容\n", f.read())
+        self.assertEqual(["result.txt"], os.listdir(os.path.dirname(self.file_path)))
+
+    def test_gzip_sibling(self):
+        """测试同时生成 gzip 副本"""
+        with AtomicFileWriter(self.file_path, with_gzip=True) as writer:
+            writer.write("CCTV1,http://a/1.m3u8\n")
+
+        with gzip.open(self.file_path + ".gz", "rt", encoding="utf-8") as f:
+            self.assertEqual("CCTV1,http://a/1.m3u8\n", f.read())
+
+    def test_abort_on_error(self):
+        """测试异常时删除临时文件且不生成目标文件"""
+        with self.assertRaises(RuntimeError):
+            with AtomicFileWriter(self.file_path, with_gzip=True) as writer:
+                writer.write("partial")
+                raise RuntimeError("boom")
+
+        self.assertEqual([], os.listdir(os.path.dirname(self.file_path)))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,46 @@
+import json
+import unittest
+
+from utils.codec import MAGIC, Codec
+
+
+class TestCodec(unittest.TestCase):
+    """测试缓存数据编解码"""
+
+    def setUp(self):
+        self.video = {
+            "vod_name": "测试视频",
+            "vod_content": "简介" * 1000,
+            "vod_play_url": "#".join(f"第{i}集$https://example.com/{i}.m3u8" for i in range(50)),
+        }
+
+    def test_roundtrip(self):
+        """测试编码后解码得到相同数据"""
+        codec = Codec(serializer="json")
+        self.assertEqual(self.video, codec.decode(codec.encode(self.video)))
+        self.assertEqual([1, "a"], codec.decode(codec.encode([1, "a"])))
+
+    def test_compress_above_threshold(self):
+        """测试超过阈值的数据被压缩，小数据不压缩"""
+        codec = Codec(serializer="json", threshold=256)
+        encoded = codec.encode(self.video)
+        self.assertTrue(encoded.startswith(MAGIC))
+        self.assertLess(len(encoded), len(json.dumps(self.video, ensure_ascii=False).encode("utf-8")) // 2)
+        self.assertEqual(0, codec.encode({"a": 1})[3] >> 4)
+
+    def test_legacy_json(self):
+        """测试兼容旧版本直接存储的 JSON 字符串"""
+        codec = Codec(serializer="json")
+        legacy = json.dumps(self.video, ensure_ascii=False)
+        self.assertEqual(self.video, codec.decode(legacy))
+        self.assertEqual(self.video, codec.decode(legacy.encode("utf-8")))
+        self.assertIsNone(codec.decode(None))
+
+    def test_unknown_version(self):
+        """测试无法识别的版本号"""
+        with self.assertRaises(ValueError):
+            Codec().decode(MAGIC + bytes((99, 0)) + b"{}")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,37 @@
+import unittest
+from urllib.parse import quote
+
+from utils.m3u8_util import PlaylistRewriter, playlist_ttl
+
+LIVE_PLAYLIST = """#EXTM3U
+#EXT-X-VERSION:3
+#EXT-X-TARGETDURATION:6
+#EXT-X-MEDIA-SEQUENCE:100
+#EXTINF:5.005,
+https://a.example.com/videoplayback/id/1/seg.ts?sq=100
+#EXTINF:5.005,
+https://a.example.com/videoplayback/id/1/seg.ts?sq=101
+"""
+
+
+class TestM3u8Util(unittest.TestCase):
+    """测试播放列表改写及缓存时间"""
+
+    def test_rewrite(self):
+        """测试分片地址替换为代理地址，其他行不变"""
+        rewriter = PlaylistRewriter("http://tv/site/proxy/v-youtub?url=")
+        lines = rewriter.rewrite(LIVE_PLAYLIST).splitlines()
+        seg_url = "https://a.example.com/videoplayback/id/1/seg.ts?sq=100"
+        self.assertEqual(f"http://tv/site/proxy/v-youtub?url={quote(seg_url, safe='')}", lines[5])
+        self.assertEqual("#EXTINF:5.005,", lines[4])
+
+    def test_playlist_ttl(self):
+        """测试直播按目标分片时长的一半缓存，点播使用固定时间"""
+        self.assertEqual(3, playlist_ttl(LIVE_PLAYLIST, 2, 300))
+        self.assertEqual(300, playlist_ttl(LIVE_PLAYLIST + "#EXT-X-ENDLIST\n", 2, 300))
+        self.assertEqual(2, playlist_ttl("#EXTM3U\n", 2, 300))
+        self.assertEqual(1, playlist_ttl("#EXT-X-TARGETDURATION:1\n", 2, 300))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
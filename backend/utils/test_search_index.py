@@ -0,0 +1,47 @@
+import unittest
+
+from utils.search_index import SearchIndex, lazy_pinyin
+
+
+class TestSearchIndex(unittest.TestCase):
+    """测试内存倒排搜索索引"""
+
+    def setUp(self):
+        self.index = SearchIndex()
+        for name in ["我的世界", "美丽中国", "中国", "航拍中国第二季", "地球脉动", "Planet Earth"]:
+            self.index.add(name, name, {"vod_name": name})
+
+    def names(self, query: str):
+        return [doc_id for doc_id, _ in self.index.search(query)]
+
+    def test_rank(self):
+        """测试完全匹配、前缀、包含的排序"""
+        self.assertEqual(["中国", "美丽中国", "航拍中国第二季"], self.names("中国"))
+
+    def test_single_char_and_case(self):
+        """测试单字查询及忽略大小写和空格"""
+        self.assertEqual(["地球脉动"], self.names("脉"))
+        self.assertEqual(["Planet Earth"], self.names("planetearth"))
+
+    def test_partial_match(self):
+        """测试部分词匹配"""
+        self.assertIn("航拍中国第二季", self.names("航拍中国第三季"))
+        self.assertEqual([], self.names("不存在的视频"))
+
+    @unittest.skipIf(lazy_pinyin is None, "pypinyin not installed")
+    def test_pinyin_initials(self):
+        """测试拼音首字母查询"""
+        self.assertEqual(["我的世界"], self.names("wdsj"))
+        self.assertEqual(["地球脉动"], self.names("dq"))
+
+    def test_replace_and_remove(self):
+        """测试替换和删除文档"""
+        self.index.add("中国", "中国国家地理", {"vod_name": "中国国家地理"})
+        self.assertEqual({"vod_name": "中国国家地理"}, self.index.search("国家地理")[0][1])
+        self.index.remove("中国")
+        self.assertNotIn("中国", self.names("中国"))
+        self.assertEqual(5, len(self.index))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,33 @@
+import time
+import unittest
+
+from utils.url_util import get_url_expire, get_url_ttl
+
+
+class TestUrlUtil(unittest.TestCase):
+    """测试签名地址过期时间解析"""
+
+    def test_expire_params(self):
+        """测试明确表示过期时间的参数"""
+        self.assertEqual(1800000000, get_url_expire("https://r1.googlevideo.com/videoplayback?expire=1800000000"))
+        self.assertEqual(1800000000, get_url_expire("http://a/b.m3u8?deadline=1800000000000"))
+        self.assertEqual(0x6B49D200, get_url_expire("http://a/b.m3u8?txSecret=x&txTime=6B49D200"))
+
+    def test_signing_time_not_expire(self):
+        """测试签名时间、含义不明确的参数不当作过期时间"""
+        now = int(time.time())
+        self.assertIsNone(get_url_expire(f"http://a/b.m3u8?wsSecret=x&wsTime={now}"))
+        self.assertIsNone(get_url_expire(f"http://a/b.m3u8?auth_key={now}-0-0-abc"))
+        self.assertIsNone(get_url_expire(f"http://a/b.m3u8?e={now}"))
+        self.assertEqual(600, get_url_ttl(f"http://a/b.m3u8?wsTime={now}", 600))
+
+    def test_ttl_margin(self):
+        """测试缓存时间预留安全余量且不超过默认值"""
+        now = int(time.time())
+        self.assertAlmostEqual(270, get_url_ttl(f"http://a?expire={now + 300}", 600), delta=2)
+        self.assertEqual(600, get_url_ttl(f"http://a?expire={now + 3600}", 600))
+        self.assertEqual(1, get_url_ttl(f"http://a?expire={now - 10}", 600))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
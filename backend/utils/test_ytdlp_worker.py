@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+
+from utils.ytdlp_worker import DownloaderCache, cookie_file, slim_info
+
+
+class FakeDownloader:
+    def __init__(self, path: str):
+        self.params = {"cookiefile": path}
+        self.saved = 0
+        self.closed = False
+
+    def save_cookies(self):
+        if self.params.get("cookiefile"):
+            self.saved += 1
+            with open(self.params["cookiefile"], "a") as f:
+                f.write("rotated\n")
+
+    def close(self):
+        self.save_cookies()
+        self.closed = True
+
+
+class TestYtdlpWorker(unittest.TestCase):
+    """测试 yt-dlp 工作进程的实例缓存及 cookie 写回"""
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp_dir.name, "cookies.txt")
+        with open(self.path, "w") as f:
+            f.write("v1\n")
+        self.argv = ["-f", "best", "--cookies", self.path]
+        self.created = []
+
+        def factory(argv):
+            self.created.append(FakeDownloader(cookie_file(argv)))
+            return self.created[-1]
+
+        self.cache = DownloaderCache(factory)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_cookie_file(self):
+        self.assertEqual("a.txt", cookie_file(["--cookies", "a.txt"]))
+        self.assertEqual("b.txt", cookie_file(["--cookies=b.txt"]))
+        self.assertIsNone(cookie_file(["-f", "best"]))
+
+    def test_save_keeps_instance(self):
+        """测试解析后写回 cookie，写回造成的修改时间变化不会重建实例"""
+        ydl = self.cache.get(self.argv)
+        self.cache.save(self.argv)
+        self.cache.save(self.argv)
+        self.assertIs(ydl, self.cache.get(self.argv))
+        self.assertEqual(2, ydl.saved)
+
+    def test_replaced_cookie_file_rebuilds(self):
+        """测试 cookie 文件被替换后重建实例，旧实例的 cookie 不覆盖新文件"""
+        old = self.cache.get(self.argv)
+        self.cache.save(self.argv)
+        with open(self.path, "w") as f:
+            f.write("v2\n")
+        os.utime(self.path, ns=(1, 1))
+
+        new = self.cache.get(self.argv)
+        self.assertIsNot(old, new)
+        self.assertTrue(old.closed)
+        with open(self.path) as f:
+            self.assertEqual("v2\n", f.read())
+
+        self.cache.close()
+        self.assertTrue(new.closed)
+
+    def test_slim_info(self):
+        info = {"url": None, "title": "t", "formats": [{"url": "u", "height": 720, "vcodec": None, "filesize": 1}]}
+        self.assertEqual({"url": None, "formats": [{"url": "u", "height": 720}], "requested_formats": []},
+                         slim_info(info))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
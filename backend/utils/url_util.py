@@ -1,4 +1,6 @@
-from urllib.parse import unquote, quote
+import time
+from typing import Optional
+from urllib.parse import parse_qs, quote, unquote, urlparse
 
 from core.logger_factory import LoggerFactory
 
@@ -40,3 +42,55 @@ def url_decode(encoded_text: str) -> str:
     except Exception as e:
         logger.error(f"error: URL decoding failed - {str(e)}")
         raise Exception(f"URL decoding failed - {str(e)}")
+
+
+# 常见 CDN 防盗链签名中明确表示过期时间的参数，值为秒级/毫秒级时间戳；
+# 网宿 wsTime、阿里云 auth_key 中的时间戳一般是签名时间，有效期在 CDN 侧配置，不能当作过期时间
+_EXPIRE_PARAMS = ("expire", "expires", "Expires", "deadline")
+
+
+def _parse_timestamp(value: str, hex_value: bool = False) -> Optional[int]:
+    try:
+        ts = int(value, 16) if hex_value else int(value)
+    except (TypeError, ValueError):
+        return None
+    if ts > 10 ** 12:
+        ts //= 1000
+    return ts if ts > 10 ** 9 else None
+
+
+def get_url_expire(url: str) -> Optional[int]:
+    """
+    从签名地址中解析过期时间（秒级时间戳），无法解析时返回 None
+
+    支持：expire/expires/deadline 时间戳参数，腾讯云 txTime（十六进制）
+    """
+    if not url:
+        return None
+    try:
+        query = parse_qs(urlparse(url).query)
+    except ValueError:
+        return None
+
+    def first(name: str) -> Optional[str]:
+        values = query.get(name)
+        return values[0] if values else None
+
+    for name in _EXPIRE_PARAMS:
+        ts = _parse_timestamp(first(name))
+        if ts:
+            return ts
+
+    tx_time = first("txTime")
+    if tx_time:
+        return _parse_timestamp(tx_time, hex_value=True)
+
+    return None
+
+
+def get_url_ttl(url: str, default_ttl: int, safety_margin: int = 30) -> int:
+    """根据签名地址的过期时间计算缓存秒数，预留安全余量，且不超过默认缓存时间"""
+    expire_at = get_url_expire(url)
+    if expire_at is None:
+        return default_ttl
+    return max(1, min(default_ttl, expire_at - int(time.time()) - safety_margin))
@@ -0,0 +1,136 @@
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 返回给主进程的格式字段，避免传输完整的 info 字典
+FORMAT_FIELDS = ("url", "vcodec", "acodec", "height", "protocol")
+
+
+def slim_info(info: Dict) -> Dict:
+    """只保留选择播放地址需要的字段，值为 None 的字段不返回"""
+
+    def slim(item: Dict) -> Dict:
+        return {k: item[k] for k in FORMAT_FIELDS if item.get(k) is not None}
+
+    return {
+        "url": info.get("url"),
+        "formats": [slim(f) for f in info.get("formats") or []],
+        "requested_formats": [slim(f) for f in info.get("requested_formats") or []],
+    }
+
+
+def cookie_file(argv: List[str]) -> Optional[str]:
+    """从 yt-dlp 命令行参数中取出 --cookies 指定的文件"""
+    for idx, arg in enumerate(argv):
+        if arg == "--cookies" and idx + 1 < len(argv):
+            return argv[idx + 1]
+        if arg.startswith("--cookies="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def file_mtime(path: Optional[str]) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns if path else None
+    except OSError:
+        return None
+
+
+class DownloaderCache:
+    """
+    按命令行参数缓存 YoutubeDL 实例：每次解析后把 YouTube 轮换的 cookie 写回文件（与命令行退出时一致）；
+    cookie 文件被外部替换（修改时间与最后一次写回不同）时丢弃旧实例，重新读取新文件
+    """
+
+    def __init__(self, factory: Callable[[List[str]], Any]):
+        self._factory = factory
+        # argv -> [YoutubeDL 实例, cookie 文件修改时间]
+        self._items: Dict[Tuple[str, ...], list] = {}
+
+    def get(self, argv: List[str]):
+        key = tuple(argv)
+        mtime = file_mtime(cookie_file(argv))
+        item = self._items.get(key)
+        if item is not None and item[1] != mtime:
+            # 不保存旧实例的 cookie，避免覆盖新替换的文件
+            self._discard(item[0])
+            item = None
+        if item is None:
+            item = self._items[key] = [self._factory(argv), mtime]
+        return item[0]
+
+    def save(self, argv: List[str]) -> None:
+        """解析后写回 cookie，并记录写回后的修改时间，下次请求不会误判为外部替换"""
+        item = self._items.get(tuple(argv))
+        if item is None:
+            return
+        try:
+            item[0].save_cookies()
+        except Exception as e:
+            print(f"save cookies failed: {e}", file=sys.stderr)
+        item[1] = file_mtime(cookie_file(argv))
+
+    @staticmethod
+    def _discard(ydl) -> None:
+        ydl.params["cookiefile"] = None
+        try:
+            ydl.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """进程退出前写回 cookie 并释放连接"""
+        for ydl, _ in self._items.values():
+            try:
+                ydl.close()
+            except Exception:
+                pass
+        self._items.clear()
+
+
+def main() -> None:
+    """
+    yt-dlp 常驻工作进程：启动时导入 yt_dlp，按命令行参数缓存 YoutubeDL 实例；
+    从 stdin 按行读取 {"url", "argv", "path"}，向 stdout 按行返回 {"ok": true, "info": ...} 或 {"ok": false, "error": ...}
+    """
+    # 协议使用原始 stdout，yt-dlp 自身的输出全部转到 stderr
+    out = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    sys.stdout = sys.stderr
+
+    import yt_dlp
+
+    def new_downloader(argv: List[str]) -> "yt_dlp.YoutubeDL":
+        # 与命令行参数解析保持一致，得到相同的 YoutubeDL 配置
+        ydl_opts = yt_dlp.parse_options(argv).ydl_opts
+        # 命令行默认的 ignoreerrors 会让解析失败返回空结果，需要抛出错误信息（如 cookie 过期）
+        ydl_opts.update({"quiet": True, "no_warnings": True, "ignoreerrors": False})
+        return yt_dlp.YoutubeDL(ydl_opts)
+
+    downloaders = DownloaderCache(new_downloader)
+
+    def reply(data: Dict) -> None:
+        out.write(json.dumps(data, ensure_ascii=False) + "\n")
+        out.flush()
+
+    reply({"ok": True, "ready": os.getpid()})
+    try:
+        for line in sys.stdin:
+            argv = []
+            try:
+                request = json.loads(line)
+                argv = request.get("argv") or []
+                if request.get("path"):
+                    os.environ["PATH"] = request["path"]
+                info = downloaders.get(argv).extract_info(request["url"], download=False)
+                reply({"ok": True, "info": slim_info(info or {})})
+            except Exception as e:
+                reply({"ok": False, "error": str(e)})
+            finally:
+                downloaders.save(argv)
+    finally:
+        downloaders.close()
+
+
+if __name__ == "__main__":
+    main()